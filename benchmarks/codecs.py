@@ -0,0 +1,89 @@
+"""Compare BinaryCodecRegistry with pickle and json on typical events.
+
+Run it from the repository root: python -m benchmarks.codecs
+"""
+from collections.abc import Callable
+import dataclasses
+from dataclasses import dataclass, field
+import datetime as dt
+import json
+import pickle
+import timeit
+from typing import Any
+import uuid
+
+from didiator import Event
+from didiator.codecs import BinaryCodecRegistry
+
+NUMBER = 20_000
+
+
+@dataclass(frozen=True)
+class UserDeleted(Event):
+    user_id: int
+
+
+@dataclass(frozen=True)
+class UserCreated(Event):
+    user_id: uuid.UUID
+    email: str
+    name: str
+    created_at: dt.datetime
+    is_admin: bool = False
+
+
+@dataclass(frozen=True)
+class OrderLine:
+    product_id: int
+    quantity: int
+    price: float
+
+
+@dataclass(frozen=True)
+class OrderPlaced(Event):
+    order_id: int
+    customer_id: int
+    lines: tuple[OrderLine, ...]
+    comment: str | None = None
+    metadata: dict[str, str] = field(default_factory=dict)
+
+
+EVENTS = (
+    UserDeleted(42),
+    UserCreated(uuid.uuid4(), "john@example.com", "John Doe", dt.datetime.now(dt.timezone.utc)),
+    OrderPlaced(
+        100_500, 42, tuple(OrderLine(product_id, product_id % 3 + 1, 9.99) for product_id in range(20)),
+        metadata={"source": "mobile", "campaign": "spring"},
+    ),
+)
+
+
+def json_dumps(event: Event) -> bytes:
+    return json.dumps(dataclasses.asdict(event), default=str).encode()
+
+
+def measure(func: Callable[[], Any]) -> float:
+    return NUMBER / timeit.timeit(func, number=NUMBER)
+
+
+def main() -> None:
+    registry = BinaryCodecRegistry()
+    for event_type in (UserDeleted, UserCreated, OrderPlaced):
+        registry.register(event_type)
+
+    for event in EVENTS:
+        print(f"{type(event).__name__}:")
+        binary, pickled, json_data = registry.dumps(event), pickle.dumps(event), json_dumps(event)
+        view = memoryview(binary)
+        results = (
+            ("binary", len(binary), measure(lambda: registry.dumps(event)), measure(lambda: registry.loads(view))),
+            ("pickle", len(pickled), measure(lambda: pickle.dumps(event)), measure(lambda: pickle.loads(pickled))),
+            # json doesn't restore types of fields, so its decoding is faster than it would be in practice
+            ("json", len(json_data), measure(lambda: json_dumps(event)), measure(lambda: json.loads(json_data))),
+        )
+        for name, size, encoded, decoded in results:
+            print(f"  {name:>6}: {size:5} bytes, encode {encoded:8.0f}/s, decode {decoded:8.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare the dispatch overhead of wrapping middlewares and hook middlewares.
+
+Run it from the repository root: python -m benchmarks.middlewares
+"""
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from didiator import Command
+from didiator.dispatchers.command import CommandDispatcherImpl
+from didiator.interface.entities.request import Request
+from didiator.mediator import MediatorImpl
+from didiator.middlewares import HookContext, HookMiddleware, Middleware
+
+REQUESTS = 200_000
+MIDDLEWARES = 5
+
+
+@dataclass(frozen=True)
+class Increment(Command[int]):
+    value: int
+
+
+async def handle_increment(command: Increment, **kwargs: Any) -> int:
+    return command.value + 1
+
+
+class CountingMiddleware(Middleware):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, handler: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+        self.calls += 1
+        return await self._call(handler, request, *args, **kwargs)
+
+
+class CountingHook(HookMiddleware):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def before(self, request: Request[Any], ctx: HookContext) -> None:
+        self.calls += 1
+
+
+async def measure(middlewares: list[Any]) -> float:
+    mediator = MediatorImpl(CommandDispatcherImpl(middlewares)).bind(tenant="default")
+    mediator.register_command_handler(Increment, handle_increment)
+    command = Increment(1)
+    started_at = time.perf_counter()
+    for _ in range(REQUESTS):
+        await mediator.send(command)
+    return REQUESTS / (time.perf_counter() - started_at)
+
+
+async def main() -> None:
+    results = (
+        ("no middlewares", await measure([])),
+        (f"{MIDDLEWARES} wrapping", await measure([CountingMiddleware() for _ in range(MIDDLEWARES)])),
+        (f"{MIDDLEWARES} hooks", await measure([CountingHook() for _ in range(MIDDLEWARES)])),
+    )
+    for name, throughput in results:
+        print(f"{name:>16}: {throughput:9.0f} commands/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""Compare throughput of MediatorImpl and ProcessMediatorImpl on a CPU-bound query.
+
+Run it from the repository root: python -m benchmarks.process_mediator
+"""
+import asyncio
+from dataclasses import dataclass
+import os
+import time
+
+from didiator import Mediator, Query
+from didiator.mediator import MediatorImpl
+from didiator.workers import ProcessMediatorImpl, WorkerPool
+
+REQUESTS = 256
+
+
+@dataclass(frozen=True)
+class CalculateSum(Query[int]):
+    size: int
+
+
+async def handle_calculate_sum(query: CalculateSum) -> int:
+    return sum(number * number for number in range(query.size))
+
+
+def build_mediator() -> Mediator:
+    mediator = MediatorImpl()
+    mediator.register_query_handler(CalculateSum, handle_calculate_sum)
+    return mediator
+
+
+async def measure(mediator: Mediator) -> float:
+    started_at = time.perf_counter()
+    await asyncio.gather(*(mediator.query(CalculateSum(100_000)) for _ in range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - started_at)
+
+
+async def main() -> None:
+    baseline = await measure(build_mediator())
+    print(f"MediatorImpl: {baseline:.0f} requests/s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        async with WorkerPool(build_mediator, workers) as pool:
+            throughput = await measure(ProcessMediatorImpl(pool))
+        print(f"ProcessMediatorImpl with {workers} workers: {throughput:.0f} requests/s, x{throughput / baseline:.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,8 +1,8 @@
 from .dispatchers import CommandDispatcherImpl, QueryDispatcherImpl
-from .interface import CommandDispatcher, EventHandler, EventObserver, QueryDispatcher
+from .interface import BatchEventHandler, CommandDispatcher, EventHandler, EventObserver, QueryDispatcher
 from .observers import EventObserverImpl
-from .interface.entities import Command, Query, Event
-from .interface.handlers import CommandHandler, QueryHandler
+from .interface.entities import Command, Query, Event, EventBatch, StreamQuery
+from .interface.handlers import CommandHandler, QueryHandler, StreamQueryHandler
 from .interface.mediator import Mediator, CommandMediator, QueryMediator, EventMediator
 from .mediator import MediatorImpl
 
@@ -23,8 +23,12 @@ __all__ = (
     "QueryHandler",
     "QueryDispatcher",
     "QueryDispatcherImpl",
+    "StreamQuery",
+    "StreamQueryHandler",
     "Event",
     "EventHandler",
+    "EventBatch",
+    "BatchEventHandler",
     "EventObserver",
     "EventObserverImpl",
 )
@@ -0,0 +1,10 @@
+from .memo import QueryMemo
+from .memory import MemoryQueryCache, TagMetrics
+from .policy import CachePolicy
+
+__all__ = (
+    "CachePolicy",
+    "MemoryQueryCache",
+    "QueryMemo",
+    "TagMetrics",
+)
@@ -0,0 +1,58 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+Outcome = tuple[bool, Any]
+
+
+class QueryMemo:
+    def __init__(self) -> None:
+        self._results: dict[Hashable, asyncio.Future[Outcome]] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self) -> None:
+        # Queries executed at the moment aren't memoized after they are finished
+        self._results.clear()
+
+    async def run(self, query: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        while (result := self._results.get(query)) is not None:
+            try:
+                res: T = self._unwrap(await asyncio.shield(result))
+                return res
+            except asyncio.CancelledError:
+                if not result.cancelled():
+                    raise
+                # The first execution was cancelled, so the query is executed again
+
+        future: asyncio.Future[Outcome] = asyncio.get_running_loop().create_future()
+        self._results[query] = future
+        outcome: Outcome
+        try:
+            outcome = True, await func()
+        except Exception as err:  # pylint: disable=broad-except
+            outcome = False, err
+        except BaseException:
+            self._forget(query, future)
+            future.cancel()
+            raise
+
+        # Failed queries aren't memoized, but concurrent equal queries get the same exception
+        if not outcome[0]:
+            self._forget(query, future)
+        future.set_result(outcome)
+        res = self._unwrap(outcome)
+        return res
+
+    def _forget(self, query: Hashable, future: asyncio.Future[Outcome]) -> None:
+        if self._results.get(query) is future:
+            del self._results[query]
+
+    @staticmethod
+    def _unwrap(outcome: Outcome) -> Any:
+        is_ok, res = outcome
+        if not is_ok:
+            raise res
+        return res
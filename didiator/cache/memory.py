@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from collections.abc import Collection, Hashable, Iterable
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from didiator.interface.cache import CacheEntry, QueryCache
+
+
+def get_tag_family(tag: str) -> str:
+    # Tags like "user:1" and "user:2" belong to the "user" family
+    return tag.partition(":")[0]
+
+
+@dataclass(frozen=True)
+class TagMetrics:
+    hits: int
+    misses: int
+    invalidations: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _TagFamily:
+    __slots__ = ("hits", "misses", "invalidations")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+
+class MemoryQueryCache(QueryCache):
+    def __init__(self, max_entries: int = 10_000, *, max_invalidations: int = 10_000) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[Hashable]] = {}
+
+        # Versions of the last invalidation of recent tags, values computed before them aren't stored.
+        # Values computed before the forgotten invalidations aren't stored at all
+        self._version = 0
+        self._max_invalidations = max_invalidations
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._min_version = 0
+
+        self._families: dict[str, _TagFamily] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def metrics(self) -> dict[str, TagMetrics]:
+        return {
+            name: TagMetrics(family.hits, family.misses, family.invalidations)
+            for name, family in self._families.items()
+        }
+
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable, tags: Collection[str] = ()) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._delete(key)
+            entry = None
+
+        if entry is None:
+            for family in self._get_families(tags):
+                family.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        for family in self._get_families(entry.tags):
+            family.hits += 1
+        return entry
+
+    def set(
+        self, key: Hashable, value: Any, tags: Collection[str], ttl: float,
+        *, stale_ttl: float = 0.0, version: int | None = None,
+    ) -> bool:
+        tags = frozenset(tags)
+        if version is not None and not self._is_fresh(tags, version):
+            return False
+
+        self._delete(key)
+        # Stale entries are kept until their hard expiration, so they can be served while they are refreshed
+        stale_at = time.monotonic() + ttl
+        self._entries[key] = CacheEntry(
+            value, tags, stale_at, stale_at + stale_ttl, version if version is not None else self._version,
+        )
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self._max_entries:
+            self._delete(next(iter(self._entries)))
+        return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        self._version += 1
+        removed = 0
+        for tag in tags:
+            self._invalidated[tag] = self._version
+            self._invalidated.move_to_end(tag)
+            self._get_family(get_tag_family(tag)).invalidations += 1
+            for key in self._keys_by_tag.pop(tag, ()):
+                removed += self._delete(key)
+
+        while len(self._invalidated) > self._max_invalidations:
+            _, self._min_version = self._invalidated.popitem(last=False)
+        return removed
+
+    def _is_fresh(self, tags: frozenset[str], version: int) -> bool:
+        if version < self._min_version:
+            return False
+        return all(self._invalidated.get(tag, 0) <= version for tag in tags)
+
+    def _delete(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+        return True
+
+    def _get_families(self, tags: Iterable[str]) -> list[_TagFamily]:
+        return [self._get_family(name) for name in {get_tag_family(tag) for tag in tags}]
+
+    def _get_family(self, name: str) -> _TagFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = _TagFamily()
+        return family
@@ -0,0 +1,27 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: float = 60.0
+    tags: Callable[[Any], Iterable[str]] | None = None
+    # Stale results are returned for this long after the ttl while they are refreshed in the background
+    stale_ttl: float = 0.0
+    # Results requested after this fraction of the ttl are refreshed before they get stale
+    refresh_ahead: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.refresh_ahead is not None and not 0 < self.refresh_ahead < 1:
+            raise ValueError("refresh_ahead has to be between 0 and 1")
+
+    def get_tags(self, query: Any) -> frozenset[str]:
+        if self.tags is None:
+            return frozenset()
+        return frozenset(self.tags(query))
+
+    def get_refresh_at(self, stale_at: float) -> float:
+        if self.refresh_ahead is None:
+            return stale_at
+        return stale_at - self.ttl * (1 - self.refresh_ahead)
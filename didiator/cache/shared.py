@@ -0,0 +1,230 @@
+from collections.abc import Collection, Hashable, Iterable, Iterator
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from typing import Any
+import uuid
+
+from didiator.interface.cache import CacheEntry, QueryCache
+from didiator.interface.utils.serializer import Serializer
+from didiator.utils.serializer import PickleSerializer
+
+MAGIC = b"didcache"
+MAX_TAGS = 8
+
+# Magic, buckets, ways, slot size, tag counters, the version of the last invalidation and the boot id
+_HEADER = struct.Struct("<8sIIIIQ16s")
+_HEADER_SIZE = 64
+_VERSION_OFFSET = 24
+_BOOT_ID_OFFSET = 32
+_BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+_COUNTER = struct.Struct("<Q")
+# The clock hand of a bucket
+_BUCKET_HEADER = struct.Struct("<B7x")
+# Key digest, version, stale and expiration times, data length, reference bit and tags count
+_SLOT = struct.Struct("<16sQddIBB2x")
+_REFERENCED_OFFSET = 44
+_TAGS = struct.Struct(f"<{MAX_TAGS}I")
+_SLOT_HEADER_SIZE = _SLOT.size + _TAGS.size
+
+
+class SharedMemoryCache(QueryCache):
+    def __init__(
+        self, path: str | os.PathLike[str],
+        *, buckets: int = 4096, ways: int = 4, slot_size: int = 1024, counters: int = 65536,
+        serializer: Serializer | None = None,
+    ) -> None:
+        if slot_size <= _SLOT_HEADER_SIZE:
+            raise ValueError(f"Slot size has to be greater than {_SLOT_HEADER_SIZE} bytes")
+        self._buckets = buckets
+        self._ways = ways
+        self._slot_size = slot_size
+        self._counters = counters
+        self._bucket_size = _BUCKET_HEADER.size + ways * slot_size
+        self._counters_offset = _HEADER_SIZE
+        self._buckets_offset = _HEADER_SIZE + counters * _COUNTER.size
+        self._size = self._buckets_offset + buckets * self._bucket_size
+
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._mmap = self._open()
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    @property
+    def max_value_size(self) -> int:
+        return self._slot_size - _SLOT_HEADER_SIZE
+
+    def version(self) -> int:
+        with self._lock(0, self._buckets_offset, exclusive=False):
+            return self._read_version()
+
+    def get(self, key: Hashable, tags: Collection[str] = ()) -> CacheEntry | None:
+        digest = self._get_digest(key)
+        bucket_offset = self._get_bucket_offset(digest)
+        # The monotonic clock is shared by processes of a host until it reboots
+        now = time.monotonic()
+
+        with self._lock(bucket_offset, self._bucket_size):
+            slot_offset = self._find_slot(bucket_offset, digest, now)
+            if slot_offset is None:
+                return None
+            _, version, stale_at, expires_at, length, _, tags_count = _SLOT.unpack_from(self._mmap, slot_offset)
+            # The reference bit gives the entry a second chance during eviction
+            self._mmap[slot_offset + _REFERENCED_OFFSET] = 1
+            counter_ids = _TAGS.unpack_from(self._mmap, slot_offset + _SLOT.size)[:tags_count]
+            data_offset = slot_offset + _SLOT_HEADER_SIZE
+            data = self._mmap[data_offset:data_offset + length]
+
+        if not self._is_valid(counter_ids, version):
+            return None
+        value, entry_tags = self._serializer.loads(data)
+        return CacheEntry(value, frozenset(entry_tags), stale_at, expires_at, version)
+
+    def set(
+        self, key: Hashable, value: Any, tags: Collection[str], ttl: float,
+        *, stale_ttl: float = 0.0, version: int | None = None,
+    ) -> bool:
+        tags = frozenset(tags)
+        counter_ids = [self._get_counter_id(tag) for tag in tags]
+        if version is None:
+            version = self.version()
+        elif not self._is_valid(counter_ids, version):
+            return False
+
+        # Entries that don't fit into a slot aren't stored
+        data = self._serializer.dumps((value, tuple(tags)))
+        if len(data) > self.max_value_size or len(tags) > MAX_TAGS:
+            return False
+
+        digest = self._get_digest(key)
+        bucket_offset = self._get_bucket_offset(digest)
+        stale_at = time.monotonic() + ttl
+        with self._lock(bucket_offset, self._bucket_size):
+            slot_offset = self._choose_slot(bucket_offset, digest)
+            _SLOT.pack_into(
+                self._mmap, slot_offset, digest, version, stale_at, stale_at + stale_ttl, len(data), 0, len(tags),
+            )
+            _TAGS.pack_into(self._mmap, slot_offset + _SLOT.size, *counter_ids, *[0] * (MAX_TAGS - len(tags)))
+            data_offset = slot_offset + _SLOT_HEADER_SIZE
+            self._mmap[data_offset:data_offset + len(data)] = data
+        return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        # Entries aren't removed, they are checked against versions of their tags when they are read
+        counter_ids = [self._get_counter_id(tag) for tag in tags]
+        with self._lock(0, self._buckets_offset):
+            version = self._read_version() + 1
+            _COUNTER.pack_into(self._mmap, _VERSION_OFFSET, version)
+            for counter_id in counter_ids:
+                _COUNTER.pack_into(self._mmap, self._counters_offset + counter_id * _COUNTER.size, version)
+        return 0
+
+    def is_valid(self, tags: Iterable[str], version: int) -> bool:
+        return self._is_valid([self._get_counter_id(tag) for tag in tags], version)
+
+    def close(self) -> None:
+        self._mmap.close()
+        os.close(self._fd)
+
+    def _open(self) -> mmap.mmap:
+        # The first process initializes the file, the others check that it has the same layout
+        with self._lock(0, _HEADER_SIZE):
+            header = (MAGIC, self._buckets, self._ways, self._slot_size, self._counters)
+            boot_id = _get_boot_id()
+            if os.fstat(self._fd).st_size != 0:
+                buffer = mmap.mmap(self._fd, 0)
+                stored_header = _HEADER.unpack_from(buffer, 0)
+                if stored_header[:5] != header or len(buffer) != self._size:
+                    buffer.close()
+                    raise ValueError("Shared cache file has another layout")
+                if stored_header[6] == boot_id:
+                    return buffer
+                # Entries of a file kept after a reboot have times of the old monotonic clock, so they are dropped
+                buffer.close()
+                os.ftruncate(self._fd, 0)
+
+            os.ftruncate(self._fd, self._size)
+            buffer = mmap.mmap(self._fd, self._size)
+            _HEADER.pack_into(buffer, 0, *header, 0, boot_id)
+            return buffer
+
+    @contextmanager
+    def _lock(self, offset: int, length: int, *, exclusive: bool = True) -> Iterator[None]:
+        # Byte-range locks let processes work with different buckets at the same time
+        fcntl.lockf(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH, length, offset)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+
+    def _read_version(self) -> int:
+        version: int = _COUNTER.unpack_from(self._mmap, _VERSION_OFFSET)[0]
+        return version
+
+    def _is_valid(self, counter_ids: Iterable[int], version: int) -> bool:
+        # A counter keeps the version of the last invalidation of its tags,
+        # so colliding tags cause extra misses but never stale results
+        with self._lock(0, self._buckets_offset, exclusive=False):
+            return all(
+                _COUNTER.unpack_from(self._mmap, self._counters_offset + counter_id * _COUNTER.size)[0] <= version
+                for counter_id in counter_ids
+            )
+
+    def _get_digest(self, key: Hashable) -> bytes:
+        return hashlib.blake2b(self._serializer.dumps(key), digest_size=16).digest()
+
+    def _get_counter_id(self, tag: str) -> int:
+        return int.from_bytes(hashlib.blake2b(tag.encode(), digest_size=8).digest(), "little") % self._counters
+
+    def _get_bucket_offset(self, digest: bytes) -> int:
+        return self._buckets_offset + int.from_bytes(digest[:8], "little") % self._buckets * self._bucket_size
+
+    def _get_slot_offset(self, bucket_offset: int, way: int) -> int:
+        return bucket_offset + _BUCKET_HEADER.size + way * self._slot_size
+
+    def _find_slot(self, bucket_offset: int, digest: bytes, now: float) -> int | None:
+        for way in range(self._ways):
+            slot_offset = self._get_slot_offset(bucket_offset, way)
+            slot_digest, _, _, expires_at, *_ = _SLOT.unpack_from(self._mmap, slot_offset)
+            if slot_digest == digest and expires_at > now:
+                return slot_offset
+        return None
+
+    def _choose_slot(self, bucket_offset: int, digest: bytes) -> int:
+        now = time.monotonic()
+        for way in range(self._ways):
+            slot_offset = self._get_slot_offset(bucket_offset, way)
+            slot_digest, _, _, expires_at, *_ = _SLOT.unpack_from(self._mmap, slot_offset)
+            if slot_digest == digest or expires_at <= now:
+                return slot_offset
+
+        # Clock eviction: referenced entries get a second chance, the hand stops at the first unreferenced one
+        hand = _BUCKET_HEADER.unpack_from(self._mmap, bucket_offset)[0]
+        while True:
+            slot_offset = self._get_slot_offset(bucket_offset, hand)
+            referenced_offset = slot_offset + _REFERENCED_OFFSET
+            next_hand = (hand + 1) % self._ways
+            if not self._mmap[referenced_offset]:
+                _BUCKET_HEADER.pack_into(self._mmap, bucket_offset, next_hand)
+                return slot_offset
+            self._mmap[referenced_offset] = 0
+            hand = next_hand
+
+
+def _get_boot_id() -> bytes:
+    # Systems without the boot id rely on the file being in memory, like /dev/shm, so it doesn't outlive a reboot
+    try:
+        with open(_BOOT_ID_PATH) as file:
+            return uuid.UUID(file.read().strip()).bytes
+    except (OSError, ValueError):
+        return bytes(16)
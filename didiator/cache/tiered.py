@@ -0,0 +1,60 @@
+from collections.abc import Collection, Hashable, Iterable
+import dataclasses
+import time
+from typing import Any
+
+from didiator.cache.shared import SharedMemoryCache
+from didiator.interface.cache import CacheEntry, QueryCache
+
+
+class TieredQueryCache(QueryCache):
+    def __init__(self, local: QueryCache, shared: SharedMemoryCache) -> None:
+        self._local = local
+        self._shared = shared
+
+    @property
+    def local(self) -> QueryCache:
+        return self._local
+
+    @property
+    def shared(self) -> SharedMemoryCache:
+        return self._shared
+
+    def version(self) -> int:
+        return self._shared.version()
+
+    def get(self, key: Hashable, tags: Collection[str] = ()) -> CacheEntry | None:
+        # Local entries keep the shared version they were computed at,
+        # so invalidations made by other processes are seen without messages between them
+        entry = self._local.get(key, tags)
+        if entry is not None:
+            value, version = entry.value
+            if self._shared.is_valid(entry.tags, version):
+                return dataclasses.replace(entry, value=value, version=version)
+
+        entry = self._shared.get(key, tags)
+        if entry is None:
+            return None
+
+        ttl = entry.stale_at - time.monotonic()
+        self._local.set(
+            key, (entry.value, entry.version), entry.tags, ttl, stale_ttl=entry.expires_at - entry.stale_at,
+        )
+        return entry
+
+    def set(
+        self, key: Hashable, value: Any, tags: Collection[str], ttl: float,
+        *, stale_ttl: float = 0.0, version: int | None = None,
+    ) -> bool:
+        if version is None:
+            version = self._shared.version()
+        elif not self._shared.is_valid(tags, version):
+            return False
+
+        self._shared.set(key, value, tags, ttl, stale_ttl=stale_ttl, version=version)
+        return self._local.set(key, (value, version), tags, ttl, stale_ttl=stale_ttl)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        self._shared.invalidate(tags)
+        return self._local.invalidate(tags)
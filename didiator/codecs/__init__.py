@@ -0,0 +1,7 @@
+from .binary import BinaryCodecRegistry, build_codec, get_stable_tag
+
+__all__ = (
+    "BinaryCodecRegistry",
+    "build_codec",
+    "get_stable_tag",
+)
@@ -0,0 +1,437 @@
+import collections.abc
+import dataclasses
+import datetime as dt
+import decimal
+import enum
+import hashlib
+from operator import attrgetter
+import struct
+import types
+import typing
+from typing import Any, Callable, NamedTuple, Type
+import uuid
+
+from didiator.codecs.varint import read_uvarint, read_varint, write_uvarint, write_varint
+from didiator.interface.exceptions import CodecError
+from didiator.interface.utils.serializer import Serializer
+
+Encoder = Callable[[bytearray, Any], None]
+Decoder = Callable[[memoryview, int], tuple[Any, int]]
+Upgrader = Callable[[int, dict[str, Any]], dict[str, Any]]
+
+FLOAT = struct.Struct("<d")
+FALLBACK_TAG = 0
+
+_SEQUENCE_TYPES: dict[Any, Callable[[list[Any]], Any]] = {
+    list: list,
+    collections.abc.Sequence: tuple,
+    collections.abc.MutableSequence: list,
+    set: set,
+    frozenset: frozenset,
+    collections.abc.Set: frozenset,
+    collections.abc.MutableSet: set,
+}
+_MAPPING_TYPES = (dict, collections.abc.Mapping, collections.abc.MutableMapping)
+
+
+def get_stable_tag(cls: type) -> int:
+    # hash() of strings is randomized per process, so the tag is derived from a digest of the qualified name
+    digest = hashlib.blake2b(f"{cls.__module__}.{cls.__qualname__}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def _check_size(data: memoryview, end: int) -> None:
+    if end > len(data):
+        raise IndexError("Buffer is truncated")
+
+
+def _encode_none(buf: bytearray, value: None) -> None:
+    pass
+
+
+def _decode_none(data: memoryview, offset: int) -> tuple[None, int]:
+    return None, offset
+
+
+def _encode_bool(buf: bytearray, value: bool) -> None:
+    buf.append(1 if value else 0)
+
+
+def _decode_bool(data: memoryview, offset: int) -> tuple[bool, int]:
+    return data[offset] != 0, offset + 1
+
+
+def _encode_float(buf: bytearray, value: float) -> None:
+    buf += FLOAT.pack(value)
+
+
+def _decode_float(data: memoryview, offset: int) -> tuple[float, int]:
+    return FLOAT.unpack_from(data, offset)[0], offset + FLOAT.size
+
+
+def _encode_bytes(buf: bytearray, value: bytes | bytearray | memoryview) -> None:
+    write_uvarint(buf, len(value) if not isinstance(value, memoryview) else value.nbytes)
+    buf += value
+
+
+def _decode_memoryview(data: memoryview, offset: int) -> tuple[memoryview, int]:
+    # The result is a slice of the decoded buffer, nothing is copied
+    size, offset = read_uvarint(data, offset)
+    end = offset + size
+    _check_size(data, end)
+    return data[offset:end], end
+
+
+def _decode_bytes(data: memoryview, offset: int) -> tuple[bytes, int]:
+    value, offset = _decode_memoryview(data, offset)
+    return value.tobytes(), offset
+
+
+def _encode_str(buf: bytearray, value: str) -> None:
+    _encode_bytes(buf, value.encode())
+
+
+def _decode_str(data: memoryview, offset: int) -> tuple[str, int]:
+    value, offset = _decode_memoryview(data, offset)
+    return str(value, "utf-8"), offset
+
+
+def _encode_uuid(buf: bytearray, value: uuid.UUID) -> None:
+    buf += value.bytes
+
+
+def _decode_uuid(data: memoryview, offset: int) -> tuple[uuid.UUID, int]:
+    end = offset + 16
+    _check_size(data, end)
+    return uuid.UUID(bytes=data[offset:end].tobytes()), end
+
+
+def _build_str_codec(to_str: Callable[[Any], str], from_str: Callable[[str], Any]) -> tuple[Encoder, Decoder]:
+    def encode(buf: bytearray, value: Any) -> None:
+        _encode_str(buf, to_str(value))
+
+    def decode(data: memoryview, offset: int) -> tuple[Any, int]:
+        value, offset = _decode_str(data, offset)
+        return from_str(value), offset
+
+    return encode, decode
+
+
+_SCALAR_CODECS: dict[Any, tuple[Encoder, Decoder]] = {
+    type(None): (_encode_none, _decode_none),
+    bool: (_encode_bool, _decode_bool),
+    int: (write_varint, read_varint),
+    float: (_encode_float, _decode_float),
+    str: (_encode_str, _decode_str),
+    bytes: (_encode_bytes, _decode_bytes),
+    memoryview: (_encode_bytes, _decode_memoryview),
+    uuid.UUID: (_encode_uuid, _decode_uuid),
+    dt.datetime: _build_str_codec(dt.datetime.isoformat, dt.datetime.fromisoformat),
+    dt.date: _build_str_codec(dt.date.isoformat, dt.date.fromisoformat),
+    dt.time: _build_str_codec(dt.time.isoformat, dt.time.fromisoformat),
+    decimal.Decimal: _build_str_codec(str, decimal.Decimal),
+}
+
+
+class DataclassCodec:
+    def __init__(self, cls: type, nested: dict[type, "DataclassCodec"]) -> None:
+        # The codec is cached before its fields are built, so recursive dataclasses are supported
+        nested[cls] = self
+        self.cls = cls
+        fields = tuple(field for field in dataclasses.fields(cls) if field.init)
+        hints = typing.get_type_hints(cls)
+
+        self.names = tuple(field.name for field in fields)
+        codecs = [build_codec(hints[field.name], nested) for field in fields]
+        self.encoders = tuple(encoder for encoder, _ in codecs)
+        self.decoders = tuple(decoder for _, decoder in codecs)
+        self.fields = fields
+        self.positional = not any(field.kw_only for field in fields)
+        # Calling __init__ of frozen dataclasses is slow, so plain ones are filled directly.
+        # Bases like Generic define empty __slots__, only slots of dataclasses keep fields out of __dict__
+        self.direct = (
+            not hasattr(cls, "__post_init__") and len(fields) == len(dataclasses.fields(cls))
+            and not any("__slots__" in vars(base) for base in cls.__mro__ if dataclasses.is_dataclass(base))
+        )
+
+        getter = attrgetter(*self.names) if self.names else lambda obj: ()
+        self.get_values: Callable[[Any], tuple[Any, ...]] = (
+            getter if len(self.names) != 1 else lambda obj: (getter(obj),)
+        )
+
+    def encode(self, buf: bytearray, obj: Any) -> None:
+        write_uvarint(buf, len(self.encoders))
+        for encoder, value in zip(self.encoders, self.get_values(obj)):
+            encoder(buf, value)
+
+    def decode_values(self, data: memoryview, offset: int) -> tuple[list[Any], int]:
+        count, offset = read_uvarint(data, offset)
+        decoders = self.decoders
+        if count > len(decoders):
+            raise CodecError(f"{self.cls.__qualname__} has {len(decoders)} fields, but {count} are encoded")
+
+        if count < len(decoders):
+            decoders = decoders[:count]
+
+        values: list[Any] = []
+        append = values.append
+        for decoder in decoders:
+            value, offset = decoder(data, offset)
+            append(value)
+        return values, offset
+
+    def build(self, values: list[Any]) -> Any:
+        # Fields can only be appended to a dataclass, missing ones are taken from defaults
+        if len(values) < len(self.names):
+            return self.cls(**self.fill_defaults(dict(zip(self.names, values))))
+        if self.direct:
+            obj: Any = object.__new__(self.cls)
+            obj.__dict__.update(zip(self.names, values))
+            return obj
+        if self.positional:
+            return self.cls(*values)
+        return self.cls(**dict(zip(self.names, values)))
+
+    def fill_defaults(self, values: dict[str, Any]) -> dict[str, Any]:
+        for field in self.fields:
+            if field.name in values:
+                continue
+            if field.default is not dataclasses.MISSING:
+                values[field.name] = field.default
+            elif field.default_factory is not dataclasses.MISSING:
+                values[field.name] = field.default_factory()
+            else:
+                raise CodecError(f"Field {field.name} of {self.cls.__qualname__} is missing and has no default")
+        return values
+
+    def decode(self, data: memoryview, offset: int) -> tuple[Any, int]:
+        values, offset = self.decode_values(data, offset)
+        return self.build(values), offset
+
+
+def build_codec(tp: Any, nested: dict[type, DataclassCodec] | None = None) -> tuple[Encoder, Decoder]:
+    if nested is None:
+        nested = {}
+
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    if origin is typing.Annotated:
+        return build_codec(args[0], nested)
+    if tp in _SCALAR_CODECS:
+        return _SCALAR_CODECS[tp]
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return _build_enum_codec(tp, nested)
+    if dataclasses.is_dataclass(tp) and isinstance(tp, type):
+        codec = nested.get(tp) or DataclassCodec(tp, nested)
+        return codec.encode, codec.decode
+    if origin is typing.Union or origin is types.UnionType:
+        return _build_optional_codec(tp, args, nested)
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _build_sequence_codec(args[0], tuple, nested)
+        return _build_tuple_codec(args, nested)
+    if origin in _SEQUENCE_TYPES:
+        return _build_sequence_codec(args[0] if args else Any, _SEQUENCE_TYPES[origin], nested)
+    if origin in _MAPPING_TYPES and len(args) == 2:
+        return _build_mapping_codec(args[0], args[1], nested)
+    raise TypeError(f"Values of {tp!r} type can't be encoded")
+
+
+def _build_enum_codec(tp: Type[enum.Enum], nested: dict[type, DataclassCodec]) -> tuple[Encoder, Decoder]:
+    # Members are encoded by value, so reordering them doesn't break encoded data
+    value_types = {type(member.value) for member in tp}
+    if len(value_types) != 1:
+        raise TypeError(f"Values of {tp.__qualname__} enum members must have the same type")
+    encode_value, decode_value = build_codec(value_types.pop(), nested)
+
+    def encode(buf: bytearray, value: enum.Enum) -> None:
+        encode_value(buf, value.value)
+
+    def decode(data: memoryview, offset: int) -> tuple[enum.Enum, int]:
+        value, offset = decode_value(data, offset)
+        return tp(value), offset
+
+    return encode, decode
+
+
+def _build_optional_codec(
+    tp: Any, args: tuple[Any, ...], nested: dict[type, DataclassCodec],
+) -> tuple[Encoder, Decoder]:
+    not_none_args = tuple(arg for arg in args if arg is not type(None))
+    if len(not_none_args) != 1 or len(args) != 2:
+        raise TypeError(f"Only optional unions can be encoded, not {tp!r}")
+    encode_value, decode_value = build_codec(not_none_args[0], nested)
+
+    def encode(buf: bytearray, value: Any) -> None:
+        if value is None:
+            buf.append(0)
+        else:
+            buf.append(1)
+            encode_value(buf, value)
+
+    def decode(data: memoryview, offset: int) -> tuple[Any, int]:
+        if data[offset] == 0:
+            return None, offset + 1
+        return decode_value(data, offset + 1)
+
+    return encode, decode
+
+
+def _build_sequence_codec(
+    item_type: Any, factory: Callable[[list[Any]], Any], nested: dict[type, DataclassCodec],
+) -> tuple[Encoder, Decoder]:
+    encode_item, decode_item = build_codec(item_type, nested)
+
+    def encode(buf: bytearray, value: Any) -> None:
+        write_uvarint(buf, len(value))
+        for item in value:
+            encode_item(buf, item)
+
+    def decode(data: memoryview, offset: int) -> tuple[Any, int]:
+        count, offset = read_uvarint(data, offset)
+        items = []
+        for _ in range(count):
+            item, offset = decode_item(data, offset)
+            items.append(item)
+        return factory(items), offset
+
+    return encode, decode
+
+
+def _build_tuple_codec(item_types: tuple[Any, ...], nested: dict[type, DataclassCodec]) -> tuple[Encoder, Decoder]:
+    codecs = tuple(build_codec(item_type, nested) for item_type in item_types)
+
+    def encode(buf: bytearray, value: tuple[Any, ...]) -> None:
+        if len(value) != len(codecs):
+            raise TypeError(f"Tuple of {len(codecs)} items is expected, got {len(value)}")
+        for (encode_item, _), item in zip(codecs, value):
+            encode_item(buf, item)
+
+    def decode(data: memoryview, offset: int) -> tuple[tuple[Any, ...], int]:
+        items = []
+        for _, decode_item in codecs:
+            item, offset = decode_item(data, offset)
+            items.append(item)
+        return tuple(items), offset
+
+    return encode, decode
+
+
+def _build_mapping_codec(
+    key_type: Any, value_type: Any, nested: dict[type, DataclassCodec],
+) -> tuple[Encoder, Decoder]:
+    encode_key, decode_key = build_codec(key_type, nested)
+    encode_value, decode_value = build_codec(value_type, nested)
+
+    def encode(buf: bytearray, value: Any) -> None:
+        write_uvarint(buf, len(value))
+        for key, item in value.items():
+            encode_key(buf, key)
+            encode_value(buf, item)
+
+    def decode(data: memoryview, offset: int) -> tuple[dict[Any, Any], int]:
+        count, offset = read_uvarint(data, offset)
+        items = {}
+        for _ in range(count):
+            key, offset = decode_key(data, offset)
+            items[key], offset = decode_value(data, offset)
+        return items, offset
+
+    return encode, decode
+
+
+class _Registration(NamedTuple):
+    tag: int
+    version: int
+    codec: DataclassCodec
+    upgrade: Upgrader | None
+
+
+class BinaryCodecRegistry(Serializer):
+    def __init__(self, *, fallback: Serializer | None = None) -> None:
+        self._fallback = fallback
+        self._by_type: dict[type, _Registration] = {}
+        self._by_tag: dict[int, _Registration] = {}
+        self._nested: dict[type, DataclassCodec] = {}
+
+    def register(
+        self, request_type: type, *, tag: int | None = None, version: int = 1, upgrade: Upgrader | None = None,
+    ) -> None:
+        if not dataclasses.is_dataclass(request_type):
+            raise TypeError(f"Only dataclasses can be registered, not {request_type.__qualname__}")
+        if tag is None:
+            tag = get_stable_tag(request_type)
+        if tag == FALLBACK_TAG:
+            raise ValueError(f"Tag {FALLBACK_TAG} is reserved for the fallback serializer")
+        if tag in self._by_tag and self._by_tag[tag].codec.cls is not request_type:
+            raise ValueError(
+                f"Tag {tag} of {request_type.__qualname__} is already used by "
+                f"{self._by_tag[tag].codec.cls.__qualname__}",
+            )
+
+        codec = self._nested.get(request_type) or DataclassCodec(request_type, self._nested)
+        registration = _Registration(tag, version, codec, upgrade)
+        self._by_type[request_type] = registration
+        self._by_tag[tag] = registration
+
+    def dumps(self, obj: Any) -> bytes:
+        buf = bytearray()
+        self.encode_into(buf, obj)
+        return bytes(buf)
+
+    def encode_into(self, buf: bytearray, obj: Any) -> None:
+        # Layout: type tag, schema version, fields count and fields in the order of their definition
+        registration = self._by_type.get(type(obj))
+        if registration is None:
+            if self._fallback is None:
+                raise CodecError(f"{type(obj).__qualname__} isn't registered")
+            write_uvarint(buf, FALLBACK_TAG)
+            _encode_bytes(buf, self._fallback.dumps(obj))
+            return
+
+        write_uvarint(buf, registration.tag)
+        write_uvarint(buf, registration.version)
+        try:
+            registration.codec.encode(buf, obj)
+        except (TypeError, AttributeError, ValueError, OverflowError, struct.error) as err:
+            raise CodecError(f"{type(obj).__qualname__} can't be encoded: {err}") from err
+
+    def loads(self, data: bytes | bytearray | memoryview) -> Any:
+        view = memoryview(data)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        obj, offset = self.decode_from(view)
+        if offset != len(view):
+            raise CodecError("Unexpected data after the encoded object")
+        return obj
+
+    def decode_from(self, data: memoryview, offset: int = 0) -> tuple[Any, int]:
+        # Fields are decoded from the buffer in place, ``memoryview`` fields are slices of it
+        try:
+            tag, offset = read_uvarint(data, offset)
+            if tag == FALLBACK_TAG:
+                if self._fallback is None:
+                    raise CodecError("Fallback serializer isn't set")
+                raw, offset = _decode_memoryview(data, offset)
+                return self._fallback.loads(raw.tobytes()), offset
+
+            registration = self._by_tag.get(tag)
+            if registration is None:
+                raise CodecError(f"Type with {tag} tag isn't registered")
+            version, offset = read_uvarint(data, offset)
+            if version > registration.version:
+                raise CodecError(
+                    f"{registration.codec.cls.__qualname__} of version {version} can't be decoded, "
+                    f"only versions up to {registration.version} are known",
+                )
+
+            values, offset = registration.codec.decode_values(data, offset)
+            if version < registration.version and registration.upgrade is not None:
+                codec = registration.codec
+                fields = registration.upgrade(version, dict(zip(codec.names, values)))
+                return codec.cls(**codec.fill_defaults(fields)), offset
+            return registration.codec.build(values), offset
+        except CodecError:
+            raise
+        except (IndexError, ValueError, TypeError, struct.error) as err:
+            raise CodecError(f"Data can't be decoded: {err}") from err
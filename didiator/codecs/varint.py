@@ -0,0 +1,31 @@
+def write_uvarint(buf: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def read_uvarint(data: memoryview, offset: int) -> tuple[int, int]:
+    byte = data[offset]
+    if byte < 0x80:
+        return byte, offset + 1
+
+    result = byte & 0x7F
+    shift = 7
+    while True:
+        offset += 1
+        byte = data[offset]
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset + 1
+        shift += 7
+
+
+def write_varint(buf: bytearray, value: int) -> None:
+    # Zigzag encoding keeps small negative numbers short
+    write_uvarint(buf, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def read_varint(data: memoryview, offset: int) -> tuple[int, int]:
+    value, offset = read_uvarint(data, offset)
+    return (value >> 1) ^ -(value & 1), offset
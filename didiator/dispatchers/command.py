@@ -1,3 +1,4 @@
+from concurrent.futures import Executor
 from typing import Any, Type, TypeVar
 
 from didiator.interface.entities.command import Command
@@ -11,8 +12,10 @@ C = TypeVar("C", bound=Command[Any])
 
 
 class CommandDispatcherImpl(DispatcherImpl, CommandDispatcher):
-    def register_handler(self, command: Type[C], handler: HandlerType[C, CRes]) -> None:
-        super()._register_handler(command, handler)
+    def register_handler(
+        self, command: Type[C], handler: HandlerType[C, CRes], *, executor: Executor | None = None,
+    ) -> None:
+        super()._register_handler(command, handler, executor)
 
     async def send(self, command: Command[CRes], *args: Any, **kwargs: Any) -> CRes:
         try:
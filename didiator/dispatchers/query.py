@@ -1,18 +1,24 @@
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
 from typing import Any, Type, TypeVar
 
 from didiator.interface.handlers.request import HandlerType
 from didiator.interface.dispatchers.query import QueryDispatcher
 from didiator.interface.entities.query import Query
+from didiator.interface.entities.stream_query import StreamQuery
 from didiator.interface.exceptions import HandlerNotFound, QueryHandlerNotFound
 from didiator.dispatchers.request import DispatcherImpl
 
 QRes = TypeVar("QRes")
 Q = TypeVar("Q", bound=Query[Any])
+SQ = TypeVar("SQ", bound=StreamQuery[Any])
 
 
 class QueryDispatcherImpl(DispatcherImpl, QueryDispatcher):
-    def register_handler(self, query: Type[Q], handler: HandlerType[Q, QRes]) -> None:
-        super()._register_handler(query, handler)
+    def register_handler(
+        self, query: Type[Q], handler: HandlerType[Q, QRes], *, executor: Executor | None = None,
+    ) -> None:
+        super()._register_handler(query, handler, executor)
 
     async def query(self, query: Query[QRes], *args: Any, **kwargs: Any) -> QRes:
         try:
@@ -21,3 +27,15 @@ class QueryDispatcherImpl(DispatcherImpl, QueryDispatcher):
             raise QueryHandlerNotFound(
                 f"Query handler for {type(query).__name__} query is not registered", query,
             ) from err
+
+    def register_stream_handler(self, query: Type[SQ], handler: HandlerType[SQ, AsyncIterator[QRes]]) -> None:
+        # Stream handlers aren't wrapped with executors, they always run in the event loop
+        self._handlers[query] = handler
+
+    def stream(self, query: StreamQuery[QRes], *args: Any, **kwargs: Any) -> AsyncIterator[QRes]:
+        try:
+            return self._stream(query, *args, **kwargs)
+        except HandlerNotFound as err:
+            raise QueryHandlerNotFound(
+                f"Query handler for {type(query).__name__} stream query is not registered", query,
+            ) from err
@@ -1,10 +1,18 @@
 import abc
+from collections.abc import AsyncIterator, Mapping
+from concurrent.futures import Executor
+import functools
 from typing import Any, Awaitable, Callable, Sequence, Type, TypeVar
 
+from didiator.executors.base import wrap_handler
 from didiator.interface.entities.request import Request
 from didiator.interface.exceptions import HandlerNotFound
 from didiator.interface.handlers import HandlerType
-from didiator.middlewares.base import Middleware, MiddlewareType, wrap_middleware
+from didiator.interface.partitioner import Partitioner
+from didiator.middlewares.base import (
+    Middleware, MiddlewareType, wrap_grouped_middleware, wrap_grouped_stream_middleware,
+)
+from didiator.middlewares.hooks import group_hooks
 from didiator.interface.dispatchers.request import Dispatcher
 
 Self = TypeVar("Self", bound="DispatcherImpl")
@@ -12,6 +20,7 @@ RRes = TypeVar("RRes")
 R = TypeVar("R", bound=Request[Any])
 Middlewares = Sequence[MiddlewareType[Request[Any], Any]]
 Handlers = dict[Type[Request[Any]], HandlerType[Request[Any], Any]]
+Executors = Mapping[Type[Request[Any]], Executor]
 
 DEFAULT_MIDDLEWARES: tuple[MiddlewareType[Request[Any], Any], ...] = (Middleware(),)
 
@@ -19,14 +28,22 @@ DEFAULT_MIDDLEWARES: tuple[MiddlewareType[Request[Any], Any], ...] = (Middleware
 class DispatcherImpl(Dispatcher, abc.ABC):
     def __init__(
         self, middlewares: Middlewares = (),
-        *, handlers: Handlers | None = None,
+        *, handlers: Handlers | None = None, executors: Executors | None = None,
+        partitioner: Partitioner | None = None,
     ) -> None:
         self._middlewares = middlewares
+        # Hook middlewares are grouped once instead of on each request
+        self._chain: Middlewares = group_hooks(middlewares)
 
         if handlers is None:
             handlers = {}
         self._handlers = handlers
 
+        if executors is None:
+            executors = {}
+        self._executors = executors
+        self._partitioner = partitioner
+
     @property
     def handlers(self) -> Handlers:
         return self._handlers
@@ -35,28 +52,66 @@ class DispatcherImpl(Dispatcher, abc.ABC):
     def middlewares(self) -> tuple[MiddlewareType[Request[Any], Any], ...]:
         return tuple(self._middlewares)
 
+    @property
+    def executors(self) -> Executors:
+        return self._executors
+
+    @property
+    def partitioner(self) -> Partitioner | None:
+        return self._partitioner
+
     def copy(self: Self) -> Self:
-        return self.__class__(self._middlewares, handlers=self._handlers)
+        return self.__class__(
+            self._middlewares, handlers=self._handlers, executors=self._executors, partitioner=self._partitioner,
+        )
 
-    def _register_handler(self, request: Type[R], handler: HandlerType[R, RRes]) -> None:
-        self._handlers[request] = handler
+    def _register_handler(
+        self, request: Type[R], handler: HandlerType[R, RRes], executor: Executor | None = None,
+    ) -> None:
+        if executor is None:
+            executor = self._executors.get(request)
+        self._handlers[request] = wrap_handler(request, handler, executor)
 
     async def _handle(self, request: Request[RRes], *args: Any, **kwargs: Any) -> RRes:
+        handler = self._get_handler(request)
+
+        # Handler has to be wrapped with at least one middleware to initialize the handler if it is necessary
+        middlewares: Middlewares = self._chain if self._chain else DEFAULT_MIDDLEWARES
+        wrapped_handler: Callable[..., Awaitable[RRes]] = self._wrap_middleware(middlewares, handler)
+
+        # Requests with the same key are handled in order, requests with different keys run concurrently
+        if self._partitioner is not None:
+            key = self._partitioner.get_key(request)
+            if key is not None:
+                return await self._partitioner.run(key, functools.partial(wrapped_handler, request, *args, **kwargs))
+        return await wrapped_handler(request, *args, **kwargs)
+
+    def _stream(self, request: Request[AsyncIterator[RRes]], *args: Any, **kwargs: Any) -> AsyncIterator[RRes]:
+        # Class stream handlers are initialized by middlewares
+        handler: Callable[..., AsyncIterator[RRes]] = self._get_handler(request)  # type: ignore[assignment]
+
+        middlewares: Middlewares = self._chain if self._chain else DEFAULT_MIDDLEWARES
+        wrapped_handler: Callable[..., AsyncIterator[RRes]] = self._wrap_stream_middleware(middlewares, handler)
+        return wrapped_handler(request, *args, **kwargs)
+
+    def _get_handler(self, request: Request[RRes]) -> HandlerType[Request[RRes], RRes]:
         try:
-            handler = self._handlers[type(request)]
+            return self._handlers[type(request)]
         except KeyError as err:
             raise HandlerNotFound(
                 f"Request handler for {type(request).__name__} request is not registered", request,
             ) from err
 
-        # Handler has to be wrapped with at least one middleware to initialize the handler if it is necessary
-        middlewares: Middlewares = self._middlewares if self._middlewares else DEFAULT_MIDDLEWARES
-        wrapped_handler: Callable[..., Awaitable[RRes]] = self._wrap_middleware(middlewares, handler)
-        return await wrapped_handler(request, *args, **kwargs)
-
     @staticmethod
     def _wrap_middleware(
         middlewares: Sequence[MiddlewareType[R, Any]],
         handler: HandlerType[R, Any],
     ) -> Callable[..., Awaitable[Any]]:
-        return wrap_middleware(middlewares, handler)
+        return wrap_grouped_middleware(middlewares, handler)
+
+    @staticmethod
+    def _wrap_stream_middleware(
+        middlewares: Sequence[MiddlewareType[R, Any]],
+        handler: Callable[..., AsyncIterator[RRes]],
+    ) -> Callable[..., AsyncIterator[RRes]]:
+        return wrap_grouped_stream_middleware(middlewares, handler)
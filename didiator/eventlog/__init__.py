@@ -0,0 +1,5 @@
+from .segmented import SegmentedEventLog
+
+__all__ = (
+    "SegmentedEventLog",
+)
@@ -0,0 +1,400 @@
+import asyncio
+import bisect
+from collections.abc import Callable, Collection, Iterator, Sequence
+import importlib
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+from typing import Any, BinaryIO, Type
+import zlib
+
+from didiator.interface.entities.event import Event
+from didiator.interface.eventlog import EventLog, LoggedEvent
+from didiator.interface.exceptions import EventLogError
+from didiator.interface.utils.serializer import Serializer
+from didiator.utils.serializer import PickleSerializer
+
+# Size of the payload, CRC32 of the rest of the record, sequence number and id of the event type
+RECORD_HEADER = struct.Struct("<IIQI")
+CRC_START = 8
+# Kind of the entry, sequence number and offset of the record.
+# The kind is an id of the event type, a sequence entry or the end of the indexed segment
+INDEX_ENTRY = struct.Struct("<IQQ")
+SEQUENCE_ENTRY = 0xFFFFFFFF
+END_ENTRY = 0xFFFFFFFE
+
+SEGMENT_SUFFIX = ".log"
+INDEX_SUFFIX = ".idx"
+
+logger = logging.getLogger(__name__)
+
+
+class _Segment:
+    __slots__ = ("path", "first_sequence", "last_sequence", "size", "sequences", "offsets", "type_offsets")
+
+    def __init__(self, path: Path, first_sequence: int) -> None:
+        self.path = path
+        self.first_sequence = first_sequence
+        self.last_sequence = first_sequence - 1
+        self.size = 0
+        # The index is sparse: it keeps offsets of every n-th record and of the first record of each event type
+        self.sequences: list[int] = []
+        self.offsets: list[int] = []
+        self.type_offsets: dict[int, int] = {}
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_suffix(INDEX_SUFFIX)
+
+    def add(self, sequence: int, type_id: int, offset: int, size: int, index_interval: int) -> None:
+        if not self.sequences or sequence - self.sequences[-1] >= index_interval:
+            self.sequences.append(sequence)
+            self.offsets.append(offset)
+        self.type_offsets.setdefault(type_id, offset)
+        self.last_sequence = sequence
+        self.size = offset + size
+
+    def find(self, sequence: int) -> int:
+        position = bisect.bisect_right(self.sequences, sequence) - 1
+        return self.offsets[position] if position >= 0 else 0
+
+    def dump_index(self) -> bytes:
+        entries = [INDEX_ENTRY.pack(END_ENTRY, self.last_sequence, self.size)]
+        entries.extend(
+            INDEX_ENTRY.pack(SEQUENCE_ENTRY, sequence, offset) for sequence, offset in zip(self.sequences, self.offsets)
+        )
+        entries.extend(INDEX_ENTRY.pack(type_id, 0, offset) for type_id, offset in self.type_offsets.items())
+        return b"".join(entries)
+
+    def load_index(self, data: bytes, types_count: int) -> bool:
+        if not data or len(data) % INDEX_ENTRY.size:
+            return False
+        entries = INDEX_ENTRY.iter_unpack(data)
+        kind, last_sequence, size = next(entries)
+        if kind != END_ENTRY or size != self.path.stat().st_size:
+            return False
+
+        for kind, sequence, offset in entries:
+            if kind == SEQUENCE_ENTRY:
+                self.sequences.append(sequence)
+                self.offsets.append(offset)
+            elif kind < types_count:
+                self.type_offsets[kind] = offset
+            else:
+                return False
+        self.last_sequence = last_sequence
+        self.size = size
+        return True
+
+
+class SegmentedEventLog(EventLog):
+    def __init__(
+        self, directory: str | os.PathLike[str],
+        *, segment_size: int = 64 * 1024 * 1024, index_interval: int = 1024,
+        serializer: Serializer | None = None, fsync: bool = True,
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        (self._directory / "checkpoints").mkdir(exist_ok=True)
+        self._segment_size = segment_size
+        self._index_interval = index_interval
+        self._fsync = fsync
+
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+
+        # Names of event types are stored once, records refer to them by ids
+        self._types = self._load_types()
+        self._type_ids: dict[Type[Event], int] = {}
+        self._types_file: BinaryIO = open(self._directory / "types", "ab")
+
+        self._segments = self._load_segments()
+        self._file: BinaryIO = open(self._segments[-1].path, "ab")
+        self._sealed: list[tuple[BinaryIO, _Segment]] = []
+
+        self._waiters: list[asyncio.Future[None]] = []
+        self._sync_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def last_sequence(self) -> int:
+        return self._segments[-1].last_sequence
+
+    @property
+    def segments(self) -> int:
+        return len(self._segments)
+
+    async def append(self, events: Sequence[Event]) -> int:
+        if self._closed:
+            raise EventLogError("Event log is closed")
+        for event in events:
+            self._write(event)
+        sequence = self.last_sequence
+        if not events:
+            return sequence
+
+        # Records are written right away, the callers wait for one fsync shared by all concurrent appends
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._waiters.append(waiter)
+        if self._sync_task is None:
+            self._sync_task = loop.create_task(self._sync())
+        await waiter
+        return sequence
+
+    def read(self, start: int = 1, *, event_types: Collection[Type[Event]] | None = None) -> Iterator[LoggedEvent]:
+        is_accepted = None if event_types is None else self._build_type_filter(tuple(event_types))
+        for segment in list(self._segments):
+            if segment.last_sequence < start or not segment.size:
+                continue
+            offset = segment.find(start)
+            if is_accepted is not None:
+                # Segments without the event types are skipped, others are read from the first of their records
+                type_offsets = [offset for type_id, offset in segment.type_offsets.items() if is_accepted(type_id)]
+                if not type_offsets:
+                    continue
+                offset = max(offset, min(type_offsets))
+            yield from self._read_segment(segment, offset, start, is_accepted)
+
+    async def load_checkpoint(self, name: str) -> int | None:
+        try:
+            return int(self._get_checkpoint_path(name).read_text())
+        except FileNotFoundError:
+            return None
+
+    async def save_checkpoint(self, name: str, sequence: int) -> None:
+        path = self._get_checkpoint_path(name)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _write_atomically, path, str(sequence).encode(), self._fsync)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._sync_task is not None:
+            await self._sync_task
+        for file, _ in self._sealed:
+            file.close()
+        self._sealed = []
+        self._file.close()
+        self._types_file.close()
+
+    def _write(self, event: Event) -> None:
+        type_id = self._get_type_id(type(event))
+        payload = self._serializer.dumps(event)
+        sequence = self.last_sequence + 1
+
+        record = bytearray(RECORD_HEADER.size + len(payload))
+        RECORD_HEADER.pack_into(record, 0, len(payload), 0, sequence, type_id)
+        record[RECORD_HEADER.size:] = payload
+        struct.pack_into("<I", record, 4, zlib.crc32(memoryview(record)[CRC_START:]))
+
+        segment = self._segments[-1]
+        if segment.size and segment.size + len(record) > self._segment_size:
+            segment = self._roll(sequence)
+        self._file.write(record)
+        segment.add(sequence, type_id, segment.size, len(record), self._index_interval)
+
+    def _roll(self, first_sequence: int) -> _Segment:
+        # The sealed file is closed and indexed after it's synced
+        self._sealed.append((self._file, self._segments[-1]))
+        segment = self._create_segment(first_sequence)
+        self._segments.append(segment)
+        self._file = open(segment.path, "ab")
+        return segment
+
+    async def _sync(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._waiters:
+                waiters, self._waiters = self._waiters, []
+                sealed, self._sealed = self._sealed, []
+                files = [file for file, _ in sealed] + [self._types_file, self._file]
+                try:
+                    for file in files:
+                        file.flush()
+                    await loop.run_in_executor(None, self._sync_files, [file.fileno() for file in files], sealed)
+                except Exception as err:  # pylint: disable=broad-except
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(err)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+        finally:
+            self._sync_task = None
+
+    def _sync_files(self, fds: list[int], sealed: list[tuple[BinaryIO, _Segment]]) -> None:
+        if self._fsync:
+            for fd in fds:
+                os.fsync(fd)
+        # Indexes are written only for synced segments, so they never point to lost records
+        for file, segment in sealed:
+            file.close()
+            _write_atomically(segment.index_path, segment.dump_index(), False)
+
+    def _read_segment(
+        self, segment: _Segment, offset: int, start: int, is_accepted: Callable[[int], bool] | None,
+    ) -> Iterator[LoggedEvent]:
+        for file, _ in self._sealed:
+            file.flush()
+        self._file.flush()
+        end = segment.size
+        with open(segment.path, "rb") as file, mmap.mmap(file.fileno(), end, access=mmap.ACCESS_READ) as data:
+            while offset < end:
+                payload_size, _, sequence, type_id = RECORD_HEADER.unpack_from(data, offset)
+                payload_start = offset + RECORD_HEADER.size
+                offset = payload_start + payload_size
+                if sequence >= start and (is_accepted is None or is_accepted(type_id)):
+                    yield LoggedEvent(sequence, self._serializer.loads(data[payload_start:offset]))
+
+    def _get_type_id(self, event_type: Type[Event]) -> int:
+        type_id = self._type_ids.get(event_type)
+        if type_id is not None:
+            return type_id
+
+        name = _get_type_name(event_type)
+        if name in self._types:
+            type_id = self._types.index(name)
+        else:
+            type_id = len(self._types)
+            self._types.append(name)
+            self._types_file.write(name.encode() + b"\n")
+        self._type_ids[event_type] = type_id
+        return type_id
+
+    def _build_type_filter(self, event_types: tuple[Type[Event], ...]) -> Callable[[int], bool]:
+        # Event types are matched by their ids and names, so types that can't be imported are matched too.
+        # Subclasses of the event types are accepted as well, so other stored type names are resolved to classes
+        accepted: dict[int, bool] = {
+            type_id: True for event_type, type_id in self._type_ids.items() if event_type in event_types
+        }
+        names = {_get_type_name(event_type) for event_type in event_types}
+
+        def is_accepted(type_id: int) -> bool:
+            result = accepted.get(type_id)
+            if result is None:
+                name = self._types[type_id]
+                if name in names:
+                    result = True
+                elif (event_type := _import_type(name)) is not None:
+                    result = issubclass(event_type, event_types)
+                else:
+                    logger.warning("Events of %s type are skipped, the type can't be imported", name)
+                    result = False
+                accepted[type_id] = result
+            return result
+
+        return is_accepted
+
+    def _get_checkpoint_path(self, name: str) -> Path:
+        if not name or name.startswith(".") or os.sep in name:
+            raise ValueError(f"Invalid checkpoint name: {name!r}")
+        return self._directory / "checkpoints" / name
+
+    def _load_types(self) -> list[str]:
+        path = self._directory / "types"
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return []
+        # A name written partially before a crash is dropped
+        complete, _, partial = data.rpartition(b"\n")
+        if partial:
+            os.truncate(path, len(data) - len(partial))
+        return complete.decode().split("\n") if complete else []
+
+    def _load_segments(self) -> list[_Segment]:
+        paths = sorted(self._directory.glob("*" + SEGMENT_SUFFIX))
+        segments: list[_Segment] = []
+        for position, path in enumerate(paths):
+            segment = _Segment(path, int(path.stem))
+            if segments and segment.first_sequence != segments[-1].last_sequence + 1:
+                self._discard(paths[position:])
+                break
+            segments.append(segment)
+            if self._load_index(segment):
+                continue
+            if not self._scan(segment):
+                # Records after a torn one weren't synced, so the log ends there
+                self._discard(paths[position + 1:])
+                break
+
+        if not segments:
+            segments.append(self._create_segment(1))
+        return segments
+
+    def _load_index(self, segment: _Segment) -> bool:
+        try:
+            data = segment.index_path.read_bytes()
+        except FileNotFoundError:
+            return False
+        if segment.load_index(data, len(self._types)):
+            return True
+        segment.sequences, segment.offsets, segment.type_offsets = [], [], {}
+        return False
+
+    def _scan(self, segment: _Segment) -> bool:
+        size = segment.path.stat().st_size
+        offset = 0
+        if size:
+            with open(segment.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                while offset + RECORD_HEADER.size <= size:
+                    payload_size, crc, sequence, type_id = RECORD_HEADER.unpack_from(data, offset)
+                    end = offset + RECORD_HEADER.size + payload_size
+                    if (
+                        end > size or sequence != segment.last_sequence + 1 or type_id >= len(self._types)
+                        or zlib.crc32(data[offset + CRC_START:end]) != crc
+                    ):
+                        break
+                    segment.add(sequence, type_id, offset, end - offset, self._index_interval)
+                    offset = end
+
+        if offset == size:
+            return True
+        logger.warning("Event log segment %s is truncated after a torn record at offset %d", segment.path, offset)
+        os.truncate(segment.path, offset)
+        return False
+
+    def _create_segment(self, first_sequence: int) -> _Segment:
+        path = self._directory / f"{first_sequence:020d}{SEGMENT_SUFFIX}"
+        path.touch()
+        return _Segment(path, first_sequence)
+
+    @staticmethod
+    def _discard(paths: Sequence[Path]) -> None:
+        for path in paths:
+            logger.warning("Event log segment %s is discarded, it follows a torn record", path)
+            path.unlink()
+            path.with_suffix(INDEX_SUFFIX).unlink(missing_ok=True)
+
+
+def _get_type_name(event_type: type) -> str:
+    return f"{event_type.__module__}:{event_type.__qualname__}"
+
+
+def _import_type(name: str) -> type | None:
+    module_name, _, qualname = name.partition(":")
+    try:
+        obj: Any = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+    except (ImportError, AttributeError):
+        return None
+    return obj if isinstance(obj, type) else None
+
+
+def _write_atomically(path: Path, data: bytes, fsync: bool) -> None:
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(temp_path, path)
@@ -0,0 +1,8 @@
+from .base import wrap_handler
+from .thread import ThreadPool, ThreadPoolMetrics
+
+__all__ = (
+    "wrap_handler",
+    "ThreadPool",
+    "ThreadPoolMetrics",
+)
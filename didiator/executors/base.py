@@ -0,0 +1,23 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Type, TypeVar
+
+from didiator.executors.process import wrap_process_handler
+from didiator.executors.thread import is_sync_handler, wrap_sync_handler
+from didiator.interface.entities.request import Request
+from didiator.interface.handlers import HandlerType
+
+RRes = TypeVar("RRes")
+R = TypeVar("R", bound=Request[Any])
+
+
+def wrap_handler(
+    request: Type[R], handler: HandlerType[R, RRes], executor: Executor | None = None,
+) -> HandlerType[R, RRes]:
+    # CPU-bound handlers are moved to a process pool whether they are sync or async
+    if isinstance(executor, ProcessPoolExecutor):
+        return wrap_process_handler(request, handler, executor)
+
+    # Async handlers are already non-blocking, so only sync ones are moved to the executor
+    if is_sync_handler(handler):
+        return wrap_sync_handler(handler, executor)
+    return handler
@@ -0,0 +1,109 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import inspect
+import pickle
+from typing import Any, Type, TypeVar
+
+from didiator.interface.entities.request import Request
+from didiator.interface.exceptions import HandlerNotPicklable, RequestNotPicklable
+from didiator.interface.handlers import HandlerType
+
+RRes = TypeVar("RRes")
+R = TypeVar("R", bound=Request[Any])
+
+# Worker process state. Handlers are imported and initialized once per worker and then reused
+_warm_handlers: dict[Any, Any] = {}
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    global _worker_loop  # pylint: disable=global-statement
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop
+
+
+def _get_warm_handler(handler: Any) -> Any:
+    if not isinstance(handler, type):
+        return handler
+
+    try:
+        return _warm_handlers[handler]
+    except KeyError:
+        initialized_handler = _warm_handlers[handler] = handler()
+        return initialized_handler
+
+
+def _execute_in_worker(handler: Any, raw_request: bytes) -> Any:
+    request = pickle.loads(raw_request)
+    res = _get_warm_handler(handler)(request)
+    if inspect.isawaitable(res):
+        res = _get_worker_loop().run_until_complete(res)
+    return res
+
+
+def check_picklable(request_type: Type[Request[Any]], handler: HandlerType[Any, Any]) -> None:
+    try:
+        pickle.dumps(request_type)
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        raise RequestNotPicklable(
+            f"{request_type.__qualname__} request can't be sent to a process pool. "
+            f"Define it at the module level to make it picklable",
+            request_type,
+        ) from err
+
+    try:
+        pickle.dumps(handler)
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        raise HandlerNotPicklable(
+            f"Handler {getattr(handler, '__qualname__', handler)!r} can't be executed in a process pool. "
+            f"Define it at the module level to make it picklable",
+            handler,
+        ) from err
+
+
+def check_initializable(handler: HandlerType[Any, Any]) -> None:
+    # Class handlers are initialized in workers without arguments, dependencies can't be injected there
+    if not isinstance(handler, type):
+        return
+
+    required = [
+        param.name for param in inspect.signature(handler).parameters.values()
+        if param.default is param.empty and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+    ]
+    if required:
+        raise TypeError(
+            f"Handler {handler.__qualname__!r} can't be executed in a process pool, "
+            f"because it's initialized without arguments there. Its required parameters: {', '.join(required)}",
+        )
+
+
+def wrap_process_handler(
+    request_type: Type[R], handler: HandlerType[R, RRes], executor: ProcessPoolExecutor,
+) -> Callable[..., Any]:
+    check_initializable(handler)
+    check_picklable(request_type, handler)
+
+    async def wrapper(request: R, *args: Any, **kwargs: Any) -> RRes:
+        # Extra arguments like DI state live in the parent process, only the request is sent to the worker
+        try:
+            raw_request = pickle.dumps(request)
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            raise RequestNotPicklable(
+                f"{type(request).__qualname__} request can't be pickled to be sent to a process pool: {err}", request,
+            ) from err
+
+        loop = asyncio.get_running_loop()
+        res: RRes = await loop.run_in_executor(executor, _execute_in_worker, handler, raw_request)
+        return res
+
+    functools.update_wrapper(wrapper, handler, updated=())
+    del wrapper.__wrapped__  # type: ignore[attr-defined]
+    # DI has to inject only the request into the wrapper, dependencies of the handler aren't resolved
+    wrapper.__signature__ = inspect.Signature([  # type: ignore[attr-defined]
+        inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=request_type),
+    ])
+    wrapper.__annotations__ = {"request": request_type}
+    return wrapper
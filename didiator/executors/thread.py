@@ -0,0 +1,124 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+import inspect
+import threading
+import types
+from typing import Any, TypeVar
+
+from didiator.interface.entities.request import Request
+from didiator.interface.handlers import HandlerType
+from didiator.utils.signature import copy_signature
+
+RRes = TypeVar("RRes")
+R = TypeVar("R", bound=Request[Any])
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ThreadPoolMetrics:
+    max_workers: int
+    workers: int
+    running: int
+    queue_depth: int
+    completed: int
+
+
+class ThreadPool(ThreadPoolExecutor):
+    def __init__(self, max_workers: int | None = None, thread_name_prefix: str = "didiator") -> None:
+        super().__init__(max_workers, thread_name_prefix)
+        self._metrics_lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+
+    @property
+    def metrics(self) -> ThreadPoolMetrics:
+        with self._metrics_lock:
+            return ThreadPoolMetrics(
+                max_workers=self._max_workers,
+                workers=len(self._threads),
+                running=self._running,
+                queue_depth=self._queued,
+                completed=self._completed,
+            )
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        with self._metrics_lock:
+            self._queued += 1
+        future = super().submit(self._run, fn, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        with self._metrics_lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._metrics_lock:
+                self._running -= 1
+                self._completed += 1
+
+    def _on_done(self, future: Future[Any]) -> None:
+        # A future cancelled before it was started never reaches ``_run``
+        if future.cancelled():
+            with self._metrics_lock:
+                self._queued -= 1
+
+
+def is_sync_handler(handler: HandlerType[Any, Any]) -> bool:
+    if isinstance(handler, type):
+        return not _is_async_callable(handler.__call__)
+    if _is_async_callable(handler):
+        return False
+    if isinstance(handler, (types.FunctionType, types.MethodType, functools.partial)):
+        return True
+    # An instance of a handler class
+    return not _is_async_callable(handler.__call__)  # type: ignore[operator]
+
+
+def _is_async_callable(func: Callable[..., Any]) -> bool:
+    return asyncio.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)
+
+
+async def run_in_executor(executor: Executor | None, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    res = await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    # A sync callable can still return an awaitable, it's awaited in the event loop
+    if asyncio.isfuture(res) or asyncio.iscoroutine(res):
+        res = await res
+    return res
+
+
+def wrap_sync_handler(handler: HandlerType[R, RRes], executor: Executor | None = None) -> HandlerType[R, RRes]:
+    if isinstance(handler, type):
+        return _wrap_sync_class_handler(handler, executor)
+    return _wrap_sync_func_handler(handler, executor)
+
+
+def _wrap_sync_class_handler(handler: type, executor: Executor | None) -> type:
+    sync_call = handler.__call__
+
+    async def __call__(self: Any, *args: Any, **kwargs: Any) -> Any:
+        return await run_in_executor(executor, sync_call, self, *args, **kwargs)
+
+    def exec_body(namespace: dict[str, Any]) -> None:
+        namespace["__call__"] = __call__
+        namespace["__module__"] = handler.__module__
+        namespace["__qualname__"] = handler.__qualname__
+
+    # The subclass keeps the original ``__init__``, so DI can still build the handler
+    return types.new_class(handler.__name__, (handler,), exec_body=exec_body)
+
+
+def _wrap_sync_func_handler(handler: Callable[..., RRes], executor: Executor | None) -> Callable[..., Any]:
+    async def wrapper(*args: Any, **kwargs: Any) -> RRes:
+        res: RRes = await run_in_executor(executor, handler, *args, **kwargs)
+        return res
+
+    copy_signature(wrapper, handler)
+    return wrapper
@@ -0,0 +1,7 @@
+from .memory import MemoryIdempotencyStore
+from .sqlite import SqliteIdempotencyStore
+
+__all__ = (
+    "MemoryIdempotencyStore",
+    "SqliteIdempotencyStore",
+)
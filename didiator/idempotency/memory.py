@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+from didiator.interface.idempotency import IdempotencyStore
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str, now: float) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        data, expires_at = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+        return data
+
+    async def set(self, key: str, data: bytes, expires_at: float) -> None:
+        self._entries[key] = data, expires_at
+        self._entries.move_to_end(key)
+        # The oldest entries are evicted first, so memory is bounded even if entries don't expire
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def close(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import time
+
+from didiator.interface.idempotency import IdempotencyStore
+from didiator.utils.sqlite import SqliteRunner
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idempotency_expires_at ON idempotency (expires_at);
+"""
+
+
+class SqliteIdempotencyStore(IdempotencyStore):
+    def __init__(
+        self, path: str | os.PathLike[str], *, synchronous: str = "NORMAL", purge_interval: int = 1000,
+    ) -> None:
+        self._runner = SqliteRunner(
+            path, SCHEMA, synchronous=synchronous, thread_name_prefix="didiator-idempotency",
+        )
+        self._purge_interval = purge_interval
+        self._writes = 0
+
+    async def get(self, key: str, now: float) -> bytes | None:
+        return await self._runner.run(self._select, key, now)
+
+    async def set(self, key: str, data: bytes, expires_at: float) -> None:
+        # Expired entries are deleted periodically, so the table doesn't grow forever
+        self._writes += 1
+        purge_before = time.time() if self._writes % self._purge_interval == 0 else None
+        await self._runner.run(self._upsert, key, data, expires_at, purge_before)
+
+    async def delete(self, key: str) -> None:
+        await self._runner.run(self._delete, key)
+
+    async def close(self) -> None:
+        await self._runner.close()
+
+    @staticmethod
+    def _select(connection: sqlite3.Connection, key: str, now: float) -> bytes | None:
+        row = connection.execute(
+            "SELECT data FROM idempotency WHERE key = ? AND expires_at > ?", (key, now),
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, key: str) -> None:
+        connection.execute("DELETE FROM idempotency WHERE key = ?", (key,))
+
+    @staticmethod
+    def _upsert(
+        connection: sqlite3.Connection, key: str, data: bytes, expires_at: float, purge_before: float | None,
+    ) -> None:
+        with connection:
+            connection.execute("BEGIN")
+            connection.execute(
+                "INSERT OR REPLACE INTO idempotency (key, data, expires_at) VALUES (?, ?, ?)", (key, data, expires_at),
+            )
+            if purge_before is not None:
+                connection.execute("DELETE FROM idempotency WHERE expires_at <= ?", (purge_before,))
@@ -1,10 +1,10 @@
 from .dispatchers.command import CommandDispatcher
 from .dispatchers.request import Dispatcher
 from .dispatchers.query import QueryDispatcher
-from .observers.event import EventObserver, Listener
+from .observers.event import BatchListener, EventObserver, Listener, Subscription
 from .mediator import CommandMediator, EventMediator, Mediator, QueryMediator
-from .entities import Command, Query, Request, Event
-from .handlers import CommandHandler, EventHandler, Handler, QueryHandler
+from .entities import Command, Query, Request, Event, EventBatch, StreamQuery
+from .handlers import BatchEventHandler, CommandHandler, EventHandler, Handler, QueryHandler, StreamQueryHandler
 
 __all__ = (
     "Mediator",
@@ -20,8 +20,14 @@ __all__ = (
     "Query",
     "QueryHandler",
     "QueryDispatcher",
+    "StreamQuery",
+    "StreamQueryHandler",
     "Event",
     "EventHandler",
+    "EventBatch",
+    "BatchEventHandler",
     "Listener",
+    "BatchListener",
+    "Subscription",
     "EventObserver",
 )
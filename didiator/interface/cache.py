@@ -0,0 +1,33 @@
+from collections.abc import Callable, Collection, Hashable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol, Type
+
+from didiator.interface.entities.request import Request
+
+TagExtractors = Mapping[Type[Request[Any]], Callable[[Any], Iterable[str]]]
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: Any
+    tags: frozenset[str]
+    stale_at: float
+    expires_at: float
+    version: int = 0
+
+
+class QueryCache(Protocol):
+    def version(self) -> int:
+        raise NotImplementedError
+
+    def get(self, key: Hashable, tags: Collection[str] = ()) -> CacheEntry | None:
+        raise NotImplementedError
+
+    def set(
+        self, key: Hashable, value: Any, tags: Collection[str], ttl: float,
+        *, stale_ttl: float = 0.0, version: int | None = None,
+    ) -> bool:
+        raise NotImplementedError
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        raise NotImplementedError
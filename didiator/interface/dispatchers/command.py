@@ -1,3 +1,4 @@
+from concurrent.futures import Executor
 from typing import Any, Protocol, Type, TypeVar
 
 from didiator.interface.entities.command import Command
@@ -9,7 +10,9 @@ CRes = TypeVar("CRes")
 
 
 class CommandDispatcher(Dispatcher, Protocol):
-    def register_handler(self, command: Type[C], handler: CommandHandlerType[C, CRes]) -> None:
+    def register_handler(
+        self, command: Type[C], handler: CommandHandlerType[C, CRes], *, executor: Executor | None = None,
+    ) -> None:
         raise NotImplementedError
 
     async def send(self, command: Command[CRes], *args: Any, **kwargs: Any) -> CRes:
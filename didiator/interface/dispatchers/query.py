@@ -1,16 +1,29 @@
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
 from typing import Any, Protocol, Type, TypeVar
 
 from didiator.interface.dispatchers.request import Dispatcher
 from didiator.interface.entities.query import Query
+from didiator.interface.entities.stream_query import StreamQuery
 from didiator.interface.handlers.query import QueryHandlerType
+from didiator.interface.handlers.stream_query import StreamQueryHandlerType
 
 Q = TypeVar("Q", bound=Query[Any])
+SQ = TypeVar("SQ", bound=StreamQuery[Any])
 QRes = TypeVar("QRes")
 
 
 class QueryDispatcher(Dispatcher, Protocol):
-    def register_handler(self, query: Type[Q], handler: QueryHandlerType[Q, QRes]) -> None:
+    def register_handler(
+        self, query: Type[Q], handler: QueryHandlerType[Q, QRes], *, executor: Executor | None = None,
+    ) -> None:
         raise NotImplementedError
 
     async def query(self, query: Query[QRes], *args: Any, **kwargs: Any) -> QRes:
         raise NotImplementedError
+
+    def register_stream_handler(self, query: Type[SQ], handler: StreamQueryHandlerType[SQ, QRes]) -> None:
+        raise NotImplementedError
+
+    def stream(self, query: StreamQuery[QRes], *args: Any, **kwargs: Any) -> AsyncIterator[QRes]:
+        raise NotImplementedError
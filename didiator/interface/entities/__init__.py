@@ -1,11 +1,15 @@
 from .command import Command
 from .event import Event
+from .event_batch import EventBatch
 from .request import Request
 from .query import Query
+from .stream_query import StreamQuery
 
 __all__ = (
     "Request",
     "Command",
     "Query",
+    "StreamQuery",
     "Event",
+    "EventBatch",
 )
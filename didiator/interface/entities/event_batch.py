@@ -0,0 +1,32 @@
+from typing import Any, ClassVar, Type, TypeVar
+
+from didiator.interface.entities.event import Event
+from didiator.interface.entities.request import Request
+
+E = TypeVar("E", bound=Event)
+
+
+class EventBatch(tuple[E, ...], Request[None]):
+    event: ClassVar[Type[Event]] = Event
+    _batch_types: ClassVar[dict[Any, Type["EventBatch[Any]"]]] = {}
+
+    def __class_getitem__(cls, event: Any) -> Any:
+        # A concrete subclass is created for each event type, so DI can inject batches by their annotations
+        if not isinstance(event, type):
+            return super().__class_getitem__(event)
+
+        batch_type = cls._batch_types.get(event)
+        if batch_type is None:
+            batch_type = type(
+                f"EventBatch[{event.__qualname__}]", (cls,), {"event": event, "__module__": cls.__module__},
+            )
+            cls._batch_types[event] = batch_type
+        return batch_type
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _build_batch, (self.event, tuple(self))
+
+
+def _build_batch(event: Type[E], events: tuple[E, ...]) -> EventBatch[E]:
+    batch: EventBatch[E] = EventBatch[event](events)  # type: ignore[valid-type]
+    return batch
@@ -0,0 +1,11 @@
+import abc
+from collections.abc import AsyncIterator
+from typing import Generic, TypeVar
+
+from didiator.interface.entities.request import Request
+
+QRes = TypeVar("QRes")
+
+
+class StreamQuery(Request[AsyncIterator[QRes]], abc.ABC, Generic[QRes]):
+    pass
@@ -0,0 +1,32 @@
+from collections.abc import Collection, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Protocol, Type
+
+from didiator.interface.entities.event import Event
+
+
+@dataclass(frozen=True)
+class LoggedEvent:
+    sequence: int
+    event: Event
+
+
+class EventLog(Protocol):
+    @property
+    def last_sequence(self) -> int:
+        raise NotImplementedError
+
+    async def append(self, events: Sequence[Event]) -> int:
+        raise NotImplementedError
+
+    def read(self, start: int = 1, *, event_types: Collection[Type[Event]] | None = None) -> Iterator[LoggedEvent]:
+        raise NotImplementedError
+
+    async def load_checkpoint(self, name: str) -> int | None:
+        raise NotImplementedError
+
+    async def save_checkpoint(self, name: str, sequence: int) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
@@ -1,6 +1,6 @@
-from typing import Any
+from typing import Any, Callable, Type
 
-from didiator.interface.entities import Command, Request, Query
+from didiator.interface.entities import Command, Request, Query, StreamQuery
 
 
 class MediatorError(Exception):
@@ -14,10 +14,57 @@ class HandlerNotFound(MediatorError, TypeError):
         super().__init__(text)
         self.request = request
 
+    def __reduce__(self) -> tuple[Callable[..., Any], tuple[Any, ...]]:
+        return self.__class__, (*self.args, self.request)
+
 
 class CommandHandlerNotFound(HandlerNotFound):
     request: Command[Any]
 
 
 class QueryHandlerNotFound(HandlerNotFound):
-    request: Query[Any]
+    request: Query[Any] | StreamQuery[Any]
+
+
+class RequestNotPicklable(MediatorError, TypeError):
+    request: Request[Any] | Type[Request[Any]]
+
+    def __init__(self, text: str, request: Request[Any] | Type[Request[Any]]):
+        super().__init__(text)
+        self.request = request
+
+
+class HandlerNotPicklable(MediatorError, TypeError):
+    handler: Any
+
+    def __init__(self, text: str, handler: Any):
+        super().__init__(text)
+        self.handler = handler
+
+
+class WorkerError(MediatorError, RuntimeError):
+    pass
+
+
+class RemoteHandlerError(MediatorError):
+    pass
+
+
+class TransportError(MediatorError):
+    pass
+
+
+class ConnectionLost(TransportError, ConnectionError):
+    pass
+
+
+class RequestTimeout(TransportError, TimeoutError):
+    pass
+
+
+class CodecError(MediatorError, ValueError):
+    pass
+
+
+class EventLogError(MediatorError):
+    pass
@@ -1,7 +1,8 @@
 from .command import CommandHandler, CommandHandlerType
-from .event import EventHandler, EventHandlerType
+from .event import BatchEventHandler, BatchEventHandlerType, EventHandler, EventHandlerType
 from .request import Handler, HandlerType
 from .query import QueryHandler, QueryHandlerType
+from .stream_query import StreamQueryHandler, StreamQueryHandlerType
 
 __all__ = (
     "Handler",
@@ -10,6 +11,10 @@ __all__ = (
     "CommandHandlerType",
     "QueryHandler",
     "QueryHandlerType",
+    "StreamQueryHandler",
+    "StreamQueryHandlerType",
     "EventHandler",
     "EventHandlerType",
+    "BatchEventHandler",
+    "BatchEventHandlerType",
 )
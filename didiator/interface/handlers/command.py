@@ -16,4 +16,4 @@ class CommandHandler(Handler[C, CRes], abc.ABC, Generic[C, CRes]):
         raise NotImplementedError
 
 
-CommandHandlerType = Union[Type[CommandHandler[C, CRes]], Callable[..., Awaitable[CRes]]]
+CommandHandlerType = Union[Type[CommandHandler[C, CRes]], Callable[..., Awaitable[CRes]], Callable[..., CRes]]
@@ -2,6 +2,7 @@ import abc
 from typing import Any, Awaitable, Callable, Generic, Type, TypeVar, Union
 
 from didiator.interface.entities.event import Event
+from didiator.interface.entities.event_batch import EventBatch
 
 from .request import Handler
 
@@ -14,4 +15,13 @@ class EventHandler(Handler[E, Any], abc.ABC, Generic[E]):
         raise NotImplementedError
 
 
-EventHandlerType = Union[Type[EventHandler[E]], Callable[..., Awaitable[Any]]]
+EventHandlerType = Union[Type[EventHandler[E]], Callable[..., Awaitable[Any]], Callable[..., Any]]
+
+
+class BatchEventHandler(Handler[EventBatch[E], Any], abc.ABC, Generic[E]):
+    @abc.abstractmethod
+    async def __call__(self, events: EventBatch[E]) -> Any:
+        raise NotImplementedError
+
+
+BatchEventHandlerType = Union[Type[BatchEventHandler[E]], Callable[..., Awaitable[Any]], Callable[..., Any]]
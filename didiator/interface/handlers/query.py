@@ -16,4 +16,4 @@ class QueryHandler(Handler[Q, QRes], abc.ABC, Generic[Q, QRes]):
         raise NotImplementedError
 
 
-QueryHandlerType = Union[Type[QueryHandler[Q, QRes]], Callable[..., Awaitable[QRes]]]
+QueryHandlerType = Union[Type[QueryHandler[Q, QRes]], Callable[..., Awaitable[QRes]], Callable[..., QRes]]
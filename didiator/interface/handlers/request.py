@@ -13,4 +13,4 @@ class Handler(abc.ABC, Generic[R, RRes]):
         raise NotImplementedError
 
 
-HandlerType = Union[Type[Handler[R, RRes]], Callable[..., Awaitable[RRes]]]
+HandlerType = Union[Type[Handler[R, RRes]], Callable[..., Awaitable[RRes]], Callable[..., RRes]]
@@ -0,0 +1,19 @@
+import abc
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Generic, Type, TypeVar, Union
+
+from didiator.interface.entities.stream_query import StreamQuery
+
+from .request import Handler
+
+QRes = TypeVar("QRes")
+SQ = TypeVar("SQ", bound=StreamQuery[Any])
+
+
+class StreamQueryHandler(Handler[SQ, AsyncIterator[QRes]], abc.ABC, Generic[SQ, QRes]):
+    @abc.abstractmethod
+    def __call__(self, query: SQ) -> AsyncIterator[QRes]:  # type: ignore[override]
+        raise NotImplementedError
+
+
+StreamQueryHandlerType = Union[Type[StreamQueryHandler[SQ, QRes]], Callable[..., AsyncIterator[QRes]]]
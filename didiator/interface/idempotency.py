@@ -0,0 +1,15 @@
+from typing import Protocol
+
+
+class IdempotencyStore(Protocol):
+    async def get(self, key: str, now: float) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, data: bytes, expires_at: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
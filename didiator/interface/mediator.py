@@ -1,18 +1,23 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Hashable, Mapping, Sequence
+from concurrent.futures import Executor
 from typing import Any, Protocol, Type, TypeVar
 
 from didiator.interface.entities.command import Command
 from didiator.interface.entities.event import Event
 from didiator.interface.entities.query import Query
+from didiator.interface.entities.stream_query import StreamQuery
 from didiator.interface.handlers.command import CommandHandlerType
-from didiator.interface.handlers.event import EventHandlerType
+from didiator.interface.handlers.event import BatchEventHandlerType, EventHandlerType
 from didiator.interface.handlers.query import QueryHandlerType
+from didiator.interface.handlers.stream_query import StreamQueryHandlerType
+from didiator.interface.observers.stream import StreamMetrics
 
 Self = TypeVar("Self", bound="BaseMediator")
 C = TypeVar("C", bound=Command[Any])
 CRes = TypeVar("CRes")
 Q = TypeVar("Q", bound=Query[Any])
 QRes = TypeVar("QRes")
+SQ = TypeVar("SQ", bound=StreamQuery[Any])
 E = TypeVar("E", bound=Event)
 
 
@@ -32,7 +37,9 @@ class CommandMediator(BaseMediator, Protocol):
     async def send(self, command: Command[CRes], *args: Any, **kwargs: Any) -> CRes:
         raise NotImplementedError
 
-    def register_command_handler(self, command: Type[C], handler: CommandHandlerType[C, CRes]) -> None:
+    def register_command_handler(
+        self, command: Type[C], handler: CommandHandlerType[C, CRes], *, executor: Executor | None = None,
+    ) -> None:
         raise NotImplementedError
 
 
@@ -40,7 +47,15 @@ class QueryMediator(BaseMediator, Protocol):
     async def query(self, query: Query[QRes], *args: Any, **kwargs: Any) -> QRes:
         raise NotImplementedError
 
-    def register_query_handler(self, query: Type[Q], handler: QueryHandlerType[Q, QRes]) -> None:
+    def register_query_handler(
+        self, query: Type[Q], handler: QueryHandlerType[Q, QRes], *, executor: Executor | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    def stream(self, query: StreamQuery[QRes], *args: Any, **kwargs: Any) -> AsyncIterator[QRes]:
+        raise NotImplementedError
+
+    def register_stream_query_handler(self, query: Type[SQ], handler: StreamQueryHandlerType[SQ, QRes]) -> None:
         raise NotImplementedError
 
 
@@ -48,7 +63,23 @@ class EventMediator(BaseMediator, Protocol):
     async def publish(self, events: Event | Sequence[Event], *args: Any, **kwargs: Any) -> None:
         raise NotImplementedError
 
-    def register_event_handler(self, event: Type[E], handler: EventHandlerType[E]) -> None:
+    async def publish_stream(
+        self, events: AsyncIterable[Event], *args: Any,
+        read_ahead: int = 128, concurrency: int = 1, key: Callable[[Any], Hashable] | None = None,
+        on_error: Callable[[Event, Exception], Any] | None = None, **kwargs: Any,
+    ) -> StreamMetrics:
+        raise NotImplementedError
+
+    def register_event_handler(
+        self, event: Type[E], handler: EventHandlerType[E],
+        *, executor: Executor | None = None, where: Mapping[str, Hashable] | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    def register_batch_event_handler(
+        self, event: Type[E], handler: BatchEventHandlerType[E],
+        *, max_batch_size: int | None = None, max_delay: float | None = None, executor: Executor | None = None,
+    ) -> None:
         raise NotImplementedError
 
 
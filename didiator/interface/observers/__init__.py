@@ -1,6 +1,9 @@
-from .event import EventObserver, Listener
+from .event import EventObserver, Listener, Subscription
+from .stream import StreamMetrics
 
 __all__ = (
     "EventObserver",
     "Listener",
+    "StreamMetrics",
+    "Subscription",
 )
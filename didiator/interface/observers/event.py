@@ -1,21 +1,27 @@
-from collections.abc import Sequence
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
+from concurrent.futures import Executor
 from typing import Any, Generic, Protocol, Type, TypeVar
 
 from didiator.interface.entities.event import Event
-from didiator.interface.handlers.event import EventHandlerType
+from didiator.interface.handlers.event import BatchEventHandlerType, EventHandlerType
 from didiator.middlewares.base import MiddlewareType
 
 Self = TypeVar("Self", bound="EventObserver")
 E = TypeVar("E", bound=Event)
+_MISSING = object()
 
 
 class Listener(Generic[E]):
-    def __init__(self, event: Type[E], handler: EventHandlerType[E]):
+    def __init__(self, event: Type[E], handler: EventHandlerType[E], *, where: Mapping[str, Hashable] | None = None):
         self._event = event
         self._handler = handler
+        # Event attributes have to be equal to these values
+        self._where: Mapping[str, Hashable] = dict(where) if where else {}
 
     def is_listen(self, event: Event) -> bool:
-        return isinstance(event, self._event)
+        if not isinstance(event, self._event):
+            return False
+        return all(getattr(event, attr, _MISSING) == value for attr, value in self._where.items())
 
     @property
     def event(self) -> Type[E]:
@@ -25,6 +31,50 @@ class Listener(Generic[E]):
     def handler(self) -> EventHandlerType[E]:
         return self._handler
 
+    @property
+    def where(self) -> Mapping[str, Hashable]:
+        return self._where
+
+
+class BatchListener(Listener[E]):
+    def __init__(
+        self, event: Type[E], handler: BatchEventHandlerType[E],
+        *, max_batch_size: int | None = None, max_delay: float | None = None,
+    ):
+        super().__init__(event, handler)
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+
+    @property
+    def max_batch_size(self) -> int | None:
+        return self._max_batch_size
+
+    @property
+    def max_delay(self) -> float | None:
+        return self._max_delay
+
+    @property
+    def is_windowed(self) -> bool:
+        # Windowed listeners collect events of several publish calls and are called in background
+        return self._max_batch_size is not None or self._max_delay is not None
+
+
+class Subscription(Protocol):
+    @property
+    def active(self) -> bool:
+        raise NotImplementedError
+
+    def unsubscribe(self) -> bool:
+        raise NotImplementedError
+
+
+class EventCoalescer(Protocol):
+    def add(self, event: Event, deliver: Callable[[Sequence[Event]], Awaitable[Any]]) -> bool:
+        raise NotImplementedError
+
+    async def flush(self) -> None:
+        raise NotImplementedError
+
 
 class EventObserver(Protocol):
     @property
@@ -38,7 +88,7 @@ class EventObserver(Protocol):
     def copy(self: Self) -> Self:
         raise NotImplementedError
 
-    def register_listener(self, listener: Listener[Any]) -> None:
+    def register_listener(self, listener: Listener[Any], *, executor: Executor | None = None) -> Subscription:
         raise NotImplementedError
 
     async def publish(self, events: Sequence[Event], *args: Any, **kwargs: Any) -> None:
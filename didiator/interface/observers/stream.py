@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StreamMetrics:
+    published: int
+    failed: int
+    buffered: int
+    elapsed: float
+    # Time the last handled event waited in the read-ahead buffer
+    lag: float
+    max_lag: float
+
+    @property
+    def throughput(self) -> float:
+        return self.published / self.elapsed if self.elapsed else 0.0
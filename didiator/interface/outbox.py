@@ -0,0 +1,30 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    id: int
+    data: bytes
+    attempts: int
+
+
+class OutboxStorage(Protocol):
+    async def add(self, messages: Sequence[bytes]) -> None:
+        raise NotImplementedError
+
+    async def get_available(self, limit: int, now: float) -> list[OutboxMessage]:
+        raise NotImplementedError
+
+    async def ack(self, message_ids: Sequence[int]) -> None:
+        raise NotImplementedError
+
+    async def retry(self, message_id: int, attempts: int, available_at: float, error: str) -> None:
+        raise NotImplementedError
+
+    async def move_to_dead_letter(self, message_id: int, attempts: int, error: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,15 @@
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import Any, Protocol, Type, TypeVar
+
+from didiator.interface.entities.request import Request
+
+T = TypeVar("T")
+KeyExtractors = Mapping[Type[Request[Any]], Callable[[Any], Hashable]]
+
+
+class Partitioner(Protocol):
+    def get_key(self, request: Request[Any]) -> Hashable | None:
+        raise NotImplementedError
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        raise NotImplementedError
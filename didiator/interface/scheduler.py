@@ -0,0 +1,8 @@
+from typing import Any, AsyncContextManager, Protocol
+
+from didiator.interface.entities.request import Request
+
+
+class Scheduler(Protocol):
+    def slot(self, request: Request[Any], extra_data: dict[str, Any]) -> AsyncContextManager[None]:
+        raise NotImplementedError
@@ -0,0 +1,25 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass(frozen=True)
+class StoredTimer:
+    id: str
+    due: float
+    interval: float | None
+    data: bytes
+
+
+class TimerStorage(Protocol):
+    async def save(self, timers: Sequence[StoredTimer]) -> None:
+        raise NotImplementedError
+
+    async def delete(self, timer_ids: Sequence[str]) -> None:
+        raise NotImplementedError
+
+    async def load(self) -> list[StoredTimer]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,12 @@
+from typing import Any, Protocol
+
+
+class Transport(Protocol):
+    async def request(
+        self, method: str, request: Any, args: tuple[Any, ...] = (), kwargs: dict[str, Any] | None = None,
+        *, timeout: float | None = None,
+    ) -> Any:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,9 @@
+from typing import Any, Protocol
+
+
+class Serializer(Protocol):
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
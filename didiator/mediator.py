@@ -1,24 +1,32 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Hashable, Mapping, Sequence
+from concurrent.futures import Executor
 from typing import Any, Type, TypeVar
 
 from didiator.dispatchers.command import CommandDispatcherImpl
 from didiator.observers.event import EventObserverImpl
+from didiator.observers.fanout import QueuedListener, SubscriberQueue
+from didiator.observers.registry import WeakListener
+from didiator.observers.stream import publish_stream
 from didiator.dispatchers.query import QueryDispatcherImpl
-from didiator.interface.observers.event import EventObserver, Listener
+from didiator.interface.observers.event import BatchListener, EventObserver, Listener, Subscription
 from didiator.interface.entities.command import Command
 from didiator.interface.dispatchers.command import CommandDispatcher
 from didiator.interface.dispatchers.query import QueryDispatcher
 from didiator.interface.entities.event import Event
 from didiator.interface.entities.query import Query
+from didiator.interface.entities.stream_query import StreamQuery
 from didiator.interface.handlers.command import CommandHandlerType
-from didiator.interface.handlers.event import EventHandlerType
+from didiator.interface.handlers.event import BatchEventHandlerType, EventHandlerType
 from didiator.interface.handlers.query import QueryHandlerType
+from didiator.interface.handlers.stream_query import StreamQueryHandlerType
 from didiator.interface.mediator import Mediator
+from didiator.interface.observers.stream import StreamMetrics
 
 C = TypeVar("C", bound=Command[Any])
 CRes = TypeVar("CRes")
 Q = TypeVar("Q", bound=Query[Any])
 QRes = TypeVar("QRes")
+SQ = TypeVar("SQ", bound=StreamQuery[Any])
 E = TypeVar("E", bound=Event)
 
 
@@ -63,15 +71,48 @@ class MediatorImpl(Mediator):
             extra_data=extra_data,
         )
 
-    def register_command_handler(self, command: Type[C], handler: CommandHandlerType[C, CRes]) -> None:
-        self._command_dispatcher.register_handler(command, handler)
+    def register_command_handler(
+        self, command: Type[C], handler: CommandHandlerType[C, CRes], *, executor: Executor | None = None,
+    ) -> None:
+        self._command_dispatcher.register_handler(command, handler, executor=executor)
 
-    def register_query_handler(self, query: Type[Q], handler: QueryHandlerType[Q, QRes]) -> None:
-        self._query_dispatcher.register_handler(query, handler)
+    def register_query_handler(
+        self, query: Type[Q], handler: QueryHandlerType[Q, QRes], *, executor: Executor | None = None,
+    ) -> None:
+        self._query_dispatcher.register_handler(query, handler, executor=executor)
 
-    def register_event_handler(self, event: Type[E], handler: EventHandlerType[E]) -> None:
-        listener = Listener(event, handler)
-        self._event_observer.register_listener(listener)
+    def register_stream_query_handler(self, query: Type[SQ], handler: StreamQueryHandlerType[SQ, QRes]) -> None:
+        self._query_dispatcher.register_stream_handler(query, handler)
+
+    def register_event_handler(
+        self, event: Type[E], handler: EventHandlerType[E],
+        *, executor: Executor | None = None, where: Mapping[str, Hashable] | None = None,
+    ) -> None:
+        listener = Listener(event, handler, where=where)
+        self._event_observer.register_listener(listener, executor=executor)
+
+    def subscribe(
+        self, event: Type[E], handler: EventHandlerType[E],
+        *, weak: bool = False, executor: Executor | None = None, where: Mapping[str, Hashable] | None = None,
+        queue: SubscriberQueue | None = None,
+    ) -> Subscription:
+        listener: Listener[Any]
+        if queue is not None:
+            if weak:
+                raise ValueError("Queued handlers can't be referenced weakly")
+            listener = QueuedListener(event, handler, queue, where=where)
+        elif weak:
+            listener = WeakListener(event, handler, where=where)
+        else:
+            listener = Listener(event, handler, where=where)
+        return self._event_observer.register_listener(listener, executor=executor)
+
+    def register_batch_event_handler(
+        self, event: Type[E], handler: BatchEventHandlerType[E],
+        *, max_batch_size: int | None = None, max_delay: float | None = None, executor: Executor | None = None,
+    ) -> None:
+        listener = BatchListener(event, handler, max_batch_size=max_batch_size, max_delay=max_delay)
+        self._event_observer.register_listener(listener, executor=executor)
 
     async def send(self, command: Command[CRes], *args: Any, **kwargs: Any) -> CRes:
         kwargs = self._extra_data | kwargs
@@ -81,8 +122,22 @@ class MediatorImpl(Mediator):
         kwargs = self._extra_data | kwargs
         return await self._query_dispatcher.query(query, *args, **kwargs)
 
+    def stream(self, query: StreamQuery[QRes], *args: Any, **kwargs: Any) -> AsyncIterator[QRes]:
+        kwargs = self._extra_data | kwargs
+        return self._query_dispatcher.stream(query, *args, **kwargs)
+
     async def publish(self, events: Event | Sequence[Event], *args: Any, **kwargs: Any) -> None:
         if isinstance(events, Event):
             events = (events,)
         kwargs = self._extra_data | kwargs
         await self._event_observer.publish(events, *args, **kwargs)
+
+    async def publish_stream(
+        self, events: AsyncIterable[Event], *args: Any,
+        read_ahead: int = 128, concurrency: int = 1, key: Callable[[Any], Hashable] | None = None,
+        on_error: Callable[[Event, Exception], Any] | None = None, **kwargs: Any,
+    ) -> StreamMetrics:
+        return await publish_stream(
+            self.publish, events, *args,
+            read_ahead=read_ahead, concurrency=concurrency, key=key, on_error=on_error, **kwargs,
+        )
@@ -1,5 +1,8 @@
 from .base import Middleware
+from .hooks import HookContext, HookMiddleware
 
 __all__ = (
+    "HookContext",
+    "HookMiddleware",
     "Middleware",
 )
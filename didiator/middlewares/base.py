@@ -1,9 +1,11 @@
-from collections.abc import Awaitable, Callable, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import aclosing
 import functools
 from typing import Any, TypeVar
 
 from didiator.interface.entities.request import Request
 from didiator.interface.handlers import HandlerType
+from didiator.middlewares.hooks import group_hooks
 
 RRes = TypeVar("RRes")
 R = TypeVar("R", bound=Request[Any])
@@ -31,6 +33,27 @@ class Middleware:
 
         return await handler(request, *args, **kwargs)
 
+    def stream(
+        self,
+        handler: Callable[..., AsyncIterator[RRes]],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[RRes]:
+        return self._stream(handler, request, *args, **kwargs)
+
+    def _stream(
+        self,
+        handler: Callable[..., AsyncIterator[RRes]],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[RRes]:
+        if isinstance(handler, type):
+            handler = handler()
+
+        return handler(request, *args, **kwargs)
+
 
 MiddlewareType = Callable[[HandlerType[R, RRes], R], Awaitable[RRes]]
 
@@ -39,7 +62,63 @@ def wrap_middleware(
     middlewares: Sequence[MiddlewareType[R, RRes]],
     handler: HandlerType[R, RRes],
 ) -> Callable[..., Awaitable[RRes]]:
+    return wrap_grouped_middleware(group_hooks(middlewares), handler)
+
+
+def wrap_stream_middleware(
+    middlewares: Sequence[MiddlewareType[R, Any]],
+    handler: Callable[..., AsyncIterator[RRes]],
+) -> Callable[..., AsyncIterator[RRes]]:
+    return wrap_grouped_stream_middleware(group_hooks(middlewares), handler)
+
+
+def wrap_grouped_middleware(
+    middlewares: Sequence[MiddlewareType[R, RRes]],
+    handler: HandlerType[R, RRes],
+) -> Callable[..., Awaitable[RRes]]:
+    # Dispatchers group hook middlewares once, so they aren't grouped on each request
     for middleware in reversed(middlewares):
         handler = functools.partial(middleware, handler)
 
     return handler
+
+
+def wrap_grouped_stream_middleware(
+    middlewares: Sequence[MiddlewareType[R, Any]],
+    handler: Callable[..., AsyncIterator[RRes]],
+) -> Callable[..., AsyncIterator[RRes]]:
+    for middleware in reversed(middlewares):
+        stream = getattr(middleware, "stream", None)
+        if stream is None or not _supports_stream(middleware):
+            stream = functools.partial(_stream_through_call, middleware)
+        handler = functools.partial(stream, handler)
+
+    return handler
+
+
+def _supports_stream(middleware: Any) -> bool:
+    # Middleware subclasses overriding only ``__call__`` or ``_call`` would be skipped by the default ``stream``
+    if not isinstance(middleware, Middleware):
+        return True
+    cls = type(middleware)
+    if cls.stream is not Middleware.stream or cls._stream is not Middleware._stream:
+        return True
+    return cls.__call__ is Middleware.__call__ and cls._call is Middleware._call
+
+
+async def _stream_through_call(
+    middleware: MiddlewareType[R, Any],
+    handler: Callable[..., AsyncIterator[RRes]],
+    request: R,
+    *args: Any,
+    **kwargs: Any,
+) -> AsyncIterator[RRes]:
+    # A middleware without stream support receives a handler that returns the stream as its result
+    async def get_stream(*handler_args: Any, **handler_kwargs: Any) -> AsyncIterator[RRes]:
+        stream_handler = handler() if isinstance(handler, type) else handler
+        return stream_handler(*handler_args, **handler_kwargs)
+
+    stream: AsyncIterator[RRes] = await middleware(get_stream, request, *args, **kwargs)
+    async with aclosing(stream):  # type: ignore[type-var]
+        async for item in stream:
+            yield item
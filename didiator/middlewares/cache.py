@@ -0,0 +1,184 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable, Collection, Hashable, Iterable, Mapping
+from contextlib import AbstractAsyncContextManager
+import functools
+import logging
+import time
+from typing import Any, Type, TypeVar
+
+from didiator.cache.memo import QueryMemo
+from didiator.cache.policy import CachePolicy
+from didiator.interface.cache import QueryCache, TagExtractors
+from didiator.interface.entities.event import Event
+from didiator.interface.entities.event_batch import EventBatch
+from didiator.interface.entities.query import Query
+from didiator.interface.entities.request import Request
+from didiator.interface.handlers import HandlerType
+from didiator.middlewares import Middleware
+
+RRes = TypeVar("RRes")
+R = TypeVar("R", bound=Request[Any])
+
+# Keys of ``DiMiddleware`` arguments, they are bound to the scope of a request
+REQUEST_SCOPED_KEYS = ("di_state", "di_values", "di_builder")
+RefreshScope = Callable[[], AbstractAsyncContextManager[Mapping[str, Any]]]
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCacheMiddleware(Middleware):
+    def __init__(
+        self, cache: QueryCache, policies: Mapping[Type[Request[Any]], CachePolicy],
+        *, scoped_keys: Collection[str] = REQUEST_SCOPED_KEYS, refresh_scope: RefreshScope | None = None,
+    ) -> None:
+        self._cache = cache
+        self._policies = policies
+        self._scoped_keys = scoped_keys
+        self._refresh_scope = refresh_scope
+        self._refreshes: dict[Hashable, asyncio.Task[None]] = {}
+
+    @property
+    def refreshing(self) -> int:
+        return len(self._refreshes)
+
+    async def __call__(
+        self,
+        handler: HandlerType[R, RRes],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> RRes:
+        policy = self._policies.get(type(request))
+        if policy is None:
+            return await self._call(handler, request, *args, **kwargs)
+
+        # Queries are cache keys, so they have to be hashable
+        tags = policy.get_tags(request)
+        entry = self._cache.get(request, tags)
+        if entry is not None:
+            if time.monotonic() >= policy.get_refresh_at(entry.stale_at):
+                self._refresh(policy, tags, handler, request, *args, **kwargs)
+            cached: RRes = entry.value
+            return cached
+
+        return await self._compute(policy, tags, handler, request, *args, **kwargs)
+
+    async def close(self) -> None:
+        refreshes = list(self._refreshes.values())
+        for refresh in refreshes:
+            refresh.cancel()
+        await asyncio.gather(*refreshes, return_exceptions=True)
+
+    async def _compute(
+        self, policy: CachePolicy, tags: frozenset[str],
+        handler: HandlerType[R, RRes], request: R, *args: Any, **kwargs: Any,
+    ) -> RRes:
+        # A result is dropped if its tags are invalidated while it's computed
+        version = self._cache.version()
+        res = await self._call(handler, request, *args, **kwargs)
+        self._cache.set(request, res, tags, policy.ttl, stale_ttl=policy.stale_ttl, version=version)
+        return res
+
+    def _refresh(
+        self, policy: CachePolicy, tags: frozenset[str],
+        handler: HandlerType[R, RRes], request: R, *args: Any, **kwargs: Any,
+    ) -> None:
+        # Only one refresh of a query runs at a time, it goes through the rest of the middlewares
+        # with the arguments of the request that started it, except for the ones bound to its scope
+        if request in self._refreshes:
+            return
+
+        kwargs = {key: value for key, value in kwargs.items() if key not in self._scoped_keys}
+        refresh = asyncio.create_task(self._run_refresh(policy, tags, handler, request, *args, **kwargs))
+        self._refreshes[request] = refresh
+        refresh.add_done_callback(lambda _: self._refreshes.pop(request, None))
+
+    async def _run_refresh(
+        self, policy: CachePolicy, tags: frozenset[str],
+        handler: HandlerType[R, RRes], request: R, *args: Any, **kwargs: Any,
+    ) -> None:
+        try:
+            if self._refresh_scope is None:
+                await self._compute(policy, tags, handler, request, *args, **kwargs)
+            else:
+                # The scope provides arguments that outlive the refresh, like an app-wide DI state
+                async with self._refresh_scope() as scoped_kwargs:
+                    await self._compute(policy, tags, handler, request, *args, **kwargs, **scoped_kwargs)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Refresh of cached %s query failed", type(request).__name__, exc_info=True)
+
+
+class CacheInvalidationMiddleware(Middleware):
+    def __init__(self, cache: QueryCache, invalidates: TagExtractors) -> None:
+        self._cache = cache
+        self._invalidates = invalidates
+
+    async def __call__(
+        self,
+        handler: HandlerType[R, RRes],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> RRes:
+        tags = self._get_tags(request)
+        if tags is None:
+            return await self._call(handler, request, *args, **kwargs)
+
+        # An event reports a change that has already happened, so its handlers get fresh results.
+        # A command changes the state while it's handled, so results are invalidated after it
+        is_event = isinstance(request, (Event, EventBatch))
+        if is_event:
+            self._cache.invalidate(tags)
+            return await self._call(handler, request, *args, **kwargs)
+
+        try:
+            return await self._call(handler, request, *args, **kwargs)
+        finally:
+            self._cache.invalidate(tags)
+
+    def _get_tags(self, request: Request[Any]) -> list[str] | None:
+        requests: Iterable[Request[Any]] = request if isinstance(request, EventBatch) else (request,)
+        tags: list[str] = []
+        found = False
+        for item in requests:
+            get_tags = self._invalidates.get(type(item))
+            if get_tags is not None:
+                tags.extend(get_tags(item))
+                found = True
+        return tags if found else None
+
+
+class QueryMemoMiddleware(Middleware):
+    def __init__(self, key: str = "query_memo") -> None:
+        self._key = key
+
+    async def __call__(
+        self,
+        handler: HandlerType[R, RRes],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> RRes:
+        memo: QueryMemo | None = kwargs.pop(self._key, None)
+        if memo is None:
+            return await self._call(handler, request, *args, **kwargs)
+
+        is_query = isinstance(request, Query)
+        if is_query:
+            return await memo.run(request, functools.partial(self._call, handler, request, *args, **kwargs))
+
+        # Commands and events change the state, so memoized results are dropped after them
+        try:
+            return await self._call(handler, request, *args, **kwargs)
+        finally:
+            memo.clear()
+
+    def stream(
+        self,
+        handler: Callable[..., AsyncIterator[RRes]],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[RRes]:
+        kwargs.pop(self._key, None)
+        return self._stream(handler, request, *args, **kwargs)
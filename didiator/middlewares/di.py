@@ -1,4 +1,5 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import aclosing
 from dataclasses import dataclass
 from typing import Any, TypeVar
 
@@ -10,6 +11,7 @@ from didiator.interface.entities.request import Request
 from didiator.interface.handlers import HandlerType
 from didiator.interface.utils.di_builder import DiBuilder
 from didiator.middlewares import Middleware
+from didiator.utils.signature import copy_signature
 
 RRes = TypeVar("RRes")
 R = TypeVar("R", bound=Request[Any])
@@ -48,6 +50,8 @@ class DiMiddleware(Middleware):
             di_keys = DiKeys()
         self._di_keys = di_keys
 
+        self._stream_factories: dict[Any, Callable[..., AsyncIterator[Any]]] = {}
+
     def _register_di_scopes(self) -> None:
         if self._di_scopes.cls_handler not in self._di_builder.di_scopes:
             self._di_builder.di_scopes.append(self._di_scopes.cls_handler)
@@ -92,3 +96,46 @@ class DiMiddleware(Middleware):
                     type(request): request,
                 } | di_values,
             )
+
+    async def _stream(
+        self,
+        handler: Callable[..., AsyncIterator[RRes]],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[RRes]:
+        di_state: ScopeState | None = kwargs.pop(self._di_keys.state, None)
+        di_values: Mapping[DependencyProvider, Any] = kwargs.pop(self._di_keys.values, {})
+        di_builder: DiBuilder = kwargs.pop(self._di_keys.builder, self._di_builder)
+
+        # The scope stays open until the stream is exhausted or closed
+        async with di_builder.enter_scope(self._di_scopes.func_handler, di_state) as scoped_di_state:
+            values: dict[Any, Any] = {type(request): request, **di_values}
+            stream: AsyncIterator[RRes]
+            if isinstance(handler, type):
+                initialized_handler = await di_builder.execute(
+                    handler, self._di_scopes.cls_handler, state=scoped_di_state, values=values,
+                )
+                stream = initialized_handler(request, *args, **kwargs)
+            else:
+                stream = await di_builder.execute(
+                    self._get_stream_factory(handler), self._di_scopes.func_handler,
+                    state=scoped_di_state, values=values,
+                )
+
+            async with aclosing(stream):  # type: ignore[type-var]
+                async for item in stream:
+                    yield item
+
+    def _get_stream_factory(self, handler: Callable[..., AsyncIterator[RRes]]) -> Callable[..., AsyncIterator[RRes]]:
+        # DI treats async generators as dependencies with teardown,
+        # so the handler is called by a plain function that only returns the stream
+        try:
+            return self._stream_factories[handler]
+        except KeyError:
+            def stream_factory(*args: Any, **kwargs: Any) -> AsyncIterator[RRes]:
+                return handler(*args, **kwargs)
+
+            copy_signature(stream_factory, handler)
+            self._stream_factories[handler] = stream_factory
+            return stream_factory
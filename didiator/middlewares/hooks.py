@@ -0,0 +1,164 @@
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import aclosing
+import inspect
+from typing import Any
+
+from didiator.interface.entities.request import Request
+
+# A hook and whether it has to be awaited, hooks that aren't overridden are skipped
+Hook = tuple[Callable[..., Any], bool] | None
+
+
+class HookContext:
+    __slots__ = ("args", "kwargs", "_state")
+
+    def __init__(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        # Hooks can change arguments passed to the handler in ``before``
+        self.args = args
+        self.kwargs = kwargs
+        self._state: dict[str, Any] | None = None
+
+    @property
+    def state(self) -> dict[str, Any]:
+        # Data shared by hooks of one request
+        if self._state is None:
+            self._state = {}
+        return self._state
+
+
+class HookMiddleware:
+    # Hooks are called by a flat loop instead of wrapping the handler, so they don't add a coroutine per middleware.
+    # They can be sync or async
+    _hooks: tuple[Hook, Hook, Hook] = (None, None, None)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._hooks = (
+            _get_hook(cls, "before"), _get_hook(cls, "after"), _get_hook(cls, "on_error"),
+        )
+
+    async def __call__(self, handler: Callable[..., Any], request: Request[Any], *args: Any, **kwargs: Any) -> Any:
+        # Used only outside of a middleware chain, chains group hook middlewares
+        return await HookChain((self,))(handler, request, *args, **kwargs)
+
+    def stream(
+        self, handler: Callable[..., AsyncIterator[Any]], request: Request[Any], *args: Any, **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        return HookChain((self,)).stream(handler, request, *args, **kwargs)
+
+    def before(self, request: Request[Any], ctx: HookContext) -> Any:
+        pass
+
+    def after(self, request: Request[Any], result: Any, ctx: HookContext) -> Any:
+        # The returned value replaces the result
+        return result
+
+    def on_error(self, request: Request[Any], error: Exception, ctx: HookContext) -> Any:
+        # The error is raised further after all hooks are called
+        pass
+
+
+class HookChain:
+    # Consecutive hook middlewares run as one layer of the middleware chain
+    __slots__ = ("_hooks",)
+
+    def __init__(self, middlewares: Sequence[HookMiddleware]) -> None:
+        self._hooks = tuple((middleware, *middleware._hooks) for middleware in middlewares)
+
+    async def __call__(self, handler: Callable[..., Any], request: Request[Any], *args: Any, **kwargs: Any) -> Any:
+        ctx = HookContext(args, kwargs)
+        hooks = self._hooks
+        # Like with wrapping middlewares, ``after`` and ``on_error`` of a middleware are called
+        # only if its ``before`` is completed, and in the reverse order
+        entered = 0
+        try:
+            for middleware, before, _, _ in hooks:
+                if before is not None:
+                    res = before[0](middleware, request, ctx)
+                    if before[1]:
+                        await res
+                entered += 1
+
+            if isinstance(handler, type):
+                handler = handler()
+            result = await handler(request, *ctx.args, **ctx.kwargs)
+
+            while entered:
+                entered -= 1
+                middleware, _, after, _ = hooks[entered]
+                if after is not None:
+                    result = after[0](middleware, request, result, ctx)
+                    if after[1]:
+                        result = await result
+        except Exception as err:
+            await self._on_error(entered, request, err, ctx)
+            raise
+        return result
+
+    async def stream(
+        self, handler: Callable[..., AsyncIterator[Any]], request: Request[Any], *args: Any, **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        # ``after`` of stream queries receives None as the result, when the stream is exhausted
+        ctx = HookContext(args, kwargs)
+        hooks = self._hooks
+        entered = 0
+        try:
+            for middleware, before, _, _ in hooks:
+                if before is not None:
+                    res = before[0](middleware, request, ctx)
+                    if before[1]:
+                        await res
+                entered += 1
+
+            if isinstance(handler, type):
+                handler = handler()
+            stream = handler(request, *ctx.args, **ctx.kwargs)
+            async with aclosing(stream):  # type: ignore[type-var]
+                async for item in stream:
+                    yield item
+
+            while entered:
+                entered -= 1
+                middleware, _, after, _ = hooks[entered]
+                if after is not None:
+                    res = after[0](middleware, request, None, ctx)
+                    if after[1]:
+                        await res
+        except Exception as err:
+            await self._on_error(entered, request, err, ctx)
+            raise
+
+    async def _on_error(self, entered: int, request: Request[Any], err: Exception, ctx: HookContext) -> None:
+        while entered:
+            entered -= 1
+            middleware, _, _, on_error = self._hooks[entered]
+            if on_error is not None:
+                res = on_error[0](middleware, request, err, ctx)
+                if on_error[1]:
+                    await res
+
+
+def group_hooks(middlewares: Sequence[Any]) -> Sequence[Any]:
+    if not any(isinstance(middleware, HookMiddleware) for middleware in middlewares):
+        return middlewares
+
+    grouped: list[Any] = []
+    hooks: list[HookMiddleware] = []
+    for middleware in middlewares:
+        if isinstance(middleware, HookMiddleware):
+            hooks.append(middleware)
+            continue
+        if hooks:
+            grouped.append(HookChain(hooks))
+            hooks = []
+        grouped.append(middleware)
+    if hooks:
+        grouped.append(HookChain(hooks))
+    return grouped
+
+
+def _get_hook(cls: type, name: str) -> Hook:
+    func = getattr(cls, name)
+    if func is getattr(HookMiddleware, name):
+        return None
+    return func, inspect.iscoroutinefunction(func)
@@ -0,0 +1,138 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+import logging
+import time
+from typing import Any, TypeVar
+
+from didiator.idempotency.memory import MemoryIdempotencyStore
+from didiator.interface.entities.request import Request
+from didiator.interface.handlers import HandlerType
+from didiator.interface.idempotency import IdempotencyStore
+from didiator.interface.partitioner import KeyExtractors
+from didiator.interface.utils.serializer import Serializer
+from didiator.middlewares import Middleware
+from didiator.utils.serializer import PickleSerializer
+
+RRes = TypeVar("RRes")
+R = TypeVar("R", bound=Request[Any])
+Outcome = tuple[bool, Any]
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyMiddleware(Middleware):
+    def __init__(
+        self, store: IdempotencyStore | None = None,
+        *, keys: KeyExtractors | None = None, key: str = "idempotency_key", ttl: float = 24 * 60 * 60,
+        serializer: Serializer | None = None, store_exceptions: bool = True,
+    ) -> None:
+        if store is None:
+            store = MemoryIdempotencyStore()
+        self._store = store
+        self._keys = keys if keys is not None else {}
+        self._key = key
+        self._ttl = ttl
+
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+        self._store_exceptions = store_exceptions
+        self._in_flight: dict[str, asyncio.Future[Outcome]] = {}
+
+    async def __call__(
+        self,
+        handler: HandlerType[R, RRes],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> RRes:
+        key = self._get_key(request, kwargs)
+        if key is None:
+            return await self._call(handler, request, *args, **kwargs)
+
+        while (in_flight := self._in_flight.get(key)) is not None:
+            # Concurrent duplicates wait for the first execution and get its outcome
+            try:
+                res: RRes = self._unwrap(await asyncio.shield(in_flight))
+                return res
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The first execution was cancelled, so the request is executed again
+
+        future: asyncio.Future[Outcome] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            outcome = await self._execute(key, handler, request, *args, **kwargs)
+            future.set_result(outcome)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._in_flight[key]
+        res = self._unwrap(outcome)
+        return res
+
+    def stream(
+        self,
+        handler: Callable[..., AsyncIterator[RRes]],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[RRes]:
+        # Streams aren't deduplicated, their items can't be stored as one outcome
+        kwargs.pop(self._key, None)
+        return self._stream(handler, request, *args, **kwargs)
+
+    def _get_key(self, request: R, kwargs: dict[str, Any]) -> str | None:
+        # The key from extra data is consumed by the middleware and isn't passed to the handler
+        idempotency_key = kwargs.pop(self._key, None)
+        if idempotency_key is None:
+            get_key = self._keys.get(type(request))
+            if get_key is None:
+                return None
+            idempotency_key = get_key(request)
+            if idempotency_key is None:
+                return None
+        # Requests of different types can't share results
+        return f"{type(request).__module__}.{type(request).__qualname__}:{idempotency_key}"
+
+    async def _execute(
+        self, key: str, handler: HandlerType[R, RRes], request: R, *args: Any, **kwargs: Any,
+    ) -> Outcome:
+        data = await self._store.get(key, time.time())
+        if data is not None:
+            try:
+                stored: Outcome = self._serializer.loads(data)
+                return stored
+            except Exception:  # pylint: disable=broad-except
+                # The request is executed again instead of failing until the record expires
+                logger.warning("Outcome stored with %s idempotency key can't be loaded", key, exc_info=True)
+                await self._store.delete(key)
+
+        outcome: Outcome
+        try:
+            outcome = True, await self._call(handler, request, *args, **kwargs)
+        except Exception as err:  # pylint: disable=broad-except
+            outcome = False, err
+
+        if outcome[0] or self._store_exceptions:
+            await self._save(key, outcome)
+        return outcome
+
+    async def _save(self, key: str, outcome: Outcome) -> None:
+        try:
+            data = self._serializer.dumps(outcome)
+            # Some objects, like exceptions with required arguments, can be dumped but not loaded
+            self._serializer.loads(data)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Outcome of a request with %s idempotency key can't be stored", key, exc_info=True)
+            return
+        await self._store.set(key, data, time.time() + self._ttl)
+
+    @staticmethod
+    def _unwrap(outcome: Outcome) -> Any:
+        is_ok, res = outcome
+        if not is_ok:
+            raise res
+        return res
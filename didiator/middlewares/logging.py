@@ -1,8 +1,11 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
 from typing import Any, Protocol, TypeVar
 import logging
 
 from didiator.interface.entities.command import Command
 from didiator.interface.entities.event import Event
+from didiator.interface.entities.event_batch import EventBatch
 from didiator.interface.entities.request import Request
 from didiator.interface.entities.query import Query
 from didiator.interface.handlers import HandlerType
@@ -38,6 +41,11 @@ class LoggingMiddleware(Middleware):
             self._logger.log(self._level, "Make %s query", type(request).__name__, extra={"query": request})
         elif isinstance(request, Event):
             self._logger.log(self._level, "Publish %s event", type(request).__name__, extra={"event": request})
+        elif isinstance(request, EventBatch):
+            self._logger.log(
+                self._level, "Publish batch of %s %s events", len(request), request.event.__name__,
+                extra={"events": request},
+            )
         else:
             self._logger.log(self._level, "Execute %s request", type(request).__name__, extra={"request": request})
 
@@ -52,9 +60,35 @@ class LoggingMiddleware(Middleware):
             )
         elif isinstance(request, Event):
             self._logger.log(self._level, "Event %s published", type(request).__name__, extra={"event": request})
+        elif isinstance(request, EventBatch):
+            self._logger.log(
+                self._level, "Batch of %s %s events published", len(request), request.event.__name__,
+                extra={"events": request},
+            )
         else:
             self._logger.log(
                 self._level, "Request %s executed. Result: %s", type(request).__name__, res, extra={"result": res},
             )
 
         return res
+
+    async def stream(
+        self,
+        handler: Callable[..., AsyncIterator[RRes]],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[RRes]:
+        self._logger.log(self._level, "Stream %s query", type(request).__name__, extra={"query": request})
+
+        items_count = 0
+        stream = self._stream(handler, request, *args, **kwargs)
+        async with aclosing(stream):  # type: ignore[type-var]
+            async for item in stream:
+                items_count += 1
+                yield item
+
+        self._logger.log(
+            self._level, "Query %s streamed. Items: %s", type(request).__name__, items_count,
+            extra={"items_count": items_count},
+        )
@@ -0,0 +1,40 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from typing import Any, TypeVar
+
+from didiator.interface.entities.request import Request
+from didiator.interface.handlers import HandlerType
+from didiator.interface.scheduler import Scheduler
+from didiator.middlewares import Middleware
+
+RRes = TypeVar("RRes")
+R = TypeVar("R", bound=Request[Any])
+
+
+class SchedulerMiddleware(Middleware):
+    def __init__(self, scheduler: Scheduler) -> None:
+        self._scheduler = scheduler
+
+    async def __call__(
+        self,
+        handler: HandlerType[R, RRes],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> RRes:
+        async with self._scheduler.slot(request, kwargs):
+            return await self._call(handler, request, *args, **kwargs)
+
+    async def stream(
+        self,
+        handler: Callable[..., AsyncIterator[RRes]],
+        request: R,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[RRes]:
+        # The slot is held until the stream is exhausted or closed
+        async with self._scheduler.slot(request, kwargs):
+            stream = self._stream(handler, request, *args, **kwargs)
+            async with aclosing(stream):  # type: ignore[type-var]
+                async for item in stream:
+                    yield item
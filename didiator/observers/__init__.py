@@ -1,5 +1,18 @@
 from .event import EventObserverImpl
+from .fanout import Overflow, SubscriberQueue
+from .outbox import OutboxEventObserverImpl
+from .stream import StreamPublisher
+from .windows import EventStream, Sliding, StreamProcessor, Tumbling, WindowResult
 
 __all__ = (
     "EventObserverImpl",
+    "EventStream",
+    "OutboxEventObserverImpl",
+    "Overflow",
+    "Sliding",
+    "StreamProcessor",
+    "StreamPublisher",
+    "SubscriberQueue",
+    "Tumbling",
+    "WindowResult",
 )
@@ -0,0 +1,69 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+import logging
+from typing import Any
+
+from didiator.interface.entities.event import Event
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWindow:
+    def __init__(
+        self, handle: Callable[[Sequence[Event]], Awaitable[Any]],
+        *, max_batch_size: int | None = None, max_delay: float | None = None,
+    ) -> None:
+        self._handle = handle
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._buffer: list[Event] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # Batches are handled one by one in the order they were collected
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def __call__(self, events: Sequence[Event]) -> None:
+        self._buffer.extend(events)
+        if self._max_batch_size is not None:
+            # A full batch is handled in the publish call that filled it, so publishers can't outrun the handler
+            while len(self._buffer) >= self._max_batch_size:
+                await self._handle_in_order(self._take(self._max_batch_size))
+
+        # Without a delay, a partial batch waits for the next events or for flush
+        if self._buffer and self._max_delay is not None and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_delay, self._on_timer)
+
+    async def flush(self) -> None:
+        while self._buffer:
+            await self._handle_in_order(self._take(self._max_batch_size or len(self._buffer)))
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _take(self, size: int) -> list[Event]:
+        events, self._buffer = self._buffer[:size], self._buffer[size:]
+        if not self._buffer and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return events
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if not self._buffer:
+            return
+
+        task = asyncio.create_task(self._handle_in_order(self._take(len(self._buffer))))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Handling of a batch of events failed", exc_info=task.exception())
+
+    async def _handle_in_order(self, events: list[Event]) -> None:
+        async with self._lock:
+            await self._handle(events)
@@ -0,0 +1,156 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+import logging
+from typing import Any
+
+from didiator.interface.entities.event import Event
+from didiator.interface.observers.event import EventCoalescer
+
+Deliver = Callable[[Sequence[Event]], Awaitable[Any]]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DELAY_FACTOR = 10
+
+
+class _Window:
+    __slots__ = ("event", "deliver", "started_at", "updated_at", "timer")
+
+    def __init__(self, event: Event | None, deliver: Deliver, now: float) -> None:
+        self.event = event
+        self.deliver = deliver
+        self.started_at = now
+        self.updated_at = now
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class _Coalescer(EventCoalescer):
+    def __init__(
+        self, *, key: Callable[[Any], Hashable] | None = None, reduce: Callable[[Any, Any], Event] | None = None,
+    ) -> None:
+        self._key = key
+        self._reduce = reduce
+        self._windows: dict[Hashable, _Window] = {}
+        self._tasks: set[asyncio.Future[Any]] = set()
+
+    @property
+    def pending(self) -> int:
+        return sum(window.event is not None for window in self._windows.values())
+
+    async def flush(self) -> None:
+        # Held events are delivered right away
+        for window in list(self._windows.values()):
+            event, window.event = window.event, None
+            if event is not None:
+                await window.deliver([event])
+        self._drop_empty()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _get_key(self, event: Event) -> Hashable:
+        if self._key is None:
+            return type(event)
+        return type(event), self._key(event)
+
+    def _merge(self, held: Event | None, event: Event) -> Event:
+        # The latest event replaces the held one, unless they are merged by the reducer
+        if held is None or self._reduce is None:
+            return event
+        return self._reduce(held, event)
+
+    def _deliver(self, window: _Window) -> None:
+        event, window.event = window.event, None
+        if event is None:
+            return
+        task = asyncio.ensure_future(window.deliver([event]))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _drop_empty(self) -> None:
+        for key, window in list(self._windows.items()):
+            if window.event is None:
+                if window.timer is not None:
+                    window.timer.cancel()
+                del self._windows[key]
+
+    def _on_task_done(self, task: asyncio.Future[Any]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Handling of a coalesced event failed", exc_info=task.exception())
+
+
+class Debounce(_Coalescer):
+    def __init__(
+        self, delay: float,
+        *, key: Callable[[Any], Hashable] | None = None, reduce: Callable[[Any, Any], Event] | None = None,
+        max_delay: float | None = None,
+    ) -> None:
+        super().__init__(key=key, reduce=reduce)
+        self._delay = delay
+        # Events that keep coming would postpone the delivery forever
+        self._max_delay = max_delay if max_delay is not None else delay * DEFAULT_MAX_DELAY_FACTOR
+
+    def add(self, event: Event, deliver: Deliver) -> bool:
+        # An event is delivered when no events with its key are published for ``delay``,
+        # but not later than ``max_delay`` after the first one
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        key = self._get_key(event)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _Window(event, deliver, now)
+            window.timer = loop.call_at(self._get_due(window), self._on_timer, key)
+            return True
+
+        window.event = self._merge(window.event, event)
+        window.deliver = deliver
+        # The timer isn't rescheduled for every event, it's moved when it fires too early
+        window.updated_at = now
+        return True
+
+    def _get_due(self, window: _Window) -> float:
+        return min(window.updated_at + self._delay, window.started_at + self._max_delay)
+
+    def _on_timer(self, key: Hashable) -> None:
+        window = self._windows[key]
+        due = self._get_due(window)
+        loop = asyncio.get_running_loop()
+        if due > loop.time():
+            window.timer = loop.call_at(due, self._on_timer, key)
+            return
+
+        del self._windows[key]
+        self._deliver(window)
+
+
+class Throttle(_Coalescer):
+    def __init__(
+        self, interval: float,
+        *, key: Callable[[Any], Hashable] | None = None, reduce: Callable[[Any, Any], Event] | None = None,
+    ) -> None:
+        super().__init__(key=key, reduce=reduce)
+        self._interval = interval
+
+    def add(self, event: Event, deliver: Deliver) -> bool:
+        # The first event is delivered by the publish call, the next ones are held
+        # and the latest or merged one is delivered at the end of the interval
+        loop = asyncio.get_running_loop()
+        key = self._get_key(event)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _Window(None, deliver, loop.time())
+            window.timer = loop.call_later(self._interval, self._on_timer, key)
+            return False
+
+        window.event = self._merge(window.event, event)
+        window.deliver = deliver
+        return True
+
+    def _on_timer(self, key: Hashable) -> None:
+        window = self._windows[key]
+        if window.event is None:
+            del self._windows[key]
+            return
+
+        self._deliver(window)
+        window.timer = asyncio.get_running_loop().call_later(self._interval, self._on_timer, key)
@@ -1,28 +1,52 @@
-from collections.abc import Awaitable, Callable, Sequence
-from typing import Any, TypeVar
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping, Sequence
+from concurrent.futures import Executor
+import functools
+from typing import Any, Type, TypeVar
 
 from didiator.dispatchers.request import DEFAULT_MIDDLEWARES
-from didiator.interface.observers.event import EventObserver, Listener
+from didiator.executors.base import wrap_handler
+from didiator.interface.observers.event import BatchListener, EventCoalescer, EventObserver, Listener, Subscription
 from didiator.interface.entities.event import Event
+from didiator.interface.entities.event_batch import EventBatch
+from didiator.interface.eventlog import EventLog
 from didiator.interface.handlers.event import EventHandlerType
-from didiator.middlewares.base import MiddlewareType, wrap_middleware
+from didiator.interface.partitioner import Partitioner
+from didiator.middlewares.base import MiddlewareType, wrap_grouped_middleware
+from didiator.middlewares.hooks import group_hooks
+from didiator.observers.batch import BatchWindow
+from didiator.observers.fanout import QueuedListener, SubscriberQueue
+from didiator.observers.registry import ListenerRegistry, WeakListener
 
 Self = TypeVar("Self", bound="EventObserverImpl")
 E = TypeVar("E", bound=Event)
 Middlewares = Sequence[MiddlewareType[Event, Any]]
+Executors = Mapping[Type[Event], Executor]
+Coalescers = Mapping[Type[Event], EventCoalescer]
 
 
 class EventObserverImpl(EventObserver):
     def __init__(
         self, middlewares: Middlewares = (),
-        *, listeners: list[Listener[Event]] | None = None,
+        *, listeners: ListenerRegistry | Iterable[Listener[Event]] | None = None, executors: Executors | None = None,
+        partitioner: Partitioner | None = None, coalescers: Coalescers | None = None, event_log: EventLog | None = None,
     ) -> None:
         self._middlewares: Middlewares = middlewares
+        # Hook middlewares are grouped once instead of on each event
+        self._chain: Middlewares = group_hooks(middlewares)
 
-        if listeners is None:
-            listeners = []
+        # The registry is shared by copies of the observer
+        if not isinstance(listeners, ListenerRegistry):
+            listeners = ListenerRegistry(listeners or ())
         self._listeners = listeners
 
+        if executors is None:
+            executors = {}
+        self._executors = executors
+        self._partitioner = partitioner
+        self._coalescers = coalescers if coalescers is not None else {}
+        self._event_log = event_log
+
     @property
     def listeners(self) -> tuple[Listener[Event], ...]:
         return tuple(self._listeners)
@@ -31,28 +55,221 @@ class EventObserverImpl(EventObserver):
     def middlewares(self) -> tuple[MiddlewareType[Event, Any], ...]:
         return tuple(self._middlewares)
 
+    @property
+    def executors(self) -> Executors:
+        return self._executors
+
+    @property
+    def partitioner(self) -> Partitioner | None:
+        return self._partitioner
+
+    @property
+    def coalescers(self) -> Coalescers:
+        return self._coalescers
+
+    @property
+    def event_log(self) -> EventLog | None:
+        return self._event_log
+
     def copy(self: Self) -> Self:
-        return self.__class__(self._middlewares, listeners=self._listeners)
+        return self.__class__(
+            self._middlewares, listeners=self._listeners, executors=self._executors, partitioner=self._partitioner,
+            coalescers=self._coalescers, event_log=self._event_log,
+        )
+
+    def register_listener(self, listener: Listener[Event], *, executor: Executor | None = None) -> Subscription:
+        if executor is None:
+            executor = self._executors.get(listener.event)
+        if isinstance(listener, BatchListener):
+            return self._listeners.add(self._build_batch_listener(listener, executor))
+        if isinstance(listener, QueuedListener):
+            return self._register_queued_listener(listener, executor)
+
+        original_handler = listener.handler
+        handler = wrap_handler(listener.event, original_handler, executor)
+        if handler is not original_handler:
+            if isinstance(listener, WeakListener):
+                # A wrapper would keep the handler alive
+                raise ValueError("Only async handlers executed in the event loop can be referenced weakly")
+            listener = Listener(listener.event, handler, where=listener.where)
+        return self._listeners.add(listener)
+
+    def subscribe(
+        self, event: Type[E], handler: EventHandlerType[E],
+        *, weak: bool = False, executor: Executor | None = None, where: Mapping[str, Hashable] | None = None,
+        queue: SubscriberQueue | None = None,
+    ) -> Subscription:
+        listener: Listener[Any]
+        if queue is not None:
+            if weak:
+                raise ValueError("Queued handlers can't be referenced weakly")
+            listener = QueuedListener(event, handler, queue, where=where)
+        elif weak:
+            listener = WeakListener(event, handler, where=where)
+        else:
+            listener = Listener(event, handler, where=where)
+        return self.register_listener(listener, executor=executor)
 
-    def register_listener(self, listener: Listener[Event]) -> None:
-        self._listeners.append(listener)
+    def _register_queued_listener(self, listener: QueuedListener, executor: Executor | None) -> Subscription:
+        # Middlewares are applied once, the queue calls the wrapped handler for each event
+        middlewares: Middlewares = self._chain if self._chain else DEFAULT_MIDDLEWARES
+        handler = wrap_handler(listener.event, listener.handler, executor)
+        listener.queue.bind(self._wrap_middleware(middlewares, handler))
+
+        subscription = self._listeners.add(Listener(listener.event, listener.queue, where=listener.where))
+        listener.queue.watch(subscription.unsubscribe)
+        return subscription
+
+    def _build_batch_listener(self, listener: BatchListener[Event], executor: Executor | None) -> Listener[Event]:
+        handler = wrap_handler(EventBatch[listener.event], listener.handler, executor)  # type: ignore[name-defined]
+        if handler is not listener.handler:
+            listener = BatchListener(
+                listener.event, handler, max_batch_size=listener.max_batch_size, max_delay=listener.max_delay,
+            )
+        if not listener.is_windowed:
+            return listener
+
+        # The window is stored as the handler of the listener, so it's shared by copies of the observer
+        window = BatchWindow(
+            functools.partial(self._handle_batch, listener),
+            max_batch_size=listener.max_batch_size, max_delay=listener.max_delay,
+        )
+        return BatchListener(
+            listener.event, window, max_batch_size=listener.max_batch_size, max_delay=listener.max_delay,
+        )
 
     async def publish(self, events: Sequence[Event], *args: Any, **kwargs: Any) -> None:
+        # Events are logged before they are coalesced and handled, so the log keeps the whole history
+        if self._event_log is not None:
+            await self._event_log.append(events)
+        if self._coalescers:
+            events = [event for event in events if not self._coalesce(event)]
+            if not events:
+                return
         await self._handle(events, *args, **kwargs)
 
+    def _coalesce(self, event: Event) -> bool:
+        # Held events are handled outside of publish calls, so extra arguments aren't passed to them
+        coalescer = self._coalescers.get(type(event))
+        return coalescer is not None and coalescer.add(event, self._handle)
+
+    async def flush(self) -> None:
+        # Handles events held by coalescers and collected by windowed batch listeners
+        for coalescer in dict.fromkeys(self._coalescers.values()):
+            await coalescer.flush()
+        for listener in self._listeners:
+            if isinstance(listener.handler, BatchWindow):
+                await listener.handler.flush()
+            elif isinstance(listener.handler, SubscriberQueue):
+                await listener.handler.join()
+
+    async def replay(
+        self, event_log: EventLog | None = None,
+        *, start: int = 1, checkpoint: str | None = None, batch_size: int = 1000, **kwargs: Any,
+    ) -> int:
+        # Logged events are handled by listeners of the observer in batches without being logged again.
+        # The sequence of the last handled event is saved as the checkpoint, so the next replay continues after it
+        if event_log is None:
+            event_log = self._event_log
+        if event_log is None:
+            raise ValueError("Event log isn't set")
+        if checkpoint is not None:
+            sequence = await event_log.load_checkpoint(checkpoint)
+            if sequence is not None:
+                start = max(start, sequence + 1)
+
+        replayed = 0
+        batch: list[Event] = []
+        event_types = {listener.event for listener in self._listeners}
+        for logged_event in event_log.read(start, event_types=event_types):
+            batch.append(logged_event.event)
+            if len(batch) >= batch_size:
+                await self._replay_batch(event_log, batch, logged_event.sequence, checkpoint, **kwargs)
+                replayed += len(batch)
+                batch = []
+            start = logged_event.sequence + 1
+
+        if batch:
+            await self._replay_batch(event_log, batch, start - 1, checkpoint, **kwargs)
+            replayed += len(batch)
+        return replayed
+
+    async def _replay_batch(
+        self, event_log: EventLog, events: Sequence[Event], sequence: int, checkpoint: str | None, **kwargs: Any,
+    ) -> None:
+        # Events collected by windowed batch listeners and subscriber queues are handled before the checkpoint
+        await self._handle(events, **kwargs)
+        await self.flush()
+        if checkpoint is not None:
+            await event_log.save_checkpoint(checkpoint, sequence)
+
     async def _handle(self, events: Sequence[Event], *args: Any, **kwargs: Any) -> None:
+        if self._partitioner is None:
+            await self._handle_events(events, *args, **kwargs)
+        else:
+            await self._handle_partitioned(self._partitioner, events, *args, **kwargs)
+        await self._handle_batches(events, *args, **kwargs)
+
+    async def _handle_partitioned(
+        self, partitioner: Partitioner, events: Sequence[Event], *args: Any, **kwargs: Any,
+    ) -> None:
+        # Events with the same key are handled in order, groups of events with different keys run concurrently
+        groups: dict[Hashable | None, list[Event]] = {}
+        for event in events:
+            groups.setdefault(partitioner.get_key(event), []).append(event)
+
+        await asyncio.gather(*(
+            partitioner.run(key, functools.partial(self._handle_events, group, *args, **kwargs))
+            if key is not None else self._handle_events(group, *args, **kwargs)
+            for key, group in groups.items()
+        ))
+
+    async def _handle_events(self, events: Sequence[Event], *args: Any, **kwargs: Any) -> None:
         # Handler has to be wrapped with at least one middleware to initialize the handler if it is necessary
-        middlewares: Middlewares = self._middlewares if self._middlewares else DEFAULT_MIDDLEWARES
+        middlewares: Middlewares = self._chain if self._chain else DEFAULT_MIDDLEWARES
 
         for event in events:
-            for listener in self._listeners:
-                if listener.is_listen(event):
+            for listener in self._listeners.get(event):
+                if not self._is_called(listener, event) or isinstance(listener, BatchListener):
+                    continue
+                if isinstance(listener.handler, SubscriberQueue):
+                    # Queued handlers are called by their own tasks, so slow subscribers don't hold up publishing
+                    listener.handler(event)
+                else:
                     wrapped_handler = self._wrap_middleware(middlewares, listener.handler)
                     await wrapped_handler(event, *args, **kwargs)
 
+    async def _handle_batches(self, events: Sequence[Event], *args: Any, **kwargs: Any) -> None:
+        for listener in self._listeners.get_many({type(event): None for event in events}):
+            if not isinstance(listener, BatchListener):
+                continue
+            batch = [event for event in events if self._is_called(listener, event)]
+            if not batch:
+                continue
+            if isinstance(listener.handler, BatchWindow):
+                # Windowed batches are handled outside of publish calls, so extra arguments aren't passed to them
+                await listener.handler(batch)
+            else:
+                await self._handle_batch(listener, batch, *args, **kwargs)
+
+    async def _handle_batch(
+        self, listener: BatchListener[Event], events: Sequence[Event], *args: Any, **kwargs: Any,
+    ) -> None:
+        middlewares: Middlewares = self._chain if self._chain else DEFAULT_MIDDLEWARES
+        batch = EventBatch[listener.event](events)  # type: ignore[name-defined]
+        wrapped_handler = self._wrap_middleware(middlewares, listener.handler)
+        await wrapped_handler(batch, *args, **kwargs)
+
+    @staticmethod
+    def _is_called(listener: Listener[Event], event: Event) -> bool:
+        # A weak listener can outlive its handler until the garbage collector removes it
+        if isinstance(listener, WeakListener) and not listener.alive:
+            return False
+        return listener.is_listen(event)
+
     @staticmethod
     def _wrap_middleware(
         middlewares: Middlewares,
         handler: EventHandlerType[E],
     ) -> Callable[..., Awaitable[Any]]:
-        return wrap_middleware(middlewares, handler)
+        return wrap_grouped_middleware(middlewares, handler)
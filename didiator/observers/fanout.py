@@ -0,0 +1,124 @@
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+import enum
+import logging
+from typing import Any, Type
+
+from didiator.interface.entities.event import Event
+from didiator.interface.handlers.event import EventHandlerType
+from didiator.interface.observers.event import Listener
+
+logger = logging.getLogger(__name__)
+
+
+class Overflow(enum.Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+class SubscriberQueue:
+    def __init__(
+        self, maxsize: int = 100, overflow: Overflow = Overflow.DROP_OLDEST,
+        *, on_disconnect: Callable[[], Any] | None = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("Size of a subscriber queue has to be positive")
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._on_disconnect = on_disconnect
+        self._events: deque[Event] = deque()
+        self._handle: Callable[[Event], Awaitable[Any]] | None = None
+        self._unsubscribe: Callable[[], Any] | None = None
+        # The consumer task exists only while there are queued events, so idle subscribers cost no tasks
+        self._consumer: asyncio.Future[None] | None = None
+        self._dropped = 0
+        self._connected = True
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def overflow(self) -> Overflow:
+        return self._overflow
+
+    @property
+    def pending(self) -> int:
+        return len(self._events)
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def bind(self, handle: Callable[[Event], Awaitable[Any]]) -> None:
+        if self._handle is not None:
+            raise ValueError("Subscriber queue is already used by another listener")
+        self._handle = handle
+
+    def watch(self, unsubscribe: Callable[[], Any]) -> None:
+        self._unsubscribe = unsubscribe
+
+    def __call__(self, event: Event) -> None:
+        # Publishing only enqueues the event, the handler is called by the consumer task
+        if not self._connected:
+            return
+        if len(self._events) >= self._maxsize:
+            self._dropped += 1
+            if self._overflow is Overflow.DROP_NEWEST:
+                return
+            if self._overflow is Overflow.DISCONNECT:
+                self._disconnect()
+                return
+            self._events.popleft()
+
+        self._events.append(event)
+        if self._consumer is None:
+            self._consumer = asyncio.ensure_future(self._consume())
+
+    async def join(self) -> None:
+        while self._consumer is not None:
+            await asyncio.wait((self._consumer,))
+
+    async def _consume(self) -> None:
+        try:
+            while self._events:
+                event = self._events.popleft()
+                try:
+                    await self._handle(event)  # type: ignore[misc]
+                except Exception:
+                    logger.exception("Handling of a queued event failed")
+        finally:
+            self._consumer = None
+
+    def _disconnect(self) -> None:
+        # A subscriber that can't keep up is unsubscribed and loses its queued events
+        self._connected = False
+        self._dropped += len(self._events)
+        self._events.clear()
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+        if self._on_disconnect is not None:
+            try:
+                self._on_disconnect()
+            except Exception:
+                logger.exception("Disconnect callback of a subscriber queue failed")
+
+
+class QueuedListener(Listener[Any]):
+    # The handler is called by a consumer task of the queue instead of the publisher
+    def __init__(
+        self, event: Type[Event], handler: EventHandlerType[Any], queue: SubscriberQueue,
+        *, where: Mapping[str, Hashable] | None = None,
+    ) -> None:
+        super().__init__(event, handler, where=where)
+        self._queue = queue
+
+    @property
+    def queue(self) -> SubscriberQueue:
+        return self._queue
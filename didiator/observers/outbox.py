@@ -0,0 +1,99 @@
+import asyncio
+from collections.abc import Iterable, Sequence
+import logging
+import time
+from typing import Any, TypeVar
+
+from didiator.interface.entities.event import Event
+from didiator.interface.observers.event import Listener
+from didiator.interface.outbox import OutboxMessage, OutboxStorage
+from didiator.interface.partitioner import Partitioner
+from didiator.interface.utils.serializer import Serializer
+from didiator.observers.event import EventObserverImpl, Executors, Middlewares
+from didiator.observers.registry import ListenerRegistry
+from didiator.utils.retry import RetryPolicy
+from didiator.utils.serializer import PickleSerializer
+
+Self = TypeVar("Self", bound="OutboxEventObserverImpl")
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxEventObserverImpl(EventObserverImpl):
+    def __init__(
+        self, storage: OutboxStorage, middlewares: Middlewares = (),
+        *, listeners: ListenerRegistry | Iterable[Listener[Event]] | None = None, executors: Executors | None = None,
+        partitioner: Partitioner | None = None, serializer: Serializer | None = None,
+        retry_policy: RetryPolicy | None = None, batch_size: int = 500, poll_interval: float = 0.05,
+    ) -> None:
+        super().__init__(middlewares, listeners=listeners, executors=executors, partitioner=partitioner)
+        self._storage = storage
+
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self._retry_policy = retry_policy
+
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+
+    @property
+    def storage(self) -> OutboxStorage:
+        return self._storage
+
+    def copy(self: Self) -> Self:
+        return self.__class__(
+            self._storage, self._middlewares, listeners=self._listeners, executors=self._executors,
+            partitioner=self._partitioner, serializer=self._serializer, retry_policy=self._retry_policy,
+            batch_size=self._batch_size, poll_interval=self._poll_interval,
+        )
+
+    async def publish(self, events: Sequence[Event], *args: Any, **kwargs: Any) -> None:
+        # Events are only stored here. Extra arguments can't be stored,
+        # listeners receive the arguments passed to ``run`` or ``deliver_available``
+        if events:
+            await self._storage.add([self._serializer.dumps(event) for event in events])
+
+    async def run(self, *args: Any, **kwargs: Any) -> None:
+        # Only one delivery loop has to be run for a storage
+        while True:
+            delivered = await self.deliver_available(*args, **kwargs)
+            if delivered < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    async def deliver_available(self, *args: Any, **kwargs: Any) -> int:
+        messages = await self._storage.get_available(self._batch_size, time.time())
+        acked: list[int] = []
+        try:
+            for message in messages:
+                if await self._deliver(message, *args, **kwargs):
+                    acked.append(message.id)
+        finally:
+            await self._storage.ack(acked)
+        return len(messages)
+
+    async def _deliver(self, message: OutboxMessage, *args: Any, **kwargs: Any) -> bool:
+        try:
+            event = self._serializer.loads(message.data)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.exception("Outbox message %s can't be deserialized", message.id)
+            await self._storage.move_to_dead_letter(message.id, message.attempts, repr(err))
+            return False
+
+        try:
+            await self._handle((event,), *args, **kwargs)
+        except Exception as err:  # pylint: disable=broad-except
+            attempts = message.attempts + 1
+            if self._retry_policy.is_exhausted(attempts):
+                logger.exception("Delivery of %s event failed %s times", type(event).__name__, attempts)
+                await self._storage.move_to_dead_letter(message.id, attempts, repr(err))
+            else:
+                logger.warning("Delivery of %s event failed, retrying", type(event).__name__, exc_info=True)
+                available_at = time.time() + self._retry_policy.get_delay(attempts)
+                await self._storage.retry(message.id, attempts, available_at, repr(err))
+            return False
+
+        return True
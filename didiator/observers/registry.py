@@ -0,0 +1,199 @@
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+import heapq
+import itertools
+from typing import Any, Callable, Type
+import weakref
+
+from didiator.interface.entities.event import Event
+from didiator.interface.handlers.event import EventHandlerType
+from didiator.interface.observers.event import Listener, Subscription
+
+
+class WeakListener(Listener[Any]):
+    # The handler is referenced weakly, the listener is removed when the handler or its owner is collected
+    def __init__(
+        self, event: Type[Event], handler: EventHandlerType[Any], *, where: Mapping[str, Hashable] | None = None,
+    ) -> None:
+        super().__init__(event, handler, where=where)
+        del self._handler
+        self._ref = self._build_ref(handler)
+
+    @property
+    def handler(self) -> EventHandlerType[Any]:
+        handler = self._ref()
+        if handler is None:
+            raise ReferenceError("Handler of the listener is collected")
+        return handler
+
+    @property
+    def alive(self) -> bool:
+        return self._ref() is not None
+
+    def watch(self, callback: Callable[[], Any]) -> None:
+        handler = self._ref()
+        if handler is not None:
+            self._ref = self._build_ref(handler, lambda _: callback())
+
+    @staticmethod
+    def _build_ref(
+        handler: EventHandlerType[Any], callback: Callable[[Any], Any] | None = None,
+    ) -> Callable[[], EventHandlerType[Any] | None]:
+        if hasattr(handler, "__self__"):
+            return weakref.WeakMethod(handler, callback)
+        return weakref.ref(handler, callback)
+
+
+Group = dict[int, Listener[Any]]
+GroupKey = tuple[type, tuple[str, ...], tuple[Any, ...]]
+_MISSING = object()
+
+
+class ListenerSubscription(Subscription):
+    __slots__ = ("_registry", "_key", "_id")
+
+    def __init__(self, registry: "ListenerRegistry", key: GroupKey, subscription_id: int) -> None:
+        self._registry = registry
+        self._key = key
+        self._id = subscription_id
+
+    @property
+    def active(self) -> bool:
+        return self._registry.contains(self._key, self._id)
+
+    def unsubscribe(self) -> bool:
+        return self._registry.remove(self._key, self._id)
+
+    def __enter__(self) -> "ListenerSubscription":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.unsubscribe()
+
+
+class _Resolved:
+    __slots__ = ("listeners", "groups", "filters")
+
+    def __init__(
+        self, listeners: tuple[Listener[Any], ...], groups: list[Group],
+        filters: list[tuple[tuple[str, ...], dict[tuple[Any, ...], Group]]],
+    ) -> None:
+        self.listeners = listeners
+        self.groups = groups
+        self.filters = filters
+
+
+class ListenerRegistry:
+    def __init__(self, listeners: Iterable[Listener[Any]] = ()) -> None:
+        # Listeners are grouped by their event type, filtered attributes and their values,
+        # and are ordered by subscription ids, so adding and removing them takes constant time
+        self._index: dict[type, dict[tuple[str, ...], dict[tuple[Any, ...], Group]]] = {}
+        self._ids = itertools.count()
+        self._count = 0
+        # Groups matching an event type are resolved once until the registry is changed
+        self._resolved: dict[type, _Resolved] = {}
+        for listener in listeners:
+            self.add(listener)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Listener[Any]]:
+        # Listeners are collected before iteration, so they can be removed while they are iterated
+        return iter(tuple(self._merge([
+            group for by_attrs in self._index.values() for by_values in by_attrs.values()
+            for group in by_values.values()
+        ])))
+
+    def add(self, listener: Listener[Any]) -> ListenerSubscription:
+        attrs = tuple(sorted(listener.where))
+        key = listener.event, attrs, tuple(listener.where[attr] for attr in attrs)
+        subscription_id = next(self._ids)
+        by_values = self._index.setdefault(key[0], {}).setdefault(key[1], {})
+        by_values.setdefault(key[2], {})[subscription_id] = listener
+        self._count += 1
+        self._resolved.clear()
+
+        subscription = ListenerSubscription(self, key, subscription_id)
+        if isinstance(listener, WeakListener):
+            listener.watch(subscription.unsubscribe)
+        return subscription
+
+    def contains(self, key: GroupKey, subscription_id: int) -> bool:
+        group = self._index.get(key[0], {}).get(key[1], {}).get(key[2])
+        return group is not None and subscription_id in group
+
+    def remove(self, key: GroupKey, subscription_id: int) -> bool:
+        event, attrs, values = key
+        by_attrs = self._index.get(event)
+        by_values = by_attrs.get(attrs) if by_attrs is not None else None
+        group = by_values.get(values) if by_values is not None else None
+        if group is None or group.pop(subscription_id, None) is None:
+            return False
+
+        # Empty groups are dropped, so they aren't checked during publishing
+        if not group:
+            del by_values[values]  # type: ignore[union-attr]
+            if not by_values:
+                del by_attrs[attrs]  # type: ignore[union-attr]
+                if not by_attrs:
+                    del self._index[event]
+        self._count -= 1
+        self._resolved.clear()
+        return True
+
+    def get(self, event: Any) -> tuple[Listener[Any], ...]:
+        resolved = self._resolve(type(event))
+        if not resolved.filters:
+            return resolved.listeners
+
+        # Filtered listeners are found by values of the event attributes instead of checking each of them
+        matched = [
+            group for attrs, by_values in resolved.filters
+            if (group := self._match(event, attrs, by_values)) is not None
+        ]
+        if not matched:
+            return resolved.listeners
+        return tuple(self._merge([*resolved.groups, *matched]))
+
+    def get_many(self, event_types: Iterable[type]) -> tuple[Listener[Any], ...]:
+        # All listeners of the event types, including filtered ones
+        groups: dict[int, Group] = {}
+        for event_type in event_types:
+            resolved = self._resolve(event_type)
+            for group in resolved.groups:
+                groups[id(group)] = group
+            for _, by_values in resolved.filters:
+                for group in by_values.values():
+                    groups[id(group)] = group
+        return tuple(self._merge(list(groups.values())))
+
+    def _resolve(self, event_type: type) -> _Resolved:
+        resolved = self._resolved.get(event_type)
+        if resolved is not None:
+            return resolved
+
+        groups: list[Group] = []
+        filters: list[tuple[tuple[str, ...], dict[tuple[Any, ...], Group]]] = []
+        for cls in event_type.__mro__:
+            for attrs, by_values in self._index.get(cls, {}).items():
+                if attrs:
+                    filters.append((attrs, by_values))
+                else:
+                    groups.append(by_values[()])
+        resolved = self._resolved[event_type] = _Resolved(tuple(self._merge(groups)), groups, filters)
+        return resolved
+
+    @staticmethod
+    def _match(event: Any, attrs: tuple[str, ...], by_values: dict[tuple[Any, ...], Group]) -> Group | None:
+        try:
+            return by_values.get(tuple(getattr(event, attr, _MISSING) for attr in attrs))
+        except TypeError:
+            # Unhashable values can't be equal to values of filters
+            return None
+
+    @staticmethod
+    def _merge(groups: list[Group]) -> Iterator[Listener[Any]]:
+        # Listeners are called in the order they were subscribed, whatever event types they listen
+        if len(groups) == 1:
+            return iter(list(groups[0].values()))
+        return (listener for _, listener in heapq.merge(*(group.items() for group in groups)))
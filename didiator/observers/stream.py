@@ -0,0 +1,101 @@
+import asyncio
+from collections.abc import AsyncIterable, Awaitable, Callable, Hashable
+import time
+from typing import Any
+
+from didiator.interface.entities.event import Event
+from didiator.interface.observers.stream import StreamMetrics
+
+Item = tuple[Event, float] | None
+
+
+class StreamPublisher:
+    def __init__(
+        self, publish: Callable[..., Awaitable[Any]],
+        *, read_ahead: int = 128, concurrency: int = 1, key: Callable[[Any], Hashable] | None = None,
+        on_error: Callable[[Event, Exception], Any] | None = None,
+    ) -> None:
+        if read_ahead < 1 or concurrency < 1:
+            raise ValueError("Read-ahead and concurrency have to be positive")
+        self._publish = publish
+        self._read_ahead = read_ahead
+        self._concurrency = concurrency
+        self._key = key
+        self._on_error = on_error
+
+        self._queues: list[asyncio.Queue[Item]] = []
+        self._published = 0
+        self._failed = 0
+        self._lag = 0.0
+        self._max_lag = 0.0
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    @property
+    def metrics(self) -> StreamMetrics:
+        elapsed = 0.0
+        if self._started_at is not None:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+        return StreamMetrics(
+            self._published, self._failed, sum(queue.qsize() for queue in self._queues),
+            elapsed, self._lag, self._max_lag,
+        )
+
+    async def run(self, events: AsyncIterable[Event], *args: Any, **kwargs: Any) -> StreamMetrics:
+        # Without a key, events are taken by any free worker and their order isn't kept.
+        # With a key, each worker has its own queue, so events with the same key are published in order
+        queues_count = 1 if self._key is None else self._concurrency
+        self._queues = [asyncio.Queue(max(1, self._read_ahead // queues_count)) for _ in range(queues_count)]
+        self._started_at = time.monotonic()
+        self._finished_at = None
+
+        tasks = [asyncio.ensure_future(self._read(events))]
+        tasks.extend(
+            asyncio.ensure_future(self._consume(self._queues[worker % queues_count], args, kwargs))
+            for worker in range(self._concurrency)
+        )
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._finished_at = time.monotonic()
+        return self.metrics
+
+    async def _read(self, events: AsyncIterable[Event]) -> None:
+        # The buffer is bounded, so the source isn't read further while workers are behind
+        queues = self._queues
+        async for event in events:
+            queue = queues[0] if self._key is None else queues[hash(self._key(event)) % len(queues)]
+            await queue.put((event, time.monotonic()))
+
+        consumers = self._concurrency // len(queues)
+        for queue in queues:
+            for _ in range(consumers):
+                await queue.put(None)
+
+    async def _consume(self, queue: "asyncio.Queue[Item]", args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        while (item := await queue.get()) is not None:
+            event, read_at = item
+            self._lag = time.monotonic() - read_at
+            self._max_lag = max(self._max_lag, self._lag)
+            try:
+                await self._publish(event, *args, **kwargs)
+            except Exception as err:  # pylint: disable=broad-except
+                if self._on_error is None:
+                    raise
+                self._failed += 1
+                self._on_error(event, err)
+            else:
+                self._published += 1
+
+
+async def publish_stream(
+    publish: Callable[..., Awaitable[Any]], events: AsyncIterable[Event], *args: Any,
+    read_ahead: int = 128, concurrency: int = 1, key: Callable[[Any], Hashable] | None = None,
+    on_error: Callable[[Event, Exception], Any] | None = None, **kwargs: Any,
+) -> StreamMetrics:
+    # Events are read ahead into a bounded buffer while the previous ones are handled
+    publisher = StreamPublisher(publish, read_ahead=read_ahead, concurrency=concurrency, key=key, on_error=on_error)
+    return await publisher.run(events, *args, **kwargs)
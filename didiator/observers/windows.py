@@ -0,0 +1,229 @@
+import asyncio
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from dataclasses import dataclass
+import logging
+import math
+import time
+from typing import Any, Generic, TypeVar
+
+from didiator.interface.entities.command import Command
+from didiator.interface.entities.event import Event
+from didiator.interface.mediator import Mediator
+
+Acc = TypeVar("Acc")
+Operator = tuple[str, Callable[[Any], Any]]
+Emitter = Callable[[Any], Any]
+
+MAP = "map"
+FILTER = "filter"
+KEY_BY = "key_by"
+
+logger = logging.getLogger(__name__)
+
+
+class Sliding:
+    def __init__(self, size: float, slide: float) -> None:
+        if size <= 0 or slide <= 0:
+            raise ValueError("Size and slide of a window have to be positive")
+        self._size = size
+        self._slide = slide
+
+    @property
+    def size(self) -> float:
+        return self._size
+
+    def assign(self, timestamp: float) -> list[int]:
+        # Indexes of the windows containing the timestamp. Windows are identified by integer indexes,
+        # because their float starts computed for different timestamps can differ by a rounding error
+        index = math.floor(timestamp / self._slide)
+        indexes: list[int] = []
+        while self.get_start(index) + self._size > timestamp:
+            indexes.append(index)
+            index -= 1
+        return indexes
+
+    def get_start(self, index: int) -> float:
+        return index * self._slide
+
+
+class Tumbling(Sliding):
+    def __init__(self, size: float) -> None:
+        super().__init__(size, size)
+
+
+@dataclass(frozen=True)
+class WindowResult(Generic[Acc]):
+    start: float
+    end: float
+    values: Mapping[Hashable, Acc]
+
+
+@dataclass(frozen=True)
+class _WindowSpec:
+    window: Sliding
+    reduce: Callable[[Any, Any], Any]
+    initial: Any
+    timestamp: Callable[[Any], float] | None
+    grace: float
+    max_entries: int
+
+
+class EventStream:
+    def __init__(
+        self, operators: Sequence[Operator] = (), window: _WindowSpec | None = None,
+    ) -> None:
+        self._operators = tuple(operators)
+        self._window = window
+
+    def map(self, function: Callable[[Any], Any]) -> "EventStream":
+        return self._add(MAP, function)
+
+    def filter(self, predicate: Callable[[Any], bool]) -> "EventStream":
+        return self._add(FILTER, predicate)
+
+    def key_by(self, key: Callable[[Any], Hashable]) -> "EventStream":
+        return self._add(KEY_BY, key)
+
+    def window(
+        self, window: Sliding, reduce: Callable[[Acc, Any], Acc], initial: Acc,
+        *, timestamp: Callable[[Any], float] | None = None, grace: float = 0.0, max_entries: int = 100_000,
+    ) -> "EventStream":
+        # Values are reduced per key and window, the accumulator has to be replaced by reduce instead of mutated
+        if self._window is not None:
+            raise ValueError("Stream already has a window")
+        spec = _WindowSpec(window, reduce, initial, timestamp, grace, max_entries)
+        return EventStream(self._operators, spec)
+
+    def emit(self, factory: Emitter, mediator: Mediator) -> "StreamProcessor":
+        # The factory builds events or commands from values, or from window results if the stream is windowed
+        return StreamProcessor(self._operators, self._window, factory, mediator)
+
+    def _add(self, kind: str, function: Callable[[Any], Any]) -> "EventStream":
+        if self._window is not None:
+            raise ValueError("Operators can't be added after a window")
+        return EventStream((*self._operators, (kind, function)))
+
+
+class StreamProcessor:
+    def __init__(
+        self, operators: Sequence[Operator], window: _WindowSpec | None, factory: Emitter, mediator: Mediator,
+    ) -> None:
+        self._operators = tuple(operators)
+        self._window = window
+        self._factory = factory
+        self._mediator = mediator
+
+        # Accumulators of open windows by indexes of the windows and keys, closed windows are evicted
+        self._windows: dict[int, dict[Hashable, Any]] = {}
+        self._timers: dict[int, asyncio.TimerHandle] = {}
+        self._entries = 0
+        self._dropped = 0
+        self._late = 0
+        self._closed_until: float = -math.inf
+
+        # Results are emitted one by one in the order their windows were closed
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Future[None]] = set()
+
+    @property
+    def open_windows(self) -> int:
+        return len(self._windows)
+
+    @property
+    def entries(self) -> int:
+        return self._entries
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def late(self) -> int:
+        return self._late
+
+    async def __call__(self, event: Event, *args: Any, **kwargs: Any) -> None:
+        value: Any = event
+        key: Hashable = None
+        for kind, function in self._operators:
+            if kind == FILTER:
+                if not function(value):
+                    return
+            elif kind == KEY_BY:
+                key = function(value)
+            else:
+                value = function(value)
+
+        if self._window is None:
+            await self._emit(self._factory(value))
+        else:
+            self._add(self._window, event, key, value)
+
+    async def flush(self) -> None:
+        # Open windows are closed right away
+        for index in sorted(self._windows):
+            self._close(index)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _add(self, spec: _WindowSpec, event: Event, key: Hashable, value: Any) -> None:
+        timestamp = spec.timestamp(event) if spec.timestamp is not None else time.time()
+        for index in spec.window.assign(timestamp):
+            if index <= self._closed_until and index not in self._windows:
+                self._late += 1
+                continue
+            accumulators = self._windows.get(index)
+            if accumulators is None:
+                accumulators = self._open(spec, index)
+            if key in accumulators:
+                accumulators[key] = spec.reduce(accumulators[key], value)
+            elif self._entries < spec.max_entries:
+                accumulators[key] = spec.reduce(spec.initial, value)
+                self._entries += 1
+            else:
+                # The state is capped, new keys are dropped until windows are closed
+                self._dropped += 1
+
+    def _open(self, spec: _WindowSpec, index: int) -> dict[Hashable, Any]:
+        accumulators: dict[Hashable, Any] = {}
+        self._windows[index] = accumulators
+        delay = spec.window.get_start(index) + spec.window.size + spec.grace - time.time()
+        self._timers[index] = asyncio.get_running_loop().call_later(max(delay, 0), self._close, index)
+        return accumulators
+
+    def _close(self, index: int) -> None:
+        timer = self._timers.pop(index, None)
+        if timer is not None:
+            timer.cancel()
+        accumulators = self._windows.pop(index)
+        self._entries -= len(accumulators)
+        self._closed_until = max(self._closed_until, index)
+        if not accumulators or self._window is None:
+            return
+
+        start = self._window.window.get_start(index)
+        end = start + self._window.window.size
+        task = asyncio.ensure_future(self._emit_in_order(WindowResult(start, end, accumulators)))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    async def _emit_in_order(self, result: WindowResult[Any]) -> None:
+        async with self._lock:
+            await self._emit(self._factory(result))
+
+    async def _emit(self, requests: Any) -> None:
+        if requests is None:
+            return
+        if not isinstance(requests, Sequence):
+            requests = (requests,)
+        for request in requests:
+            if isinstance(request, Event):
+                await self._mediator.publish(request)
+            elif isinstance(request, Command):
+                await self._mediator.send(request)
+            else:
+                raise TypeError(f"Stream can emit only events and commands, got {request!r}")
+
+    def _on_task_done(self, task: asyncio.Future[None]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Emitting of a window result failed", exc_info=task.exception())
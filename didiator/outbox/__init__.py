@@ -0,0 +1,5 @@
+from .sqlite import SqliteOutboxStorage
+
+__all__ = (
+    "SqliteOutboxStorage",
+)
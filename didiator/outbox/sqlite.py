@@ -0,0 +1,123 @@
+import asyncio
+from collections.abc import Sequence
+import os
+import sqlite3
+import time
+
+from didiator.interface.outbox import OutboxMessage, OutboxStorage
+from didiator.utils.sqlite import SqliteRunner
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data BLOB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_available_at ON outbox (available_at, id);
+CREATE TABLE IF NOT EXISTS outbox_dead_letter (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+class SqliteOutboxStorage(OutboxStorage):
+    def __init__(self, path: str | os.PathLike[str], *, synchronous: str = "FULL") -> None:
+        self._runner = SqliteRunner(path, SCHEMA, synchronous=synchronous, thread_name_prefix="didiator-outbox")
+
+        self._buffer: list[bytes] = []
+        self._waiters: list[asyncio.Future[None]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def add(self, messages: Sequence[bytes]) -> None:
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._buffer.extend(messages)
+        self._waiters.append(waiter)
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        await waiter
+
+    async def _flush(self) -> None:
+        # Messages added while a transaction is committed are written by the next one,
+        # so concurrent publishers share one commit
+        try:
+            while self._buffer:
+                buffer, waiters = self._buffer, self._waiters
+                self._buffer, self._waiters = [], []
+                try:
+                    await self._runner.run(self._insert, buffer)
+                except Exception as err:  # pylint: disable=broad-except
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(err)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+        finally:
+            self._flush_task = None
+
+    async def get_available(self, limit: int, now: float) -> list[OutboxMessage]:
+        return await self._runner.run(self._select_available, limit, now)
+
+    async def ack(self, message_ids: Sequence[int]) -> None:
+        if message_ids:
+            await self._runner.run(self._delete, message_ids)
+
+    async def retry(self, message_id: int, attempts: int, available_at: float, error: str) -> None:
+        await self._runner.run(self._update_for_retry, message_id, attempts, available_at, error)
+
+    async def move_to_dead_letter(self, message_id: int, attempts: int, error: str) -> None:
+        await self._runner.run(self._move_to_dead_letter, message_id, attempts, error)
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._runner.close()
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, messages: list[bytes]) -> None:
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany("INSERT INTO outbox (data) VALUES (?)", ((data,) for data in messages))
+
+    @staticmethod
+    def _select_available(connection: sqlite3.Connection, limit: int, now: float) -> list[OutboxMessage]:
+        rows = connection.execute(
+            "SELECT id, data, attempts FROM outbox WHERE available_at <= ? ORDER BY available_at, id LIMIT ?",
+            (now, limit),
+        ).fetchall()
+        return [OutboxMessage(message_id, data, attempts) for message_id, data, attempts in rows]
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, message_ids: Sequence[int]) -> None:
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany("DELETE FROM outbox WHERE id = ?", ((message_id,) for message_id in message_ids))
+
+    @staticmethod
+    def _update_for_retry(
+        connection: sqlite3.Connection, message_id: int, attempts: int, available_at: float, error: str,
+    ) -> None:
+        with connection:
+            connection.execute(
+                "UPDATE outbox SET attempts = ?, available_at = ?, error = ? WHERE id = ?",
+                (attempts, available_at, error, message_id),
+            )
+
+    @staticmethod
+    def _move_to_dead_letter(connection: sqlite3.Connection, message_id: int, attempts: int, error: str) -> None:
+        with connection:
+            connection.execute("BEGIN")
+            connection.execute(
+                "INSERT INTO outbox_dead_letter (id, data, attempts, error, failed_at) "
+                "SELECT id, data, ?, ?, ? FROM outbox WHERE id = ?",
+                (attempts, error, time.time(), message_id),
+            )
+            connection.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
@@ -0,0 +1,7 @@
+from .lanes import LanePartitioner
+from .locks import KeyLockPartitioner
+
+__all__ = (
+    "KeyLockPartitioner",
+    "LanePartitioner",
+)
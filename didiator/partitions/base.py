@@ -0,0 +1,43 @@
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from contextlib import contextmanager
+import contextvars
+from typing import Any, TypeVar
+
+from didiator.interface.entities.request import Request
+from didiator.interface.partitioner import KeyExtractors, Partitioner
+
+T = TypeVar("T")
+
+# Partitions held by the current task and tasks started by it,
+# so a handler can send requests with the same key without a deadlock
+_held_partitions: contextvars.ContextVar[frozenset[tuple[int, Hashable]]] = contextvars.ContextVar(
+    "held_partitions", default=frozenset(),
+)
+
+
+class BasePartitioner(Partitioner):
+    def __init__(self, keys: KeyExtractors) -> None:
+        self._keys = keys
+
+    def get_key(self, request: Request[Any]) -> Hashable | None:
+        get_key = self._keys.get(type(request))
+        if get_key is None:
+            return None
+        return get_key(request)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        raise NotImplementedError
+
+    def _is_held(self, partition: Hashable) -> bool:
+        return (id(self), partition) in _held_partitions.get()
+
+    def _mark_held(self, partition: Hashable) -> contextvars.Token[frozenset[tuple[int, Hashable]]]:
+        return _held_partitions.set(_held_partitions.get() | {(id(self), partition)})
+
+    @contextmanager
+    def _hold(self, partition: Hashable) -> Iterator[None]:
+        token = self._mark_held(partition)
+        try:
+            yield
+        finally:
+            _held_partitions.reset(token)
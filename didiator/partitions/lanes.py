@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import contextvars
+from typing import Any, TypeVar
+
+from didiator.interface.partitioner import KeyExtractors
+from didiator.partitions.base import BasePartitioner
+
+T = TypeVar("T")
+Item = tuple[Callable[[], Awaitable[Any]], asyncio.Future[Any], contextvars.Context]
+
+
+class _Lane:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[Item] = asyncio.Queue()
+        self.worker: asyncio.Task[None] | None = None
+
+
+class LanePartitioner(BasePartitioner):
+    def __init__(self, keys: KeyExtractors, lanes: int = 16, *, idle_timeout: float = 60.0) -> None:
+        super().__init__(keys)
+        self._lanes_count = lanes
+        self._idle_timeout = idle_timeout
+        self._lanes: dict[int, _Lane] = {}
+
+    @property
+    def lanes(self) -> int:
+        return self._lanes_count
+
+    @property
+    def active_lanes(self) -> int:
+        return len(self._lanes)
+
+    def get_lane(self, key: Hashable) -> int:
+        return hash(key) % self._lanes_count
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        index = self.get_lane(key)
+        if self._is_held(index):
+            return await func()
+
+        lane = self._lanes.get(index)
+        if lane is None:
+            lane = self._lanes[index] = _Lane()
+            lane.worker = asyncio.create_task(self._work(index, lane))
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        lane.queue.put_nowait((func, future, contextvars.copy_context()))
+        return await future
+
+    async def close(self) -> None:
+        lanes, self._lanes = self._lanes, {}
+        for lane in lanes.values():
+            if lane.worker is not None:
+                lane.worker.cancel()
+        await asyncio.gather(*(lane.worker for lane in lanes.values() if lane.worker), return_exceptions=True)
+
+    async def _work(self, index: int, lane: _Lane) -> None:
+        while True:
+            try:
+                func, future, context = await asyncio.wait_for(lane.queue.get(), self._idle_timeout)
+            except asyncio.TimeoutError:
+                # Idle lanes are stopped and started again by the next request
+                if lane.queue.empty():
+                    if self._lanes.get(index) is lane:
+                        del self._lanes[index]
+                    return
+                continue
+
+            if not future.done():
+                await self._execute(index, func, future, context)
+
+    async def _execute(
+        self, index: int, func: Callable[[], Awaitable[Any]], future: asyncio.Future[Any],
+        context: contextvars.Context,
+    ) -> None:
+        def start() -> asyncio.Future[Any]:
+            self._mark_held(index)
+            return asyncio.ensure_future(func())
+
+        # A request is executed in a separate task with the context of its caller,
+        # so it's cancelled together with the caller
+        task = context.run(start)
+        future.add_done_callback(lambda _: task.cancel() if future.cancelled() else None)
+        await asyncio.wait((task,))
+
+        if future.done():
+            return
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())  # type: ignore[arg-type]
+        else:
+            future.set_result(task.result())
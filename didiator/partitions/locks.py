@@ -0,0 +1,43 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from didiator.interface.partitioner import KeyExtractors
+from didiator.partitions.base import BasePartitioner
+
+T = TypeVar("T")
+
+
+class _KeyLock:
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class KeyLockPartitioner(BasePartitioner):
+    def __init__(self, keys: KeyExtractors) -> None:
+        super().__init__(keys)
+        self._locks: dict[Hashable, _KeyLock] = {}
+
+    @property
+    def active_keys(self) -> int:
+        return len(self._locks)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        if self._is_held(key):
+            return await func()
+
+        key_lock = self._locks.get(key)
+        if key_lock is None:
+            key_lock = self._locks[key] = _KeyLock()
+        key_lock.users += 1
+        try:
+            # asyncio.Lock wakes up waiters in FIFO order, so requests with the same key keep their order
+            async with key_lock.lock:
+                with self._hold(key):
+                    return await func()
+        finally:
+            key_lock.users -= 1
+            # Locks of idle keys are dropped at once, so memory depends only on the number of active keys
+            if not key_lock.users:
+                del self._locks[key]
@@ -0,0 +1,9 @@
+from .fair import FairScheduler, TenantMetrics
+from .priority import LaneMetrics, PriorityScheduler
+
+__all__ = (
+    "FairScheduler",
+    "TenantMetrics",
+    "LaneMetrics",
+    "PriorityScheduler",
+)
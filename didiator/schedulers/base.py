@@ -0,0 +1,44 @@
+import abc
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import contextvars
+from typing import Any
+
+from didiator.interface.entities.request import Request
+from didiator.interface.scheduler import Scheduler
+
+# Schedulers whose slot is held by the current task and tasks started by it
+_held_schedulers: contextvars.ContextVar[frozenset[int]] = contextvars.ContextVar(
+    "held_schedulers", default=frozenset(),
+)
+
+
+class BaseScheduler(Scheduler, abc.ABC):
+    @asynccontextmanager
+    async def slot(self, request: Request[Any], extra_data: dict[str, Any]) -> AsyncIterator[None]:
+        # Extra data of the scheduler isn't passed to handlers, even when the slot is already held
+        consumed = self._consume_extra_data(request, extra_data)
+
+        # Requests sent by a running handler use its slot, otherwise they could wait for it forever
+        if id(self) in _held_schedulers.get():
+            yield
+            return
+
+        ticket = await self._acquire(request, consumed)
+        token = _held_schedulers.set(_held_schedulers.get() | {id(self)})
+        try:
+            yield
+        finally:
+            _held_schedulers.reset(token)
+            self._release(ticket)
+
+    def _consume_extra_data(self, request: Request[Any], extra_data: dict[str, Any]) -> Any:
+        return extra_data
+
+    @abc.abstractmethod
+    async def _acquire(self, request: Request[Any], extra_data: Any) -> Any:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _release(self, ticket: Any) -> None:
+        raise NotImplementedError
@@ -0,0 +1,194 @@
+import asyncio
+from collections import deque, OrderedDict
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from didiator.interface.entities.request import Request
+from didiator.schedulers.base import BaseScheduler
+
+
+@dataclass(frozen=True)
+class TenantMetrics:
+    in_flight: int
+    waiting: int
+    started: int
+    total_delay: float
+    max_delay: float
+
+    @property
+    def average_delay(self) -> float:
+        return self.total_delay / self.started if self.started else 0.0
+
+
+class _DelayStats:
+    __slots__ = ("started", "total_delay", "max_delay")
+
+    def __init__(self) -> None:
+        self.started = 0
+        self.total_delay = 0.0
+        self.max_delay = 0.0
+
+
+class _Tenant:
+    def __init__(self, key: Hashable, weight: float, max_in_flight: int | None, stats: _DelayStats) -> None:
+        self.key = key
+        self.weight = weight
+        self.max_in_flight = max_in_flight
+        self.deficit = 0.0
+        self.is_active = False
+        self.in_flight = 0
+        self.waiting: deque[tuple[float, asyncio.Future[None]]] = deque()
+        self.stats = stats
+
+    @property
+    def is_capped(self) -> bool:
+        return self.max_in_flight is not None and self.in_flight >= self.max_in_flight
+
+
+class FairScheduler(BaseScheduler):
+    def __init__(
+        self, concurrency: int = 10,
+        *, key: str = "tenant_id", weights: Mapping[Hashable, float] | None = None, default_weight: float = 1.0,
+        max_in_flight: int | Mapping[Hashable, int] | None = None, max_tracked_tenants: int = 10_000,
+    ) -> None:
+        # A tenant without a positive weight never gets enough deficit to run a request
+        if default_weight <= 0 or any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError("Weights of tenants have to be positive")
+        self._concurrency = concurrency
+        self._key = key
+        self._weights = weights if weights is not None else {}
+        self._default_weight = default_weight
+        self._max_in_flight = max_in_flight
+        self._max_tracked_tenants = max_tracked_tenants
+
+        self._running = 0
+        self._tenants: dict[Hashable, _Tenant] = {}
+        # Tenants with waiting requests in the round robin order, the first one has the turn
+        self._active: deque[_Tenant] = deque()
+        self._turn_started = False
+        # Delays are kept after tenants are dropped, only for the recently started ones, so they are bounded too
+        self._stats: OrderedDict[Hashable, _DelayStats] = OrderedDict()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def metrics(self) -> dict[Hashable, TenantMetrics]:
+        metrics: dict[Hashable, TenantMetrics] = {}
+        for key in dict.fromkeys([*self._stats, *self._tenants]):
+            tenant = self._tenants.get(key)
+            if tenant is None:
+                stats = self._stats[key]
+                metrics[key] = TenantMetrics(0, 0, stats.started, stats.total_delay, stats.max_delay)
+                continue
+            stats = tenant.stats
+            metrics[key] = TenantMetrics(
+                tenant.in_flight, sum(not future.done() for _, future in tenant.waiting),
+                stats.started, stats.total_delay, stats.max_delay,
+            )
+        return metrics
+
+    async def _acquire(self, request: Request[Any], extra_data: dict[str, Any]) -> _Tenant:
+        tenant = self._get_tenant(extra_data.get(self._key))
+        if self._running < self._concurrency and not self._active and not tenant.is_capped:
+            self._start(tenant, 0.0)
+            return tenant
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        tenant.waiting.append((loop.time(), future))
+        if not tenant.is_active:
+            tenant.is_active = True
+            self._active.append(tenant)
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot could be already passed to the cancelled waiter
+            if future.done() and not future.cancelled():
+                self._release(tenant)
+            raise
+        return tenant
+
+    def _release(self, ticket: _Tenant) -> None:
+        self._running -= 1
+        ticket.in_flight -= 1
+        self._evict_idle(ticket)
+        self._dispatch()
+
+    def _get_tenant(self, key: Hashable) -> _Tenant:
+        tenant = self._tenants.get(key)
+        if tenant is None:
+            max_in_flight = self._max_in_flight
+            if isinstance(max_in_flight, Mapping):
+                max_in_flight = max_in_flight.get(key)
+            weight = self._weights.get(key, self._default_weight)
+            stats = self._stats.get(key) or _DelayStats()
+            tenant = self._tenants[key] = _Tenant(key, weight, max_in_flight, stats)
+        return tenant
+
+    def _evict_idle(self, tenant: _Tenant) -> None:
+        # Tenants are created per key, so idle ones are dropped to keep the scheduling state bounded
+        if not tenant.in_flight and not tenant.is_active and self._tenants.get(tenant.key) is tenant:
+            del self._tenants[tenant.key]
+
+    def _start(self, tenant: _Tenant, delay: float) -> None:
+        self._running += 1
+        tenant.in_flight += 1
+        stats = tenant.stats
+        stats.started += 1
+        stats.total_delay += delay
+        stats.max_delay = max(stats.max_delay, delay)
+        self._stats[tenant.key] = stats
+        self._stats.move_to_end(tenant.key)
+        if len(self._stats) > self._max_tracked_tenants:
+            self._stats.popitem(last=False)
+
+    def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._running < self._concurrency:
+            picked = self._pick()
+            if picked is None:
+                return
+            tenant, enqueued_at, future = picked
+            self._start(tenant, loop.time() - enqueued_at)
+            future.set_result(None)
+
+    def _pick(self) -> tuple[_Tenant, float, asyncio.Future[None]] | None:
+        # Deficit round robin: a tenant gets its weight as a quantum on each turn
+        # and runs a request for each whole unit of the deficit, unused deficit is kept while it's backlogged
+        while self._active:
+            if all(tenant.is_capped for tenant in self._active):
+                return None
+
+            tenant = self._active[0]
+            if tenant.is_capped:
+                self._end_turn()
+                continue
+            if not self._turn_started:
+                tenant.deficit += tenant.weight
+                self._turn_started = True
+
+            while tenant.waiting and tenant.waiting[0][1].done():
+                tenant.waiting.popleft()
+            if not tenant.waiting:
+                tenant.deficit = 0.0
+                tenant.is_active = False
+                self._active.popleft()
+                self._turn_started = False
+                self._evict_idle(tenant)
+                continue
+
+            if tenant.deficit >= 1:
+                tenant.deficit -= 1
+                enqueued_at, future = tenant.waiting.popleft()
+                return tenant, enqueued_at, future
+            self._end_turn()
+        return None
+
+    def _end_turn(self) -> None:
+        self._active.rotate(-1)
+        self._turn_started = False
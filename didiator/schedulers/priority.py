@@ -0,0 +1,97 @@
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+import heapq
+import itertools
+from typing import Any, Type
+
+from didiator.interface.entities.request import Request
+from didiator.schedulers.base import BaseScheduler
+
+DEFAULT_LANE = "default"
+
+
+@dataclass(frozen=True)
+class LaneMetrics:
+    concurrency: int
+    running: int
+    waiting: int
+
+
+class _Lane:
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self.running = 0
+        self.waiting: list[tuple[float, int, asyncio.Future[None]]] = []
+
+
+class PriorityScheduler(BaseScheduler):
+    def __init__(
+        self, budgets: int | Mapping[str, int] = 10,
+        *, lanes: Mapping[Type[Request[Any]], str] | None = None,
+        priorities: Mapping[Type[Request[Any]], int] | None = None,
+        priority_key: str = "priority", default_priority: int = 0, aging_rate: float = 1.0,
+    ) -> None:
+        if isinstance(budgets, int):
+            budgets = {DEFAULT_LANE: budgets}
+        self._lanes = lanes if lanes is not None else {}
+        missing_lanes = ({DEFAULT_LANE} | set(self._lanes.values())) - budgets.keys()
+        if missing_lanes:
+            raise ValueError(f"Concurrency budgets aren't set for lanes: {', '.join(sorted(missing_lanes))}")
+
+        self._lane_states = {name: _Lane(concurrency) for name, concurrency in budgets.items()}
+        self._priorities = priorities if priorities is not None else {}
+        self._priority_key = priority_key
+        self._default_priority = default_priority
+        self._aging_rate = aging_rate
+        self._counter = itertools.count()
+
+    @property
+    def metrics(self) -> dict[str, LaneMetrics]:
+        return {
+            name: LaneMetrics(
+                lane.concurrency, lane.running, sum(not future.done() for _, _, future in lane.waiting),
+            ) for name, lane in self._lane_states.items()
+        }
+
+    def get_priority(self, request: Request[Any], extra_data: Mapping[str, Any]) -> int:
+        priority = extra_data.get(self._priority_key)
+        if priority is None:
+            priority = self._priorities.get(type(request), self._default_priority)
+        return priority
+
+    def _consume_extra_data(self, request: Request[Any], extra_data: dict[str, Any]) -> int:
+        # The priority is consumed by the scheduler and isn't passed to the handler
+        priority = self.get_priority(request, extra_data)
+        extra_data.pop(self._priority_key, None)
+        return priority
+
+    async def _acquire(self, request: Request[Any], priority: int) -> _Lane:
+        lane = self._lane_states[self._lanes.get(type(request), DEFAULT_LANE)]
+
+        if lane.running < lane.concurrency and not lane.waiting:
+            lane.running += 1
+            return lane
+
+        # With linear aging the effective priority is priority + rate * (now - enqueued_at),
+        # so waiters ordered by rate * enqueued_at - priority keep their order at any moment
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(lane.waiting, (self._aging_rate * loop.time() - priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot could be already passed to the cancelled waiter
+            if future.done() and not future.cancelled():
+                self._release(lane)
+            raise
+        return lane
+
+    def _release(self, ticket: _Lane) -> None:
+        while ticket.waiting:
+            _, _, future = heapq.heappop(ticket.waiting)
+            if not future.done():
+                # The slot is passed to the waiter with the highest effective priority
+                future.set_result(None)
+                return
+        ticket.running -= 1
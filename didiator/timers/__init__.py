@@ -0,0 +1,10 @@
+from .commands import CommandTimers, Timer
+from .sqlite import SqliteTimerStorage
+from .wheel import TimingWheel
+
+__all__ = (
+    "CommandTimers",
+    "SqliteTimerStorage",
+    "Timer",
+    "TimingWheel",
+)
@@ -0,0 +1,200 @@
+import asyncio
+from datetime import datetime
+import logging
+import math
+import time
+from typing import Any
+import uuid
+
+from didiator.interface.entities.command import Command
+from didiator.interface.mediator import CommandMediator
+from didiator.interface.timers import StoredTimer, TimerStorage
+from didiator.interface.utils.serializer import Serializer
+from didiator.timers.wheel import TimingWheel, WheelEntry
+from didiator.utils.serializer import PickleSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class Timer(WheelEntry):
+    __slots__ = ("id", "command", "kwargs", "due", "interval")
+
+    def __init__(
+        self, timer_id: str, command: Command[Any], kwargs: dict[str, Any], due: float, interval: float | None,
+    ) -> None:
+        super().__init__()
+        self.id = timer_id
+        self.command = command
+        self.kwargs = kwargs
+        self.due = due
+        self.interval = interval
+
+    def __repr__(self) -> str:
+        return f"Timer(id={self.id!r}, command={self.command!r}, due={self.due!r}, interval={self.interval!r})"
+
+
+class CommandTimers:
+    def __init__(
+        self, mediator: CommandMediator,
+        *, resolution: float = 0.01, slots: int = 64, levels: int = 5,
+        storage: TimerStorage | None = None, serializer: Serializer | None = None,
+    ) -> None:
+        self._mediator = mediator
+        self._resolution = resolution
+        self._wheel: TimingWheel[Timer] = TimingWheel(slots=slots, levels=levels, start=self._to_tick(time.time()))
+        self._timers: dict[str, Timer] = {}
+        self._storage = storage
+
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+
+        self._wakeup: asyncio.Event | None = None
+        self._wakeup_tick: int | None = None
+        self._sending: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._timers)
+
+    def get(self, timer_id: str) -> Timer | None:
+        return self._timers.get(timer_id)
+
+    async def send_later(
+        self, command: Command[Any], delay: float, *, timer_id: str | None = None, **kwargs: Any,
+    ) -> Timer:
+        return await self._schedule(command, time.time() + delay, None, timer_id, kwargs)
+
+    async def send_at(
+        self, command: Command[Any], when: float | datetime, *, timer_id: str | None = None, **kwargs: Any,
+    ) -> Timer:
+        due = when.timestamp() if isinstance(when, datetime) else when
+        return await self._schedule(command, due, None, timer_id, kwargs)
+
+    async def send_every(
+        self, command: Command[Any], interval: float,
+        *, delay: float | None = None, timer_id: str | None = None, **kwargs: Any,
+    ) -> Timer:
+        if interval <= 0:
+            raise ValueError("Interval has to be positive")
+        due = time.time() + (delay if delay is not None else interval)
+        return await self._schedule(command, due, interval, timer_id, kwargs)
+
+    async def cancel(self, timer: Timer | str) -> bool:
+        timer_id = timer if isinstance(timer, str) else timer.id
+        scheduled = self._timers.get(timer_id)
+        if scheduled is None or (isinstance(timer, Timer) and scheduled is not timer):
+            return False
+
+        self._remove(scheduled)
+        if self._storage is not None:
+            await self._storage.delete([timer_id])
+        return True
+
+    async def restore(self) -> int:
+        # Timers that became due while the process wasn't running are sent right away
+        if self._storage is None:
+            return 0
+
+        restored = 0
+        for stored in await self._storage.load():
+            if stored.id in self._timers:
+                continue
+            command, kwargs = self._serializer.loads(stored.data)
+            self._add(Timer(stored.id, command, kwargs, stored.due, stored.interval))
+            restored += 1
+        return restored
+
+    async def run(self) -> None:
+        # Only one loop has to be run for the timers
+        await self.restore()
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                for timer in self._wheel.advance(self._to_tick(time.time())):
+                    self._fire(timer)
+
+                self._wakeup.clear()
+                self._wakeup_tick = self._wheel.next_tick()
+                if self._wakeup_tick is None:
+                    await self._wakeup.wait()
+                    continue
+                timeout = max(self._wakeup_tick * self._resolution - time.time(), 0.0)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+
+    async def close(self) -> None:
+        # Waits for commands that are being sent
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+
+    async def _schedule(
+        self, command: Command[Any], due: float, interval: float | None, timer_id: str | None, kwargs: dict[str, Any],
+    ) -> Timer:
+        timer = Timer(timer_id if timer_id is not None else uuid.uuid4().hex, command, kwargs, due, interval)
+        if self._storage is not None:
+            await self._storage.save([self._to_stored(timer)])
+
+        # A timer with the same id is replaced
+        replaced = self._timers.get(timer.id)
+        if replaced is not None:
+            self._remove(replaced)
+        self._add(timer)
+        return timer
+
+    def _add(self, timer: Timer) -> None:
+        # The timer is sent on the first tick that starts after its due time
+        timer.deadline = math.ceil(timer.due / self._resolution)
+        self._wheel.schedule(timer)
+        self._timers[timer.id] = timer
+        if self._wakeup is not None and (self._wakeup_tick is None or timer.deadline < self._wakeup_tick):
+            self._wakeup.set()
+
+    def _remove(self, timer: Timer) -> None:
+        self._wheel.cancel(timer)
+        del self._timers[timer.id]
+
+    def _fire(self, timer: Timer) -> None:
+        stored: StoredTimer | None = None
+        if timer.interval is None:
+            del self._timers[timer.id]
+        else:
+            # Runs that were missed are skipped, a periodic timer keeps its phase
+            now = time.time()
+            timer.due += timer.interval * max(math.ceil((now - timer.due) / timer.interval), 1)
+            self._add(timer)
+            stored = self._to_stored(timer)
+
+        task = asyncio.create_task(self._send(timer, timer.command, timer.kwargs, stored))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(
+        self, timer: Timer, command: Command[Any], kwargs: dict[str, Any], stored: StoredTimer | None,
+    ) -> None:
+        try:
+            await self._mediator.send(command, **kwargs)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Scheduled %s command failed", type(command).__name__)
+
+        # A one-off timer is deleted after its command is sent, so it's sent again if the process is stopped earlier.
+        # Timers cancelled or replaced meanwhile are already updated in the storage
+        if self._storage is None:
+            return
+        try:
+            if stored is None and timer.id not in self._timers:
+                await self._storage.delete([timer.id])
+            elif stored is not None and self._timers.get(timer.id) is timer:
+                await self._storage.save([stored])
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Timer %s can't be updated in the storage", timer.id)
+
+    def _to_stored(self, timer: Timer) -> StoredTimer:
+        return StoredTimer(timer.id, timer.due, timer.interval, self._serializer.dumps((timer.command, timer.kwargs)))
+
+    def _to_tick(self, timestamp: float) -> int:
+        return math.floor(timestamp / self._resolution)
@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import Sequence
+import os
+import sqlite3
+
+from didiator.interface.timers import StoredTimer, TimerStorage
+from didiator.utils.sqlite import SqliteRunner
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timers (
+    id TEXT PRIMARY KEY,
+    due REAL NOT NULL,
+    interval REAL,
+    data BLOB NOT NULL
+);
+"""
+
+# A timer to save or an id of a timer to delete
+Change = StoredTimer | str
+
+
+class SqliteTimerStorage(TimerStorage):
+    def __init__(self, path: str | os.PathLike[str], *, synchronous: str = "NORMAL") -> None:
+        self._runner = SqliteRunner(path, SCHEMA, synchronous=synchronous, thread_name_prefix="didiator-timers")
+
+        self._buffer: list[Change] = []
+        self._waiters: list[asyncio.Future[None]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def save(self, timers: Sequence[StoredTimer]) -> None:
+        await self._write(timers)
+
+    async def delete(self, timer_ids: Sequence[str]) -> None:
+        await self._write(timer_ids)
+
+    async def load(self) -> list[StoredTimer]:
+        return await self._runner.run(self._select)
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._runner.close()
+
+    async def _write(self, changes: Sequence[Change]) -> None:
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._buffer.extend(changes)
+        self._waiters.append(waiter)
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        await waiter
+
+    async def _flush(self) -> None:
+        # Changes made while a transaction is committed are written by the next one,
+        # so timers scheduled concurrently share one commit
+        try:
+            while self._buffer:
+                buffer, waiters = self._buffer, self._waiters
+                self._buffer, self._waiters = [], []
+                try:
+                    await self._runner.run(self._apply, buffer)
+                except Exception as err:  # pylint: disable=broad-except
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(err)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+        finally:
+            self._flush_task = None
+
+    @staticmethod
+    def _apply(connection: sqlite3.Connection, changes: list[Change]) -> None:
+        with connection:
+            connection.execute("BEGIN")
+            for change in changes:
+                if isinstance(change, str):
+                    connection.execute("DELETE FROM timers WHERE id = ?", (change,))
+                else:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO timers (id, due, interval, data) VALUES (?, ?, ?, ?)",
+                        (change.id, change.due, change.interval, change.data),
+                    )
+
+    @staticmethod
+    def _select(connection: sqlite3.Connection) -> list[StoredTimer]:
+        rows = connection.execute("SELECT id, due, interval, data FROM timers ORDER BY due").fetchall()
+        return [StoredTimer(timer_id, due, interval, data) for timer_id, due, interval, data in rows]
@@ -0,0 +1,122 @@
+from collections.abc import Iterator
+from typing import Generic, TypeVar
+
+
+class WheelEntry:
+    __slots__ = ("deadline", "_bucket")
+
+    def __init__(self, deadline: int = 0) -> None:
+        self.deadline = deadline
+        self._bucket: dict["WheelEntry", None] | None = None
+
+    @property
+    def scheduled(self) -> bool:
+        return self._bucket is not None
+
+
+T = TypeVar("T", bound=WheelEntry)
+
+
+class TimingWheel(Generic[T]):
+    def __init__(self, *, slots: int = 64, levels: int = 5, start: int = 0) -> None:
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError("Number of slots has to be a power of two")
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = levels
+        # A level covers ``slots`` times more ticks than the previous one
+        self._spans = [slots ** (level + 1) for level in range(levels)]
+        self._wheels: list[list[dict[T, None]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        # Entries beyond the last level are placed again when the last level turns around
+        self._overflow: dict[T, None] = {}
+        self._current = start
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def current(self) -> int:
+        return self._current
+
+    def schedule(self, entry: T) -> None:
+        if entry.scheduled:
+            raise ValueError("Entry is already scheduled")
+        # Entries that are already due expire on the next tick
+        self._place(entry, self._current + 1)
+        self._count += 1
+
+    def cancel(self, entry: T) -> bool:
+        bucket = entry._bucket  # pylint: disable=protected-access
+        if bucket is None:
+            return False
+        del bucket[entry]
+        entry._bucket = None  # pylint: disable=protected-access
+        self._count -= 1
+        return True
+
+    def advance(self, to: int) -> list[T]:
+        expired: list[T] = []
+        while self._current < to:
+            if not self._count:
+                # Nothing is scheduled, so idle ticks are skipped
+                self._current = to
+                break
+
+            self._current += 1
+            if not self._current & self._mask:
+                self._cascade()
+            expired.extend(self._expire(self._wheels[0][self._current & self._mask]))
+        return expired
+
+    def next_tick(self) -> int | None:
+        # The tick of the nearest entry of the first level or of the next cascade,
+        # nothing can expire before it
+        if not self._count:
+            return None
+        tick = self._current + 1
+        while tick & self._mask:
+            if self._wheels[0][tick & self._mask]:
+                return tick
+            tick += 1
+        return tick
+
+    def __iter__(self) -> Iterator[T]:
+        for wheel in self._wheels:
+            for bucket in wheel:
+                yield from bucket
+        yield from self._overflow
+
+    def _place(self, entry: T, earliest: int) -> None:
+        deadline = max(entry.deadline, earliest)
+        delta = deadline - self._current
+        for level, span in enumerate(self._spans):
+            if delta < span:
+                bucket = self._wheels[level][(deadline >> (self._bits * level)) & self._mask]
+                break
+        else:
+            bucket = self._overflow
+        bucket[entry] = None
+        entry._bucket = bucket  # type: ignore[assignment]  # pylint: disable=protected-access
+
+    def _cascade(self) -> None:
+        for level in range(1, self._levels):
+            self._replace(self._wheels[level][(self._current >> (self._bits * level)) & self._mask])
+            if (self._current >> (self._bits * level)) & self._mask:
+                return
+        self._replace(self._overflow)
+
+    def _replace(self, bucket: dict[T, None]) -> None:
+        entries = list(bucket)
+        bucket.clear()
+        # Cascading happens before the current tick is expired, so entries due now are placed into it
+        for entry in entries:
+            self._place(entry, self._current)
+
+    def _expire(self, bucket: dict[T, None]) -> list[T]:
+        entries = list(bucket)
+        bucket.clear()
+        for entry in entries:
+            entry._bucket = None  # pylint: disable=protected-access
+        self._count -= len(entries)
+        return entries
@@ -0,0 +1,9 @@
+from .client import SocketTransport
+from .handler import remote_handler
+from .server import HandlerHost
+
+__all__ = (
+    "HandlerHost",
+    "SocketTransport",
+    "remote_handler",
+)
@@ -0,0 +1,83 @@
+import asyncio
+from types import TracebackType
+from typing import Any, Type, TypeVar
+
+from didiator.interface.transport import Transport
+from didiator.interface.utils.serializer import Serializer
+from didiator.transport.connection import StreamConnection
+from didiator.utils.serializer import PickleSerializer
+
+Self = TypeVar("Self", bound="SocketTransport")
+
+
+class SocketTransport(Transport):
+    def __init__(
+        self, host: str | None = None, port: int | None = None, *, path: str | None = None,
+        max_connections: int = 4, max_pipelined: int = 64, timeout: float | None = None,
+        serializer: Serializer | None = None,
+    ) -> None:
+        if (path is None) == (host is None or port is None):
+            raise ValueError("Either host and port or path must be passed")
+        self._host = host
+        self._port = port
+        self._path = path
+        self._max_connections = max_connections
+        self._max_pipelined = max_pipelined
+        self._timeout = timeout
+
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+
+        self._connections: list[StreamConnection] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def connections(self) -> int:
+        return len(self._connections)
+
+    async def request(
+        self, method: str, request: Any, args: tuple[Any, ...] = (), kwargs: dict[str, Any] | None = None,
+        *, timeout: float | None = None,
+    ) -> Any:
+        connection = await self._get_connection()
+        return await connection.request(
+            method, request, args, kwargs, timeout=timeout if timeout is not None else self._timeout,
+        )
+
+    async def close(self) -> None:
+        connections, self._connections = self._connections, []
+        await asyncio.gather(*(connection.close() for connection in connections))
+
+    async def _get_connection(self) -> StreamConnection:
+        self._connections = [connection for connection in self._connections if not connection.closed]
+
+        # Requests are pipelined over the least loaded connection,
+        # a new one is opened only when all connections are busy enough
+        connection = min(self._connections, key=lambda conn: conn.pending, default=None)
+        if connection is not None and (
+            connection.pending < self._max_pipelined or len(self._connections) >= self._max_connections
+        ):
+            return connection
+
+        async with self._lock:
+            if len(self._connections) >= self._max_connections:
+                return min(self._connections, key=lambda conn: conn.pending)
+            connection = await self._connect()
+            self._connections.append(connection)
+            return connection
+
+    async def _connect(self) -> StreamConnection:
+        if self._path is not None:
+            reader, writer = await asyncio.open_unix_connection(self._path)
+        else:
+            reader, writer = await asyncio.open_connection(self._host, self._port)
+        return StreamConnection(reader, writer, self._serializer)
+
+    async def __aenter__(self: Self) -> Self:
+        return self
+
+    async def __aexit__(
+        self, exc_type: Type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
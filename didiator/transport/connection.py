@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+import logging
+from typing import Any
+
+from didiator.interface.exceptions import ConnectionLost, RemoteHandlerError, RequestTimeout
+from didiator.interface.utils.serializer import Serializer
+from didiator.transport.protocol import Message, RESPONSE_ID
+from didiator.utils.framing import read_frame, write_frame
+
+logger = logging.getLogger(__name__)
+
+
+class StreamConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, serializer: Serializer) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._serializer = serializer
+        self._message_ids = itertools.count()
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._closed = False
+        self._reading_task = asyncio.create_task(self._read_responses())
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def request(
+        self, method: str, request: Any, args: tuple[Any, ...] = (), kwargs: dict[str, Any] | None = None,
+        *, timeout: float | None = None,
+    ) -> Any:
+        if self._closed:
+            raise ConnectionLost("Connection is closed")
+
+        # Responses are matched to requests by the message id, so requests don't wait for each other
+        message_id = next(self._message_ids)
+        message: Message = (message_id, method, request, args, kwargs or {})
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            write_frame(self._writer, self._serializer.dumps(message))
+            await self._writer.drain()
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError as err:
+            raise RequestTimeout(f"{type(request).__name__} request timed out after {timeout}s") from err
+        except ConnectionError as err:
+            raise ConnectionLost(str(err)) from err
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            try:
+                write_frame(self._writer, self._serializer.dumps(None))
+                await self._writer.drain()
+            except ConnectionError:
+                pass
+        await self._reading_task
+        self._writer.close()
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                frame = await read_frame(self._reader)
+                (message_id,) = RESPONSE_ID.unpack_from(frame)
+                future = self._pending.get(message_id)
+                try:
+                    _, is_ok, res = self._serializer.loads(frame[RESPONSE_ID.size:])
+                except Exception as err:  # pylint: disable=broad-except
+                    is_ok, res = False, RemoteHandlerError(f"Response can't be decoded: {err!r}")
+                    res.__cause__ = err
+                if future is None or future.done():
+                    continue
+                if is_ok:
+                    future.set_result(res)
+                else:
+                    future.set_exception(res)
+        except (asyncio.IncompleteReadError, ConnectionError) as err:
+            self._fail_pending(err)
+        except Exception as err:  # pylint: disable=broad-except
+            # Requests mustn't wait forever for responses that won't be read
+            logger.error("Responses can't be read from the connection", exc_info=True)
+            self._fail_pending(err)
+            self._writer.close()
+
+    def _fail_pending(self, cause: BaseException) -> None:
+        self._closed = True
+        for future in self._pending.values():
+            if not future.done():
+                err = ConnectionLost("Connection is lost")
+                err.__cause__ = cause
+                future.set_exception(err)
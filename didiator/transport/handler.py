@@ -0,0 +1,43 @@
+from collections.abc import Callable, Collection
+import inspect
+from typing import Any, Type, TypeVar
+
+from didiator.interface.entities.command import Command
+from didiator.interface.entities.event import Event
+from didiator.interface.entities.query import Query
+from didiator.interface.entities.request import Request
+from didiator.interface.transport import Transport
+
+R = TypeVar("R", bound=Request[Any])
+
+
+def get_remote_method(request_type: Type[Request[Any]]) -> str:
+    if issubclass(request_type, Command):
+        return "send"
+    if issubclass(request_type, Query):
+        return "query"
+    if issubclass(request_type, Event):
+        return "publish"
+    raise TypeError(f"{request_type.__qualname__} can't be handled remotely")
+
+
+def remote_handler(
+    request_type: Type[R], transport: Transport,
+    *, timeout: float | None = None, forward_kwargs: Collection[str] = (),
+) -> Callable[..., Any]:
+    method = get_remote_method(request_type)
+
+    async def wrapper(request: R, *args: Any, **kwargs: Any) -> Any:
+        # Extra arguments like DI state can't be sent to a remote host, only the listed ones are forwarded
+        remote_kwargs = {key: val for key, val in kwargs.items() if key in forward_kwargs}
+        if method == "publish":
+            return await transport.request(method, (request,), (), remote_kwargs, timeout=timeout)
+        return await transport.request(method, request, (), remote_kwargs, timeout=timeout)
+
+    wrapper.__name__ = wrapper.__qualname__ = f"remote_{request_type.__name__}_handler"
+    # DI has to inject only the request into the wrapper
+    wrapper.__signature__ = inspect.Signature([  # type: ignore[attr-defined]
+        inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=request_type),
+    ])
+    wrapper.__annotations__ = {"request": request_type}
+    return wrapper
@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import AsyncIterator
+import pickle
+import struct
+from typing import Any
+
+from didiator.interface.exceptions import RemoteHandlerError
+from didiator.interface.mediator import Mediator
+from didiator.interface.utils.serializer import Serializer
+from didiator.utils.framing import read_frame, write_frame
+
+# Messages are tuples: (message_id, method, request, args, kwargs) to a host
+# and (message_id, is_ok, result or exception) from it. None closes the connection
+Message = tuple[int, str, Any, tuple[Any, ...], dict[str, Any]]
+Response = tuple[int, bool, Any]
+# Responses are prefixed with their message id, so a response that can't be decoded fails only its request
+RESPONSE_ID = struct.Struct("!Q")
+
+METHODS = frozenset(("send", "query", "publish"))
+# Streams are pulled in chunks: ``stream`` opens a stream and returns its id,
+# ``stream_next`` with (stream_id, max_items) returns (items, is_done) and ``stream_close`` closes it
+STREAM_METHODS = frozenset(("stream", "stream_next", "stream_close"))
+
+
+async def serve_connection(
+    mediator: Mediator, serializer: Serializer, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+) -> None:
+    # Messages are handled concurrently, so many requests can be pipelined over one connection
+    tasks: set[asyncio.Task[None]] = set()
+    streams: dict[int, AsyncIterator[Any]] = {}
+    try:
+        while True:
+            try:
+                message: Message | None = serializer.loads(await read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            if message is None:
+                break
+
+            task = asyncio.create_task(handle_message(mediator, message, serializer, writer, streams))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        # Streams that weren't read till the end by a peer are closed with its connection
+        for stream in streams.values():
+            await _close_stream(stream)
+        writer.close()
+
+
+async def handle_message(
+    mediator: Mediator, message: Message, serializer: Serializer, writer: asyncio.StreamWriter,
+    streams: dict[int, AsyncIterator[Any]] | None = None,
+) -> None:
+    message_id, method, request, args, kwargs = message
+    response: Response
+    try:
+        if method in STREAM_METHODS and streams is not None:
+            res = await _handle_stream(mediator, message, streams)
+        elif method in METHODS:
+            res = await getattr(mediator, method)(request, *args, **kwargs)
+        else:
+            raise ValueError(f"Unknown mediator method: {method}")
+        response = message_id, True, res
+    except Exception as err:  # pylint: disable=broad-except
+        response = message_id, False, err
+
+    try:
+        data = serializer.dumps(response)
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        data = serializer.dumps((message_id, False, RemoteHandlerError(
+            f"Result of {type(request).__name__} request can't be sent back: {response[2]!r}, {err}",
+        )))
+    write_frame(writer, RESPONSE_ID.pack(message_id) + data)
+    await writer.drain()
+
+
+async def _handle_stream(mediator: Mediator, message: Message, streams: dict[int, AsyncIterator[Any]]) -> Any:
+    message_id, method, request, args, kwargs = message
+    if method == "stream":
+        streams[message_id] = mediator.stream(request, *args, **kwargs)
+        return message_id
+
+    if method == "stream_close":
+        stream = streams.pop(request, None)
+        if stream is not None:
+            await _close_stream(stream)
+        return None
+
+    stream_id, max_items = request
+    try:
+        stream = streams[stream_id]
+    except KeyError as err:
+        raise ValueError(f"Stream {stream_id} isn't open") from err
+
+    items: list[Any] = []
+    try:
+        while len(items) < max_items:
+            items.append(await anext(stream))
+    except StopAsyncIteration:
+        del streams[stream_id]
+        return items, True
+    except Exception:
+        del streams[stream_id]
+        await _close_stream(stream)
+        raise
+    return items, False
+
+
+async def _close_stream(stream: AsyncIterator[Any]) -> None:
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        await aclose()
@@ -0,0 +1,68 @@
+import asyncio
+from types import TracebackType
+from typing import Type, TypeVar
+
+from didiator.interface.mediator import Mediator
+from didiator.interface.utils.serializer import Serializer
+from didiator.transport.protocol import serve_connection
+from didiator.utils.serializer import PickleSerializer
+
+Self = TypeVar("Self", bound="HandlerHost")
+
+
+class HandlerHost:
+    def __init__(self, mediator: Mediator, *, serializer: Serializer | None = None) -> None:
+        self._mediator = mediator
+        # Pickle runs code from loaded frames, so it's used by default only for Unix sockets
+        self._is_default_serializer = serializer is None
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+        self._servers: list[asyncio.AbstractServer] = []
+        self._connections: set[asyncio.Task[None]] = set()
+
+    @property
+    def mediator(self) -> Mediator:
+        return self._mediator
+
+    async def serve_tcp(self, host: str | None = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        if self._is_default_serializer:
+            raise ValueError(
+                "TCP host needs an explicit serializer, the default one unpickles frames of any peer",
+            )
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self._servers.append(server)
+        return server
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        server = await asyncio.start_unix_server(self._handle_connection, path)
+        self._servers.append(server)
+        return server
+
+    async def close(self) -> None:
+        servers, self._servers = self._servers, []
+        for server in servers:
+            server.close()
+        for task in tuple(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in servers:
+            await server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            await serve_connection(self._mediator, self._serializer, reader, writer)
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+
+    async def __aenter__(self: Self) -> Self:
+        return self
+
+    async def __aexit__(
+        self, exc_type: Type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
@@ -0,0 +1,14 @@
+import asyncio
+import struct
+
+FRAME_HEADER = struct.Struct("!I")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    header = await reader.readexactly(FRAME_HEADER.size)
+    (size,) = FRAME_HEADER.unpack(header)
+    return await reader.readexactly(size)
+
+
+def write_frame(writer: asyncio.StreamWriter, data: bytes) -> None:
+    writer.writelines((FRAME_HEADER.pack(len(data)), data))
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    backoff: float = 0.5
+    multiplier: float = 2.0
+    max_backoff: float = 60.0
+
+    def get_delay(self, attempts: int) -> float:
+        return min(self.backoff * self.multiplier ** (attempts - 1), self.max_backoff)
+
+    def is_exhausted(self, attempts: int) -> bool:
+        return attempts >= self.max_attempts
@@ -0,0 +1,15 @@
+import pickle
+from typing import Any
+
+from didiator.interface.utils.serializer import Serializer
+
+
+class PickleSerializer(Serializer):
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> None:
+        self._protocol = protocol
+
+    def dumps(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, protocol=self._protocol)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
@@ -0,0 +1,23 @@
+from collections.abc import Callable
+import functools
+import inspect
+import types
+import typing
+from typing import Any
+
+
+def copy_signature(wrapper: Callable[..., Any], wrapped: Callable[..., Any]) -> None:
+    # DI unwraps ``__wrapped__`` and would call the wrapped callable directly,
+    # so the signature and resolved annotations are copied to the wrapper instead
+    functools.update_wrapper(wrapper, wrapped, updated=())
+    del wrapper.__wrapped__  # type: ignore[attr-defined]
+    wrapper.__signature__ = inspect.signature(wrapped)  # type: ignore[attr-defined]
+    wrapper.__annotations__ = typing.get_type_hints(_get_annotated_callable(wrapped), include_extras=True)
+
+
+def _get_annotated_callable(func: Callable[..., Any]) -> Callable[..., Any]:
+    if isinstance(func, functools.partial):
+        return _get_annotated_callable(func.func)
+    if isinstance(func, (types.FunctionType, types.MethodType)):
+        return func
+    return func.__call__  # type: ignore[operator,no-any-return]
@@ -0,0 +1,49 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sqlite3
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SqliteRunner:
+    def __init__(
+        self, path: str | os.PathLike[str], schema: str,
+        *, synchronous: str = "FULL", thread_name_prefix: str = "didiator-sqlite",
+    ) -> None:
+        self._path = path
+        self._schema = schema
+        self._synchronous = synchronous
+        # SQLite calls are blocking, so all of them are executed sequentially in one thread
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=thread_name_prefix)
+        self._connection: sqlite3.Connection | None = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, *args)
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+
+    def _call(self, func: Callable[..., T], *args: Any) -> T:
+        return func(self._get_connection(), *args)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self._path, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self._synchronous}")
+            connection.executescript(self._schema)
+            self._connection = connection
+        return self._connection
+
+    def _close(self) -> None:
+        # A runner that wasn't used doesn't open a connection to close it
+        if self._connection is None:
+            return
+        self._connection.close()
+        self._connection = None
@@ -0,0 +1,11 @@
+from .mediator import ProcessMediatorImpl
+from .pool import WorkerPool
+from .routers import ConsistentHashRouter, RoundRobinRouter, Router
+
+__all__ = (
+    "ProcessMediatorImpl",
+    "WorkerPool",
+    "Router",
+    "RoundRobinRouter",
+    "ConsistentHashRouter",
+)
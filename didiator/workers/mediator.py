@@ -0,0 +1,142 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Hashable, Mapping, Sequence
+from concurrent.futures import Executor
+from typing import Any, Type, TypeVar
+
+from didiator.interface.entities.command import Command
+from didiator.interface.entities.event import Event
+from didiator.interface.entities.query import Query
+from didiator.interface.entities.stream_query import StreamQuery
+from didiator.interface.handlers.command import CommandHandlerType
+from didiator.interface.handlers.event import BatchEventHandlerType, EventHandlerType
+from didiator.interface.handlers.query import QueryHandlerType
+from didiator.interface.handlers.stream_query import StreamQueryHandlerType
+from didiator.interface.mediator import Mediator
+from didiator.interface.observers.stream import StreamMetrics
+from didiator.observers.stream import publish_stream
+from didiator.workers.pool import WorkerPool
+from didiator.workers.routers import RoundRobinRouter, Router
+
+C = TypeVar("C", bound=Command[Any])
+CRes = TypeVar("CRes")
+Q = TypeVar("Q", bound=Query[Any])
+QRes = TypeVar("QRes")
+SQ = TypeVar("SQ", bound=StreamQuery[Any])
+E = TypeVar("E", bound=Event)
+
+
+class ProcessMediatorImpl(Mediator):
+    def __init__(
+        self, pool: WorkerPool, router: Router | None = None,
+        *, extra_data: dict[str, Any] | None = None, stream_chunk_size: int = 64,
+    ) -> None:
+        if stream_chunk_size < 1:
+            raise ValueError("Stream chunk size has to be positive")
+        self._pool = pool
+        if router is None:
+            router = RoundRobinRouter()
+        self._router = router
+        self._extra_data = extra_data if extra_data is not None else {}
+        self._stream_chunk_size = stream_chunk_size
+
+    @property
+    def extra_data(self) -> dict[str, Any]:
+        return self._extra_data
+
+    @property
+    def pool(self) -> WorkerPool:
+        return self._pool
+
+    def bind(self, **extra_data: Any) -> "ProcessMediatorImpl":
+        return ProcessMediatorImpl(
+            self._pool, self._router,
+            extra_data=self._extra_data | extra_data, stream_chunk_size=self._stream_chunk_size,
+        )
+
+    def unbind(self, *keys: str) -> "ProcessMediatorImpl":
+        extra_data = {key: val for key, val in self._extra_data.items() if key not in keys}
+        return ProcessMediatorImpl(
+            self._pool, self._router, extra_data=extra_data, stream_chunk_size=self._stream_chunk_size,
+        )
+
+    def register_command_handler(
+        self, command: Type[C], handler: CommandHandlerType[C, CRes], *, executor: Executor | None = None,
+    ) -> None:
+        self._pool.register("register_command_handler", command, handler, executor=executor)
+
+    def register_query_handler(
+        self, query: Type[Q], handler: QueryHandlerType[Q, QRes], *, executor: Executor | None = None,
+    ) -> None:
+        self._pool.register("register_query_handler", query, handler, executor=executor)
+
+    def register_stream_query_handler(self, query: Type[SQ], handler: StreamQueryHandlerType[SQ, QRes]) -> None:
+        self._pool.register("register_stream_query_handler", query, handler)
+
+    def register_event_handler(
+        self, event: Type[E], handler: EventHandlerType[E],
+        *, executor: Executor | None = None, where: Mapping[str, Hashable] | None = None,
+    ) -> None:
+        self._pool.register("register_event_handler", event, handler, executor=executor, where=where)
+
+    def register_batch_event_handler(
+        self, event: Type[E], handler: BatchEventHandlerType[E],
+        *, max_batch_size: int | None = None, max_delay: float | None = None, executor: Executor | None = None,
+    ) -> None:
+        self._pool.register(
+            "register_batch_event_handler", event, handler,
+            max_batch_size=max_batch_size, max_delay=max_delay, executor=executor,
+        )
+
+    async def send(self, command: Command[CRes], *args: Any, **kwargs: Any) -> CRes:
+        kwargs = self._extra_data | kwargs
+        res: CRes = await self._pool.call(self._route(command), "send", command, args, kwargs)
+        return res
+
+    async def query(self, query: Query[QRes], *args: Any, **kwargs: Any) -> QRes:
+        kwargs = self._extra_data | kwargs
+        res: QRes = await self._pool.call(self._route(query), "query", query, args, kwargs)
+        return res
+
+    async def stream(self, query: StreamQuery[QRes], *args: Any, **kwargs: Any) -> AsyncIterator[QRes]:
+        # Items are pulled from the worker in chunks, the next chunk is requested when the previous one is consumed
+        kwargs = self._extra_data | kwargs
+        worker_index = self._route(query)
+        stream_id = await self._pool.call(worker_index, "stream", query, args, kwargs)
+        is_done = False
+        try:
+            while not is_done:
+                items, is_done = await self._pool.call(
+                    worker_index, "stream_next", (stream_id, self._stream_chunk_size), (), {},
+                )
+                for item in items:
+                    yield item
+        finally:
+            if not is_done:
+                await self._pool.call(worker_index, "stream_close", stream_id, (), {})
+
+    async def publish(self, events: Event | Sequence[Event], *args: Any, **kwargs: Any) -> None:
+        if isinstance(events, Event):
+            events = (events,)
+        kwargs = self._extra_data | kwargs
+
+        # Events with the same routing key are published to the same worker and keep their order
+        events_by_worker: dict[int, list[Event]] = {}
+        for event in events:
+            events_by_worker.setdefault(self._route(event), []).append(event)
+        await asyncio.gather(*(
+            self._pool.call(worker_index, "publish", worker_events, args, kwargs)
+            for worker_index, worker_events in events_by_worker.items()
+        ))
+
+    async def publish_stream(
+        self, events: AsyncIterable[Event], *args: Any,
+        read_ahead: int = 128, concurrency: int = 1, key: Callable[[Any], Hashable] | None = None,
+        on_error: Callable[[Event, Exception], Any] | None = None, **kwargs: Any,
+    ) -> StreamMetrics:
+        return await publish_stream(
+            self.publish, events, *args,
+            read_ahead=read_ahead, concurrency=concurrency, key=key, on_error=on_error, **kwargs,
+        )
+
+    def _route(self, request: Any) -> int:
+        return self._router.route(request, self._pool.workers)
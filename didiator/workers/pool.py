@@ -0,0 +1,95 @@
+import asyncio
+import multiprocessing
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+import os
+import socket
+from types import TracebackType
+from typing import Any, Type, TypeVar
+
+from didiator.interface.exceptions import WorkerError
+from didiator.interface.utils.serializer import Serializer
+from didiator.transport.connection import StreamConnection
+from didiator.utils.serializer import PickleSerializer
+from didiator.workers.worker import MediatorFactory, Registration, run_worker
+
+Self = TypeVar("Self", bound="WorkerPool")
+
+
+class _Worker:
+    def __init__(self, process: BaseProcess, connection: StreamConnection) -> None:
+        self.process = process
+        self.connection = connection
+
+
+class WorkerPool:
+    def __init__(
+        self, mediator_factory: MediatorFactory, workers: int | None = None,
+        *, serializer: Serializer | None = None, mp_context: BaseContext | None = None,
+    ) -> None:
+        self._mediator_factory = mediator_factory
+        self._workers_count = workers if workers is not None else os.cpu_count() or 1
+
+        if serializer is None:
+            serializer = PickleSerializer()
+        self._serializer = serializer
+
+        if mp_context is None:
+            mp_context = multiprocessing.get_context("spawn")
+        self._mp_context = mp_context
+
+        self._registrations: list[Registration] = []
+        self._workers: list[_Worker] = []
+
+    @property
+    def workers(self) -> int:
+        return self._workers_count
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def register(self, method: str, *args: Any, **kwargs: Any) -> None:
+        # Registrations are replayed on the mediator of each worker when it's started
+        if self.started:
+            raise WorkerError("Handlers can't be registered after the worker pool is started")
+        self._registrations.append((method, args, kwargs))
+
+    async def start(self) -> None:
+        for _ in range(self._workers_count):
+            parent_sock, child_sock = socket.socketpair()
+            process = self._mp_context.Process(  # type: ignore[attr-defined]
+                target=run_worker,
+                args=(child_sock, self._mediator_factory, self._registrations, self._serializer),
+                daemon=True,
+            )
+            process.start()
+            child_sock.close()
+
+            reader, writer = await asyncio.open_connection(sock=parent_sock)
+            self._workers.append(_Worker(process, StreamConnection(reader, writer, self._serializer)))
+
+    async def close(self) -> None:
+        workers, self._workers = self._workers, []
+        await asyncio.gather(*(worker.connection.close() for worker in workers))
+
+        loop = asyncio.get_running_loop()
+        for worker in workers:
+            await loop.run_in_executor(None, worker.process.join)
+
+    async def call(
+        self, worker_index: int, method: str, request: Any, args: tuple[Any, ...], kwargs: dict[str, Any],
+    ) -> Any:
+        if not self.started:
+            raise WorkerError("Worker pool isn't started")
+
+        return await self._workers[worker_index].connection.request(method, request, args, kwargs)
+
+    async def __aenter__(self: Self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self, exc_type: Type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
@@ -0,0 +1,61 @@
+import bisect
+from collections.abc import Hashable
+import hashlib
+import itertools
+from typing import Any, Protocol
+
+from didiator.interface.entities.request import Request
+from didiator.interface.partitioner import KeyExtractors
+
+
+class Router(Protocol):
+    def route(self, request: Request[Any], workers: int) -> int:
+        raise NotImplementedError
+
+
+class RoundRobinRouter(Router):
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def route(self, request: Request[Any], workers: int) -> int:
+        return next(self._counter) % workers
+
+
+def stable_hash(key: Hashable) -> int:
+    # Built-in ``hash`` of strings is randomized per process, so it can't be used for routing
+    return int.from_bytes(hashlib.blake2b(repr(key).encode(), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRouter(Router):
+    def __init__(
+        self, keys: KeyExtractors, *, fallback: Router | None = None, virtual_nodes: int = 64,
+    ) -> None:
+        self._keys = keys
+        if fallback is None:
+            fallback = RoundRobinRouter()
+        self._fallback = fallback
+        self._virtual_nodes = virtual_nodes
+        self._rings: dict[int, tuple[list[int], list[int]]] = {}
+
+    def route(self, request: Request[Any], workers: int) -> int:
+        try:
+            get_key = self._keys[type(request)]
+        except KeyError:
+            return self._fallback.route(request, workers)
+
+        hashes, nodes = self._get_ring(workers)
+        position = bisect.bisect(hashes, stable_hash(get_key(request))) % len(hashes)
+        return nodes[position]
+
+    def _get_ring(self, workers: int) -> tuple[list[int], list[int]]:
+        try:
+            return self._rings[workers]
+        except KeyError:
+            ring = sorted(
+                (stable_hash((worker, virtual_node)), worker)
+                for worker in range(workers) for virtual_node in range(self._virtual_nodes)
+            )
+            hashes = [node_hash for node_hash, _ in ring]
+            nodes = [worker for _, worker in ring]
+            self._rings[workers] = hashes, nodes
+            return hashes, nodes
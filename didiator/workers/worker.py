@@ -0,0 +1,40 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+import inspect
+import socket
+from typing import Any
+
+from didiator.interface.mediator import Mediator
+from didiator.interface.utils.serializer import Serializer
+from didiator.transport.protocol import serve_connection
+
+MediatorFactory = Callable[[], Mediator | Awaitable[Mediator]]
+Registration = tuple[str, tuple[Any, ...], dict[str, Any]]
+
+
+def run_worker(
+    sock: socket.socket, mediator_factory: MediatorFactory,
+    registrations: Sequence[Registration], serializer: Serializer,
+) -> None:
+    try:
+        asyncio.run(_serve(sock, mediator_factory, registrations, serializer))
+    except KeyboardInterrupt:
+        pass
+
+
+async def build_mediator(mediator_factory: MediatorFactory, registrations: Sequence[Registration]) -> Mediator:
+    mediator = mediator_factory()
+    if inspect.isawaitable(mediator):
+        mediator = await mediator
+    for method, args, kwargs in registrations:
+        getattr(mediator, method)(*args, **kwargs)
+    return mediator
+
+
+async def _serve(
+    sock: socket.socket, mediator_factory: MediatorFactory,
+    registrations: Sequence[Registration], serializer: Serializer,
+) -> None:
+    mediator = await build_mediator(mediator_factory, registrations)
+    reader, writer = await asyncio.open_connection(sock=sock)
+    await serve_connection(mediator, serializer, reader, writer)
@@ -22,6 +22,7 @@ from didiator.interface.utils.di_builder import DiBuilder
 from didiator.mediator import MediatorImpl
 from didiator.middlewares.di import DiMiddleware, DiScopes
 from didiator.middlewares.logging import LoggingMiddleware
+from didiator.partitions import KeyLockPartitioner
 from didiator.utils.di_builder import DiBuilderImpl
 
 logger = logging.getLogger(__name__)
@@ -195,9 +196,14 @@ def build_tg_dispatcher() -> aiogram.Dispatcher:
 
 def build_mediator(di_builder: DiBuilder) -> Mediator:
     middlewares = (LoggingMiddleware(level=logging.INFO), DiMiddleware(di_builder, scopes=DiScopes("tg_update")))
-    command_dispatcher = CommandDispatcherImpl(middlewares=middlewares)
+    # Commands and events of the same user are handled in order, while different users are handled concurrently
+    partitioner = KeyLockPartitioner({
+        CreateUser: lambda command: command.user_id,
+        UserCreated: lambda event: event.user_id,
+    })
+    command_dispatcher = CommandDispatcherImpl(middlewares=middlewares, partitioner=partitioner)
     query_dispatcher = QueryDispatcherImpl(middlewares=middlewares)
-    event_observer = EventObserverImpl(middlewares=middlewares)
+    event_observer = EventObserverImpl(middlewares=middlewares, partitioner=partitioner)
 
     mediator = MediatorImpl(command_dispatcher, query_dispatcher, event_observer)
     mediator.register_command_handler(CreateUser, CreateUserHandler)
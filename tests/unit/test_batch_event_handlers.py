@@ -0,0 +1,120 @@
+import asyncio
+from dataclasses import dataclass
+
+from di import Container
+from di.executors import AsyncExecutor
+
+from didiator import BatchEventHandler, Event, EventBatch
+from didiator.mediator import MediatorImpl
+from didiator.middlewares.di import DiMiddleware, DiScopes
+from didiator.middlewares.logging import LoggingMiddleware
+from didiator.observers.event import EventObserverImpl
+from didiator.utils.di_builder import DiBuilderImpl
+
+
+@dataclass(frozen=True)
+class ItemAdded(Event):
+    item_id: int
+
+
+@dataclass(frozen=True)
+class ItemRemoved(Event):
+    item_id: int
+
+
+class Projection:
+    def __init__(self) -> None:
+        self.writes: list[list[int]] = []
+
+
+class ItemsProjectionHandler(BatchEventHandler[ItemAdded]):
+    def __init__(self, projection: Projection) -> None:
+        self._projection = projection
+
+    async def __call__(self, events: EventBatch[ItemAdded]) -> None:
+        self._projection.writes.append([event.item_id for event in events])
+
+
+class TestBatchEventHandlers:
+    async def test_batch_per_publish(self) -> None:
+        projection = Projection()
+        received: list[int] = []
+
+        async def on_item_added(event: ItemAdded) -> None:
+            received.append(event.item_id)
+
+        mediator = MediatorImpl(event_observer=EventObserverImpl((LoggingMiddleware(),)))
+        mediator.register_event_handler(ItemAdded, on_item_added)
+        mediator.register_batch_event_handler(ItemAdded, ItemsProjectionHandler(projection))
+
+        await mediator.publish([ItemAdded(1), ItemRemoved(2), ItemAdded(3)])
+        await mediator.publish([ItemRemoved(4)])
+        await mediator.publish(ItemAdded(5))
+
+        assert received == [1, 3, 5]
+        assert projection.writes == [[1, 3], [5]]
+
+    async def test_batch_is_injected_by_di(self) -> None:
+        di_container = Container()
+        di_builder = DiBuilderImpl(di_container, AsyncExecutor(), ["app", "request"])
+        event_observer = EventObserverImpl((DiMiddleware(di_builder, scopes=DiScopes(func_handler="request")),))
+        mediator = MediatorImpl(event_observer=event_observer)
+        batches: list[EventBatch[ItemAdded]] = []
+
+        async def project_items(events: EventBatch[ItemAdded]) -> None:
+            batches.append(events)
+
+        mediator.register_batch_event_handler(ItemAdded, project_items)
+        async with di_container.enter_scope("app") as di_state:
+            await mediator.publish([ItemAdded(1), ItemAdded(2)], di_state=di_state)
+
+        assert batches == [(ItemAdded(1), ItemAdded(2))]
+        assert isinstance(batches[0], EventBatch[ItemAdded])
+
+    async def test_size_window(self) -> None:
+        projection = Projection()
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        mediator.register_batch_event_handler(ItemAdded, ItemsProjectionHandler(projection), max_batch_size=3)
+
+        for item_id in range(4):
+            await mediator.publish(ItemAdded(item_id))
+        await mediator.publish([ItemAdded(item_id) for item_id in range(4, 9)])
+        assert projection.writes == [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+
+        await mediator.publish(ItemAdded(9))
+        assert projection.writes == [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+
+        # A partial batch of a window without a delay is handled by flush
+        await event_observer.flush()
+        assert projection.writes == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+    async def test_time_window(self) -> None:
+        projection = Projection()
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        mediator.register_batch_event_handler(
+            ItemAdded, ItemsProjectionHandler(projection), max_batch_size=100, max_delay=0.05,
+        )
+
+        await mediator.publish(ItemAdded(1))
+        await mediator.bind(key="value").publish(ItemAdded(2))
+        assert projection.writes == []
+
+        await asyncio.sleep(0.1)
+        assert projection.writes == [[1, 2]]
+
+        await mediator.publish(ItemAdded(3))
+        await event_observer.flush()
+        assert projection.writes == [[1, 2], [3]]
+
+    async def test_sync_batch_handler(self) -> None:
+        writes: list[int] = []
+
+        def project_items(events: EventBatch[ItemAdded]) -> None:
+            writes.append(len(events))
+
+        mediator = MediatorImpl()
+        mediator.register_batch_event_handler(ItemAdded, project_items)
+        await mediator.publish([ItemAdded(item_id) for item_id in range(500)])
+        assert writes == [500]
@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+import datetime as dt
+from decimal import Decimal
+import enum
+import pickle
+import uuid
+
+import pytest
+
+from didiator import Command, Event
+from didiator.codecs import BinaryCodecRegistry, get_stable_tag
+from didiator.codecs.binary import DataclassCodec
+from didiator.codecs.varint import read_uvarint
+from didiator.interface.exceptions import CodecError
+from didiator.utils.serializer import PickleSerializer
+
+
+class Role(enum.Enum):
+    USER = "user"
+    ADMIN = "admin"
+
+
+@dataclass(frozen=True)
+class Address:
+    city: str
+    building: int | None = None
+
+
+@dataclass(frozen=True)
+class UserCreated(Event):
+    user_id: uuid.UUID
+    name: str
+    age: int
+    rating: float
+    is_active: bool
+    role: Role
+    created_at: dt.datetime
+    balance: Decimal
+    tags: tuple[str, ...]
+    addresses: list[Address]
+    settings: dict[str, int]
+    avatar: bytes | None = None
+
+
+@dataclass(frozen=True)
+class UploadFile(Command[None]):
+    name: str
+    content: memoryview
+
+
+@dataclass(frozen=True)
+class TreeNode:
+    value: int
+    children: list["TreeNode"] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class UserDeletedV1(Event):
+    user_id: int
+
+
+@dataclass(frozen=True)
+class UserDeleted(Event):
+    user_id: int
+    reason: str = "unknown"
+
+
+@dataclass(frozen=True, slots=True)
+class Point:
+    x: int
+    y: int
+
+
+@dataclass(frozen=True)
+class LabeledPoint(Point):
+    label: str
+
+
+def build_user_created() -> UserCreated:
+    return UserCreated(
+        uuid.uuid4(), "John", -30, 4.5, True, Role.ADMIN, dt.datetime.now(dt.timezone.utc), Decimal("10.50"),
+        ("a", "b"), [Address("London", 221), Address("Paris")], {"theme": 1}, b"\x00\x01",
+    )
+
+
+class TestBinaryCodecRegistry:
+    def test_encoding(self) -> None:
+        registry = BinaryCodecRegistry()
+        registry.register(UserCreated)
+        event = build_user_created()
+
+        data = registry.dumps(event)
+        assert registry.loads(data) == event
+        assert len(data) < len(pickle.dumps(event))
+
+    def test_zero_copy_decoding(self) -> None:
+        registry = BinaryCodecRegistry()
+        registry.register(UploadFile)
+        buffer = bytearray(registry.dumps(UploadFile("file.txt", memoryview(b"content"))))
+
+        command = registry.loads(memoryview(buffer))
+        assert command.content == b"content"
+        buffer[-1:] = b"!"
+        assert command.content == b"conten!"
+
+    def test_decoding_from_offset(self) -> None:
+        registry = BinaryCodecRegistry()
+        registry.register(UserDeleted)
+        buf = bytearray()
+        registry.encode_into(buf, UserDeleted(1))
+        registry.encode_into(buf, UserDeleted(2, "spam"))
+
+        first, offset = registry.decode_from(memoryview(buf))
+        second, offset = registry.decode_from(memoryview(buf), offset)
+        assert (first, second, offset) == (UserDeleted(1), UserDeleted(2, "spam"), len(buf))
+
+    def test_recursive_dataclasses(self) -> None:
+        registry = BinaryCodecRegistry()
+        registry.register(TreeNode)
+        tree = TreeNode(1, [TreeNode(2), TreeNode(3, [TreeNode(4)])])
+        assert registry.loads(registry.dumps(tree)) == tree
+
+    def test_direct_building(self) -> None:
+        # Dataclasses are filled without __init__ unless their fields are kept in slots
+        assert DataclassCodec(UserDeleted, {}).direct
+        assert not DataclassCodec(Point, {}).direct
+        assert not DataclassCodec(LabeledPoint, {}).direct
+
+        registry = BinaryCodecRegistry()
+        for cls in (UserDeleted, Point, LabeledPoint):
+            registry.register(cls)
+        for obj in (UserDeleted(1, "spam"), Point(1, 2), LabeledPoint(1, 2, "a")):
+            assert registry.loads(registry.dumps(obj)) == obj
+
+    def test_stable_tags(self) -> None:
+        registry = BinaryCodecRegistry()
+        registry.register(UserDeleted)
+        tag, _ = read_uvarint(memoryview(registry.dumps(UserDeleted(1))), 0)
+        assert tag == get_stable_tag(UserDeleted)
+
+        with pytest.raises(ValueError):
+            registry.register(UserDeletedV1, tag=get_stable_tag(UserDeleted))
+
+    def test_schema_versions(self) -> None:
+        old_registry = BinaryCodecRegistry()
+        old_registry.register(UserDeletedV1, tag=1)
+        data = old_registry.dumps(UserDeletedV1(1))
+
+        registry = BinaryCodecRegistry()
+        registry.register(UserDeleted, tag=1, version=2)
+        assert registry.loads(data) == UserDeleted(1)
+
+        def upgrade(version: int, fields: dict[str, int]) -> dict[str, object]:
+            return fields | {"reason": f"from v{version}"}
+
+        registry = BinaryCodecRegistry()
+        registry.register(UserDeleted, tag=1, version=2, upgrade=upgrade)
+        assert registry.loads(data) == UserDeleted(1, "from v1")
+
+        with pytest.raises(CodecError):
+            old_registry.loads(registry.dumps(UserDeleted(1)))
+
+    def test_fallback(self) -> None:
+        registry = BinaryCodecRegistry(fallback=PickleSerializer())
+        assert registry.loads(registry.dumps({"key": [1, 2]})) == {"key": [1, 2]}
+
+        with pytest.raises(CodecError):
+            BinaryCodecRegistry().dumps(UserDeleted(1))
+
+    def test_invalid_data(self) -> None:
+        registry = BinaryCodecRegistry()
+        registry.register(UserCreated)
+        data = registry.dumps(build_user_created())
+
+        with pytest.raises(CodecError):
+            registry.loads(data[:-3])
+        with pytest.raises(CodecError):
+            registry.loads(data + b"\x00")
+        with pytest.raises(CodecError):
+            registry.dumps(UserCreated(*(None for _ in range(12))))  # type: ignore[arg-type]
+
+    def test_unsupported_types(self) -> None:
+        @dataclass
+        class WithObject:
+            value: object
+
+        with pytest.raises(TypeError):
+            BinaryCodecRegistry().register(WithObject)
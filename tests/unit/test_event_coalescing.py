@@ -0,0 +1,114 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from didiator import Event
+from didiator.mediator import MediatorImpl
+from didiator.observers.coalesce import Debounce, Throttle
+from didiator.observers.event import EventObserverImpl
+
+
+@dataclass(frozen=True)
+class ProfileUpdated(Event):
+    user_id: int
+    fields: frozenset[str]
+
+
+@dataclass(frozen=True)
+class UserDeleted(Event):
+    user_id: int
+
+
+def merge_updates(held: ProfileUpdated, event: ProfileUpdated) -> ProfileUpdated:
+    return ProfileUpdated(event.user_id, held.fields | event.fields)
+
+
+def build_mediator(coalescer: Debounce | Throttle, received: list[Event]) -> tuple[MediatorImpl, EventObserverImpl]:
+    event_observer = EventObserverImpl(coalescers={ProfileUpdated: coalescer})
+    mediator = MediatorImpl(event_observer=event_observer)
+
+    async def on_event(event: Event, **kwargs: Any) -> None:
+        received.append(event)
+
+    mediator.register_event_handler(ProfileUpdated, on_event)
+    mediator.register_event_handler(UserDeleted, on_event)
+    return mediator, event_observer
+
+
+class TestDebounce:
+    async def test_latest_event_is_delivered_after_quiet_period(self) -> None:
+        received: list[Event] = []
+        mediator, _ = build_mediator(Debounce(0.02, key=lambda event: event.user_id), received)
+
+        for field in ("name", "email", "phone"):
+            await mediator.publish(ProfileUpdated(1, frozenset({field})))
+            await asyncio.sleep(0.005)
+        await mediator.publish([ProfileUpdated(2, frozenset({"name"})), UserDeleted(3)])
+        assert received == [UserDeleted(3)]
+
+        await asyncio.sleep(0.03)
+        assert received[1:] == [ProfileUpdated(1, frozenset({"phone"})), ProfileUpdated(2, frozenset({"name"}))]
+
+    async def test_events_are_merged_by_reducer(self) -> None:
+        received: list[Event] = []
+        mediator, event_observer = build_mediator(Debounce(10, reduce=merge_updates), received)
+
+        await mediator.publish(ProfileUpdated(1, frozenset({"name"})))
+        await mediator.publish(ProfileUpdated(1, frozenset({"email"})))
+        await event_observer.flush()
+        assert received == [ProfileUpdated(1, frozenset({"name", "email"}))]
+
+    async def test_delay_is_bounded(self) -> None:
+        received: list[Event] = []
+        mediator, _ = build_mediator(Debounce(0.02, max_delay=0.04), received)
+
+        for _ in range(10):
+            await mediator.publish(ProfileUpdated(1, frozenset()))
+            await asyncio.sleep(0.01)
+        assert len(received) >= 2
+
+    async def test_delay_is_bounded_by_default(self) -> None:
+        received_at: list[float] = []
+        event_observer = EventObserverImpl(coalescers={ProfileUpdated: Debounce(0.01)})
+        mediator = MediatorImpl(event_observer=event_observer)
+        loop = asyncio.get_running_loop()
+
+        async def on_event(event: Event) -> None:
+            received_at.append(loop.time())
+
+        mediator.register_event_handler(ProfileUpdated, on_event)
+        started_at = loop.time()
+        # Events keep coming on one key more often than the delay
+        while loop.time() - started_at < 0.3:
+            await mediator.publish(ProfileUpdated(1, frozenset()))
+            await asyncio.sleep(0.002)
+
+        assert received_at
+        # The default max_delay is ten delays
+        assert received_at[0] - started_at < 0.1 + 0.05
+
+
+class TestThrottle:
+    async def test_first_event_is_delivered_immediately(self) -> None:
+        received: list[Event] = []
+        mediator, _ = build_mediator(Throttle(0.02, key=lambda event: event.user_id, reduce=merge_updates), received)
+
+        await mediator.publish(ProfileUpdated(1, frozenset({"name"})))
+        await mediator.publish(ProfileUpdated(1, frozenset({"email"})))
+        await mediator.publish(ProfileUpdated(1, frozenset({"phone"})))
+        assert received == [ProfileUpdated(1, frozenset({"name"}))]
+
+        await asyncio.sleep(0.03)
+        assert received[1:] == [ProfileUpdated(1, frozenset({"email", "phone"}))]
+
+        await asyncio.sleep(0.03)
+        await mediator.publish(ProfileUpdated(1, frozenset({"name"})))
+        assert received[2:] == [ProfileUpdated(1, frozenset({"name"}))]
+
+    async def test_coalescers_are_shared_by_bound_mediators(self) -> None:
+        received: list[Event] = []
+        mediator, _ = build_mediator(Throttle(10), received)
+
+        await mediator.bind(request_id=1).publish(ProfileUpdated(1, frozenset()))
+        await mediator.bind(request_id=2).publish(ProfileUpdated(1, frozenset()))
+        assert len(received) == 1
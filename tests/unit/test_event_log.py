@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from didiator import Event, EventBatch
+from didiator.eventlog import SegmentedEventLog
+from didiator.interface.observers.event import BatchListener, Listener
+from didiator.mediator import MediatorImpl
+from didiator.observers import EventObserverImpl
+
+
+@dataclass(frozen=True)
+class OrderPlaced(Event):
+    order_id: int
+
+
+@dataclass(frozen=True)
+class ExpressOrderPlaced(OrderPlaced):
+    pass
+
+
+@dataclass(frozen=True)
+class OrderShipped(Event):
+    order_id: int
+
+
+class InMemorySerializer:
+    # Keeps objects in memory, so classes that can't be pickled can be logged
+    def __init__(self) -> None:
+        self._objects: list[Any] = []
+
+    def dumps(self, obj: Any) -> bytes:
+        self._objects.append(obj)
+        return str(len(self._objects) - 1).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return self._objects[int(data)]
+
+
+class TestSegmentedEventLog:
+    async def test_append_and_read(self, tmp_path: Path) -> None:
+        event_log = SegmentedEventLog(tmp_path, segment_size=256, index_interval=4)
+        events = [OrderPlaced(order_id) if order_id % 3 else OrderShipped(order_id) for order_id in range(50)]
+        assert await event_log.append(events[:20]) == 20
+        assert await event_log.append(events[20:]) == 50
+        assert event_log.segments > 1
+
+        assert [logged.event for logged in event_log.read()] == events
+        assert [logged.sequence for logged in event_log.read(45)] == [45, 46, 47, 48, 49, 50]
+        shipped = [logged.event for logged in event_log.read(event_types=[OrderShipped])]
+        assert shipped == [event for event in events if isinstance(event, OrderShipped)]
+        await event_log.close()
+
+    async def test_read_types_that_cant_be_imported(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        @dataclass(frozen=True)
+        class OrderCancelled(Event):
+            order_id: int
+
+        event_log = SegmentedEventLog(tmp_path, serializer=InMemorySerializer())
+        await event_log.append([OrderCancelled(1), OrderShipped(1), OrderCancelled(2)])
+
+        cancelled = [logged.event for logged in event_log.read(event_types=[OrderCancelled])]
+        assert cancelled == [OrderCancelled(1), OrderCancelled(2)]
+
+        with caplog.at_level(logging.WARNING):
+            assert [logged.event for logged in event_log.read(event_types=[OrderShipped])] == [OrderShipped(1)]
+        assert "can't be imported" in caplog.text
+        await event_log.close()
+
+    async def test_reopen(self, tmp_path: Path) -> None:
+        event_log = SegmentedEventLog(tmp_path, segment_size=256)
+        await event_log.append([OrderPlaced(order_id) for order_id in range(30)])
+        await event_log.close()
+
+        event_log = SegmentedEventLog(tmp_path, segment_size=256)
+        assert event_log.last_sequence == 30
+        await event_log.append([OrderShipped(1)])
+        assert [logged.sequence for logged in event_log.read(29)] == [29, 30, 31]
+        await event_log.close()
+
+    async def test_torn_tail_is_truncated(self, tmp_path: Path) -> None:
+        event_log = SegmentedEventLog(tmp_path)
+        await event_log.append([OrderPlaced(1), OrderPlaced(2)])
+        await event_log.close()
+
+        segment_path = next(tmp_path.glob("*.log"))
+        data = segment_path.read_bytes()
+        segment_path.write_bytes(data[:-3])
+
+        event_log = SegmentedEventLog(tmp_path)
+        assert event_log.last_sequence == 1
+        await event_log.append([OrderPlaced(3)])
+        assert [logged.event for logged in event_log.read()] == [OrderPlaced(1), OrderPlaced(3)]
+        await event_log.close()
+
+    async def test_checkpoints(self, tmp_path: Path) -> None:
+        event_log = SegmentedEventLog(tmp_path)
+        assert await event_log.load_checkpoint("projection") is None
+        await event_log.save_checkpoint("projection", 10)
+        assert await event_log.load_checkpoint("projection") == 10
+        await event_log.close()
+
+
+class TestReplay:
+    async def test_published_events_are_logged_and_replayed(self, tmp_path: Path) -> None:
+        event_log = SegmentedEventLog(tmp_path)
+        mediator = MediatorImpl(event_observer=EventObserverImpl(event_log=event_log))
+        await mediator.publish([OrderPlaced(1), OrderShipped(1), ExpressOrderPlaced(2)])
+        await mediator.publish(OrderPlaced(3))
+
+        placed: list[int] = []
+        batches: list[list[int]] = []
+
+        async def on_order_placed(event: OrderPlaced) -> None:
+            placed.append(event.order_id)
+
+        async def on_orders_placed(events: EventBatch[OrderPlaced]) -> None:
+            batches.append([event.order_id for event in events])
+
+        projection = EventObserverImpl(listeners=[
+            Listener(OrderPlaced, on_order_placed), BatchListener(OrderPlaced, on_orders_placed),
+        ])
+        assert await projection.replay(event_log, batch_size=2) == 3
+        assert placed == [1, 2, 3]
+        assert batches == [[1, 2], [3]]
+        # Replayed events aren't logged again
+        assert event_log.last_sequence == 4
+        await event_log.close()
+
+    async def test_replay_resumes_from_checkpoint(self, tmp_path: Path) -> None:
+        event_log = SegmentedEventLog(tmp_path)
+        await event_log.append([OrderPlaced(order_id) for order_id in range(5)])
+        placed: list[int] = []
+
+        async def on_order_placed(event: OrderPlaced) -> None:
+            placed.append(event.order_id)
+
+        projection = EventObserverImpl(listeners=[Listener(OrderPlaced, on_order_placed)], event_log=event_log)
+        assert await projection.replay(checkpoint="orders") == 5
+        await event_log.append([OrderPlaced(5)])
+        assert await projection.replay(checkpoint="orders") == 1
+        assert placed == [0, 1, 2, 3, 4, 5]
+        assert await event_log.load_checkpoint("orders") == 6
+        await event_log.close()
@@ -0,0 +1,118 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from didiator import Event
+from didiator.mediator import MediatorImpl
+from didiator.observers import EventObserverImpl, Overflow, SubscriberQueue
+
+
+@dataclass(frozen=True)
+class PriceUpdated(Event):
+    price: int
+
+
+class TestSubscriberQueues:
+    async def test_slow_subscriber_doesnt_block_publishing(self) -> None:
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        release = asyncio.Event()
+        slow_received: list[int] = []
+        fast_received: list[int] = []
+
+        async def slow(event: PriceUpdated, **kwargs: object) -> None:
+            await release.wait()
+            slow_received.append(event.price)
+
+        async def fast(event: PriceUpdated, **kwargs: object) -> None:
+            fast_received.append(event.price)
+
+        slow_queue = SubscriberQueue(10)
+        mediator.subscribe(PriceUpdated, slow, queue=slow_queue)
+        mediator.subscribe(PriceUpdated, fast, queue=SubscriberQueue(10))
+
+        await asyncio.wait_for(mediator.publish([PriceUpdated(price) for price in range(3)]), 1)
+        await asyncio.sleep(0)
+        assert fast_received == [0, 1, 2]
+        assert slow_received == []
+        assert slow_queue.pending == 2
+
+        release.set()
+        await event_observer.flush()
+        assert slow_received == [0, 1, 2]
+        assert slow_queue.pending == 0
+
+    @pytest.mark.parametrize(("overflow", "expected"), [
+        (Overflow.DROP_OLDEST, [0, 3, 4]),
+        (Overflow.DROP_NEWEST, [0, 1, 2]),
+    ])
+    async def test_dropping_overflow(self, overflow: Overflow, expected: list[int]) -> None:
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        received: list[int] = []
+
+        async def handler(event: PriceUpdated, **kwargs: object) -> None:
+            received.append(event.price)
+
+        queue = SubscriberQueue(2, overflow)
+        mediator.subscribe(PriceUpdated, handler, queue=queue)
+        # The first event is taken by the consumer before others are published
+        await mediator.publish(PriceUpdated(0))
+        await asyncio.sleep(0)
+        await mediator.publish([PriceUpdated(price) for price in range(1, 5)])
+
+        await event_observer.flush()
+        assert received == expected
+        assert queue.dropped == 2
+        assert queue.connected
+
+    async def test_disconnect_overflow(self) -> None:
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        received: list[int] = []
+        disconnected: list[bool] = []
+
+        async def handler(event: PriceUpdated, **kwargs: object) -> None:
+            received.append(event.price)
+
+        queue = SubscriberQueue(2, Overflow.DISCONNECT, on_disconnect=lambda: disconnected.append(True))
+        subscription = mediator.subscribe(PriceUpdated, handler, queue=queue)
+        await mediator.publish([PriceUpdated(price) for price in range(3)])
+
+        assert not queue.connected
+        assert not subscription.active
+        assert disconnected == [True]
+        await mediator.publish(PriceUpdated(3))
+        await event_observer.flush()
+        assert received == []
+        assert queue.dropped == 3
+
+    async def test_handler_errors_are_isolated(self) -> None:
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        received: list[int] = []
+
+        async def handler(event: PriceUpdated, **kwargs: object) -> None:
+            if event.price == 0:
+                raise ValueError("Handling failed")
+            received.append(event.price)
+
+        mediator.subscribe(PriceUpdated, handler, queue=SubscriberQueue())
+        await mediator.publish([PriceUpdated(0), PriceUpdated(1)])
+        await event_observer.flush()
+        assert received == [1]
+
+    async def test_queue_is_used_by_one_listener(self) -> None:
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        queue = SubscriberQueue()
+
+        async def handler(event: PriceUpdated) -> None:
+            pass
+
+        mediator.subscribe(PriceUpdated, handler, queue=queue)
+        with pytest.raises(ValueError):
+            mediator.subscribe(PriceUpdated, handler, queue=queue)
+        with pytest.raises(ValueError):
+            mediator.subscribe(PriceUpdated, handler, queue=SubscriberQueue(), weak=True)
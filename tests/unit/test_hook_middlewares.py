@@ -0,0 +1,147 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from didiator import Command, Event, StreamQuery
+from didiator.dispatchers.command import CommandDispatcherImpl
+from didiator.dispatchers.query import QueryDispatcherImpl
+from didiator.interface.entities.request import Request
+from didiator.interface.handlers import CommandHandler
+from didiator.mediator import MediatorImpl
+from didiator.middlewares import HookContext, HookMiddleware, Middleware
+from didiator.observers import EventObserverImpl
+
+
+@dataclass(frozen=True)
+class Multiply(Command[int]):
+    value: int
+
+
+@dataclass(frozen=True)
+class ValueChanged(Event):
+    value: int
+
+
+@dataclass(frozen=True)
+class GetValues(StreamQuery[int]):
+    count: int
+
+
+class MultiplyHandler(CommandHandler[Multiply, int]):
+    async def __call__(self, command: Multiply, factor: int = 2, **kwargs: Any) -> int:
+        if command.value < 0:
+            raise ValueError("Negative value")
+        return command.value * factor
+
+
+class RecordingHook(HookMiddleware):
+    def __init__(self, name: str, calls: list[str]) -> None:
+        self._name = name
+        self._calls = calls
+
+    def before(self, request: Request[Any], ctx: HookContext) -> None:
+        self._calls.append(f"{self._name}.before")
+
+    async def after(self, request: Request[Any], result: Any, ctx: HookContext) -> Any:
+        self._calls.append(f"{self._name}.after")
+        return result
+
+    def on_error(self, request: Request[Any], error: Exception, ctx: HookContext) -> None:
+        self._calls.append(f"{self._name}.on_error")
+
+
+class RecordingMiddleware(Middleware):
+    def __init__(self, name: str, calls: list[str]) -> None:
+        self._name = name
+        self._calls = calls
+
+    async def __call__(self, handler: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+        self._calls.append(f"{self._name}.enter")
+        try:
+            return await self._call(handler, request, *args, **kwargs)
+        finally:
+            self._calls.append(f"{self._name}.exit")
+
+
+class FactorHook(HookMiddleware):
+    def before(self, request: Request[Any], ctx: HookContext) -> None:
+        ctx.state["factor"] = ctx.kwargs["factor"] = 10
+
+    def after(self, request: Request[Any], result: Any, ctx: HookContext) -> Any:
+        return result + ctx.state["factor"]
+
+
+class FailingHook(HookMiddleware):
+    def before(self, request: Request[Any], ctx: HookContext) -> None:
+        raise RuntimeError("Hook failed")
+
+
+class TestHookMiddlewares:
+    async def test_hooks_interleave_with_wrapping_middlewares(self) -> None:
+        calls: list[str] = []
+        dispatcher = CommandDispatcherImpl([
+            RecordingHook("first", calls), RecordingMiddleware("wrapping", calls), RecordingHook("second", calls),
+            RecordingHook("third", calls),
+        ])
+        mediator = MediatorImpl(dispatcher)
+        mediator.register_command_handler(Multiply, MultiplyHandler)
+
+        assert await mediator.send(Multiply(2)) == 4
+        assert calls == [
+            "first.before", "wrapping.enter", "second.before", "third.before",
+            "third.after", "second.after", "wrapping.exit", "first.after",
+        ]
+
+    async def test_errors(self) -> None:
+        calls: list[str] = []
+        mediator = MediatorImpl(CommandDispatcherImpl([RecordingHook("first", calls), RecordingHook("second", calls)]))
+        mediator.register_command_handler(Multiply, MultiplyHandler)
+
+        with pytest.raises(ValueError):
+            await mediator.send(Multiply(-1))
+        assert calls == ["first.before", "second.before", "second.on_error", "first.on_error"]
+
+        calls.clear()
+        mediator = MediatorImpl(CommandDispatcherImpl([RecordingHook("first", calls), FailingHook()]))
+        mediator.register_command_handler(Multiply, MultiplyHandler)
+        with pytest.raises(RuntimeError):
+            await mediator.send(Multiply(1))
+        # Hooks whose ``before`` isn't completed aren't notified
+        assert calls == ["first.before", "first.on_error"]
+
+    async def test_hooks_change_arguments_and_result(self) -> None:
+        mediator = MediatorImpl(CommandDispatcherImpl([FactorHook()]))
+        mediator.register_command_handler(Multiply, MultiplyHandler)
+        assert await mediator.send(Multiply(3)) == 40
+
+    async def test_event_listeners(self) -> None:
+        calls: list[str] = []
+        received: list[int] = []
+
+        async def handler(event: ValueChanged) -> None:
+            received.append(event.value)
+
+        mediator = MediatorImpl(event_observer=EventObserverImpl([RecordingHook("hook", calls)]))
+        mediator.register_event_handler(ValueChanged, handler)
+        await mediator.publish(ValueChanged(1))
+        assert received == [1]
+        assert calls == ["hook.before", "hook.after"]
+
+    async def test_stream_queries(self) -> None:
+        calls: list[str] = []
+
+        async def get_values(query: GetValues) -> AsyncIterator[int]:
+            for value in range(query.count):
+                yield value
+
+        mediator = MediatorImpl(query_dispatcher=QueryDispatcherImpl([RecordingHook("hook", calls)]))
+        mediator.register_stream_query_handler(GetValues, get_values)
+        assert [value async for value in mediator.stream(GetValues(3))] == [0, 1, 2]
+        assert calls == ["hook.before", "hook.after"]
+
+    async def test_standalone_hook_middleware(self) -> None:
+        calls: list[str] = []
+        assert await RecordingHook("hook", calls)(MultiplyHandler, Multiply(1)) == 2
+        assert calls == ["hook.before", "hook.after"]
@@ -0,0 +1,216 @@
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+import time
+from typing import Any
+
+import pytest
+
+from didiator import Command, StreamQuery
+from didiator.dispatchers.command import CommandDispatcherImpl
+from didiator.dispatchers.query import QueryDispatcherImpl
+from didiator.idempotency import MemoryIdempotencyStore, SqliteIdempotencyStore
+from didiator.interface.idempotency import IdempotencyStore
+from didiator.mediator import MediatorImpl
+from didiator.middlewares.idempotency import IdempotencyMiddleware
+
+
+@dataclass(frozen=True)
+class ChargeCard(Command[int]):
+    payment_id: str
+    amount: int
+
+
+@dataclass(frozen=True)
+class ListCharges(StreamQuery[str]):
+    pass
+
+
+class PaymentDeclined(Exception):
+    pass
+
+
+class CardBlocked(Exception):
+    # It's pickled with one argument, so it can't be unpickled
+    def __init__(self, payment_id: str, reason: str) -> None:
+        super().__init__(f"{payment_id}: {reason}")
+
+
+class ObjectSerializer:
+    # Outcomes are kept as objects, so even a stream could be stored
+    def __init__(self) -> None:
+        self.outcomes: list[Any] = []
+
+    def dumps(self, obj: Any) -> bytes:
+        self.outcomes.append(obj)
+        return str(len(self.outcomes) - 1).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return self.outcomes[int(data)]
+
+
+class Gateway:
+    def __init__(self) -> None:
+        self.charges: list[ChargeCard] = []
+        self.release: asyncio.Event | None = None
+
+    async def __call__(self, command: ChargeCard) -> int:
+        self.charges.append(command)
+        if self.release is not None:
+            await self.release.wait()
+        if command.amount < 0:
+            raise PaymentDeclined(command.payment_id)
+        if command.amount == 0:
+            raise CardBlocked(command.payment_id, "blocked")
+        return len(self.charges)
+
+
+def build_mediator(
+    gateway: Gateway, store: IdempotencyStore | None = None, **kwargs: object,
+) -> tuple[MediatorImpl, IdempotencyMiddleware]:
+    middleware = IdempotencyMiddleware(store, keys={ChargeCard: lambda command: command.payment_id}, **kwargs)
+    mediator = MediatorImpl(CommandDispatcherImpl((middleware,)))
+    mediator.register_command_handler(ChargeCard, gateway)
+    return mediator, middleware
+
+
+class TestIdempotencyMiddleware:
+    async def test_duplicates_are_skipped(self) -> None:
+        gateway = Gateway()
+        mediator, _ = build_mediator(gateway)
+
+        assert await mediator.send(ChargeCard("a", 10)) == 1
+        assert await mediator.send(ChargeCard("a", 10)) == 1
+        assert await mediator.send(ChargeCard("b", 10)) == 2
+        assert len(gateway.charges) == 2
+
+    async def test_exceptions_are_stored(self) -> None:
+        gateway = Gateway()
+        mediator, _ = build_mediator(gateway)
+
+        for _ in range(2):
+            with pytest.raises(PaymentDeclined):
+                await mediator.send(ChargeCard("a", -1))
+        assert len(gateway.charges) == 1
+
+    async def test_outcomes_that_cant_be_loaded_are_not_stored(self) -> None:
+        gateway = Gateway()
+        store = MemoryIdempotencyStore()
+        mediator, _ = build_mediator(gateway, store)
+
+        for _ in range(2):
+            with pytest.raises(CardBlocked):
+                await mediator.send(ChargeCard("a", 0))
+        assert len(gateway.charges) == 2
+        assert len(store) == 0
+
+    async def test_records_that_cant_be_loaded_are_missed(self) -> None:
+        gateway = Gateway()
+        store = MemoryIdempotencyStore()
+        mediator, _ = build_mediator(gateway, store)
+        await store.set(f"{ChargeCard.__module__}.ChargeCard:a", b"broken", time.time() + 60)
+
+        assert await mediator.send(ChargeCard("a", 10)) == 1
+        assert await mediator.send(ChargeCard("a", 10)) == 1
+        assert len(gateway.charges) == 1
+
+    async def test_exceptions_are_not_stored(self) -> None:
+        gateway = Gateway()
+        mediator, _ = build_mediator(gateway, store_exceptions=False)
+
+        for _ in range(2):
+            with pytest.raises(PaymentDeclined):
+                await mediator.send(ChargeCard("a", -1))
+        assert len(gateway.charges) == 2
+
+    async def test_concurrent_duplicates_wait(self) -> None:
+        gateway = Gateway()
+        gateway.release = asyncio.Event()
+        mediator, _ = build_mediator(gateway)
+
+        tasks = [asyncio.create_task(mediator.send(ChargeCard("a", 10))) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        assert len(gateway.charges) == 1
+
+        gateway.release.set()
+        assert await asyncio.gather(*tasks) == [1] * 5
+        assert len(gateway.charges) == 1
+
+    async def test_cancelled_execution_is_retried_by_waiter(self) -> None:
+        gateway = Gateway()
+        gateway.release = asyncio.Event()
+        mediator, _ = build_mediator(gateway)
+
+        first = asyncio.create_task(mediator.send(ChargeCard("a", 10)))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(mediator.send(ChargeCard("a", 10)))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+
+        gateway.release.set()
+        assert await second == 2
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_results_expire(self) -> None:
+        gateway = Gateway()
+        mediator, _ = build_mediator(gateway, ttl=0.01)
+
+        await mediator.send(ChargeCard("a", 10))
+        await asyncio.sleep(0.02)
+        await mediator.send(ChargeCard("a", 10))
+        assert len(gateway.charges) == 2
+
+    async def test_key_from_extra_data(self) -> None:
+        gateway = Gateway()
+        middleware = IdempotencyMiddleware()
+        mediator = MediatorImpl(CommandDispatcherImpl((middleware,)))
+        mediator.register_command_handler(ChargeCard, gateway)
+
+        await mediator.bind(idempotency_key="request-1").send(ChargeCard("a", 10))
+        await mediator.bind(idempotency_key="request-1").send(ChargeCard("b", 10))
+        await mediator.send(ChargeCard("c", 10))
+        await mediator.send(ChargeCard("c", 10))
+        assert [command.payment_id for command in gateway.charges] == ["a", "c", "c"]
+
+    async def test_streams_are_not_deduplicated(self) -> None:
+        async def list_charges(query: ListCharges) -> AsyncIterator[str]:
+            yield "a"
+
+        serializer = ObjectSerializer()
+        middleware = IdempotencyMiddleware(serializer=serializer)
+        mediator = MediatorImpl(query_dispatcher=QueryDispatcherImpl((middleware,)))
+        mediator.register_stream_query_handler(ListCharges, list_charges)
+
+        for _ in range(2):
+            stream = mediator.bind(idempotency_key="request-1").stream(ListCharges())
+            assert [payment_id async for payment_id in stream] == ["a"]
+        assert serializer.outcomes == []
+
+    async def test_memory_store_is_bounded(self) -> None:
+        store = MemoryIdempotencyStore(max_entries=2)
+        mediator, _ = build_mediator(Gateway(), store)
+
+        for payment_id in "abc":
+            await mediator.send(ChargeCard(payment_id, 10))
+        assert len(store) == 2
+
+    async def test_sqlite_store_survives_restart(self, tmp_path: Path) -> None:
+        gateway = Gateway()
+        store = SqliteIdempotencyStore(tmp_path / "idempotency.db")
+        mediator, _ = build_mediator(gateway, store)
+        assert await mediator.send(ChargeCard("a", 10)) == 1
+        await store.close()
+
+        store = SqliteIdempotencyStore(tmp_path / "idempotency.db")
+        mediator, _ = build_mediator(gateway, store)
+        assert await mediator.send(ChargeCard("a", 10)) == 1
+        assert len(gateway.charges) == 1
+        await store.close()
+
+    async def test_unused_sqlite_store_is_closed(self, tmp_path: Path) -> None:
+        store = SqliteIdempotencyStore(tmp_path / "idempotency.db")
+        await store.close()
+        assert not (tmp_path / "idempotency.db").exists()
@@ -0,0 +1,91 @@
+from dataclasses import dataclass, field
+
+from didiator import Event
+from didiator.interface.observers.event import Listener
+from didiator.mediator import MediatorImpl
+from didiator.observers.registry import ListenerRegistry
+
+
+@dataclass(frozen=True)
+class MessageSent(Event):
+    chat_id: int
+    kind: str = "text"
+
+
+@dataclass(frozen=True)
+class PrivateMessageSent(MessageSent):
+    pass
+
+
+@dataclass(frozen=True)
+class TaggedMessageSent(MessageSent):
+    tags: list[str] = field(default_factory=list)
+
+
+class TestListenerFilters:
+    async def test_listeners_receive_matching_events(self) -> None:
+        received: list[tuple[str, Event]] = []
+        mediator = MediatorImpl()
+
+        def subscribe(name: str, **where: object) -> None:
+            async def handler(event: MessageSent, **kwargs: object) -> None:
+                received.append((name, event))
+            mediator.subscribe(MessageSent, handler, where=where)
+
+        subscribe("chat1", chat_id=1)
+        subscribe("all")
+        subscribe("chat1_images", chat_id=1, kind="image")
+        subscribe("chat2", chat_id=2)
+
+        await mediator.publish([MessageSent(1), MessageSent(1, "image"), PrivateMessageSent(2), MessageSent(3)])
+        assert [name for name, _ in received] == [
+            "chat1", "all",
+            "chat1", "all", "chat1_images",
+            "all", "chat2",
+            "all",
+        ]
+
+    async def test_registered_event_handlers(self) -> None:
+        received: list[MessageSent] = []
+        mediator = MediatorImpl()
+
+        async def handler(event: MessageSent) -> None:
+            received.append(event)
+
+        mediator.register_event_handler(MessageSent, handler, where={"chat_id": 2})
+        await mediator.publish([MessageSent(1), MessageSent(2)])
+        assert received == [MessageSent(2)]
+
+    async def test_unsubscribe_filtered_listener(self) -> None:
+        received: list[MessageSent] = []
+        mediator = MediatorImpl()
+
+        async def handler(event: MessageSent) -> None:
+            received.append(event)
+
+        subscription = mediator.subscribe(MessageSent, handler, where={"chat_id": 1})
+        await mediator.publish(MessageSent(1))
+        assert subscription.unsubscribe()
+        assert not subscription.active
+        await mediator.publish(MessageSent(1))
+        assert received == [MessageSent(1)]
+
+    def test_unhashable_and_missing_attributes(self) -> None:
+        async def handler(event: MessageSent) -> None:
+            pass
+
+        registry = ListenerRegistry()
+        registry.add(Listener(MessageSent, handler, where={"tags": ("a",)}))
+        registry.add(Listener(MessageSent, handler, where={"missing": 1}))
+        assert registry.get(TaggedMessageSent(1, tags=["a"])) == ()
+        assert registry.get(MessageSent(1)) == ()
+        assert len(registry.get_many([TaggedMessageSent])) == 2
+
+    def test_listener_is_listen(self) -> None:
+        async def handler(event: MessageSent) -> None:
+            pass
+
+        listener = Listener(MessageSent, handler, where={"chat_id": 1})
+        assert listener.is_listen(PrivateMessageSent(1))
+        assert not listener.is_listen(MessageSent(2))
+        assert listener.where == {"chat_id": 1}
@@ -0,0 +1,110 @@
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+import sqlite3
+
+import pytest
+
+from didiator import Event
+from didiator.interface.observers.event import Listener
+from didiator.mediator import MediatorImpl
+from didiator.observers.outbox import OutboxEventObserverImpl
+from didiator.outbox.sqlite import SqliteOutboxStorage
+from didiator.utils.retry import RetryPolicy
+
+
+@dataclass(frozen=True)
+class UserCreated(Event):
+    user_id: int
+
+
+def count_rows(path: Path, table: str) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestOutboxEventObserver:
+    async def test_publishing_and_delivery(self, tmp_path: Path) -> None:
+        storage = SqliteOutboxStorage(tmp_path / "outbox.db")
+        event_observer = OutboxEventObserverImpl(storage)
+        mediator = MediatorImpl(event_observer=event_observer)
+
+        received: list[tuple[UserCreated, str]] = []
+
+        async def on_user_created(event: UserCreated, additional_data: str) -> None:
+            received.append((event, additional_data))
+
+        mediator.register_event_handler(UserCreated, on_user_created)
+
+        await mediator.publish([UserCreated(1), UserCreated(2)])
+        assert received == []
+        assert count_rows(tmp_path / "outbox.db", "outbox") == 2
+
+        assert await event_observer.deliver_available(additional_data="value") == 2
+        assert received == [(UserCreated(1), "value"), (UserCreated(2), "value")]
+        assert await event_observer.deliver_available(additional_data="value") == 0
+        await storage.close()
+
+    async def test_events_survive_restart(self, tmp_path: Path) -> None:
+        storage = SqliteOutboxStorage(tmp_path / "outbox.db")
+        await OutboxEventObserverImpl(storage).publish([UserCreated(1)])
+        await storage.close()
+
+        received: list[UserCreated] = []
+
+        async def on_user_created(event: UserCreated) -> None:
+            received.append(event)
+
+        storage = SqliteOutboxStorage(tmp_path / "outbox.db")
+        event_observer = OutboxEventObserverImpl(storage)
+        event_observer.register_listener(Listener(UserCreated, on_user_created))
+        await event_observer.deliver_available()
+        assert received == [UserCreated(1)]
+        await storage.close()
+
+    async def test_group_commit(self, tmp_path: Path) -> None:
+        storage = SqliteOutboxStorage(tmp_path / "outbox.db")
+        event_observer = OutboxEventObserverImpl(storage)
+
+        await asyncio.gather(*(event_observer.publish([UserCreated(user_id)]) for user_id in range(1000)))
+        assert count_rows(tmp_path / "outbox.db", "outbox") == 1000
+        await storage.close()
+
+    async def test_retries_and_dead_letter(self, tmp_path: Path) -> None:
+        storage = SqliteOutboxStorage(tmp_path / "outbox.db")
+        event_observer = OutboxEventObserverImpl(storage, retry_policy=RetryPolicy(max_attempts=3, backoff=0))
+        attempts: list[int] = []
+
+        async def on_user_created(event: UserCreated) -> None:
+            attempts.append(event.user_id)
+            if event.user_id == 1 or len(attempts) < 3:
+                raise ValueError("Delivery failed")
+
+        event_observer.register_listener(Listener(UserCreated, on_user_created))
+        await event_observer.publish([UserCreated(1), UserCreated(2)])
+
+        for _ in range(3):
+            await event_observer.deliver_available()
+
+        assert attempts == [1, 2, 1, 2, 1]
+        assert count_rows(tmp_path / "outbox.db", "outbox") == 0
+        assert count_rows(tmp_path / "outbox.db", "outbox_dead_letter") == 1
+        await storage.close()
+
+    async def test_delivery_loop(self, tmp_path: Path) -> None:
+        storage = SqliteOutboxStorage(tmp_path / "outbox.db")
+        event_observer = OutboxEventObserverImpl(storage, poll_interval=0.01)
+        delivered = asyncio.Event()
+
+        async def on_user_created(event: UserCreated) -> None:
+            delivered.set()
+
+        event_observer.register_listener(Listener(UserCreated, on_user_created))
+        delivery_task = asyncio.create_task(event_observer.run())
+        await event_observer.publish([UserCreated(1)])
+
+        await asyncio.wait_for(delivered.wait(), 1)
+        delivery_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await delivery_task
+        await storage.close()
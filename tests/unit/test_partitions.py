@@ -0,0 +1,131 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from didiator import Command, Event
+from didiator.dispatchers.command import CommandDispatcherImpl
+from didiator.interface.partitioner import KeyExtractors
+from didiator.mediator import MediatorImpl
+from didiator.observers.event import EventObserverImpl
+from didiator.partitions import KeyLockPartitioner, LanePartitioner
+from didiator.partitions.base import BasePartitioner
+
+
+@dataclass(frozen=True)
+class SendMessage(Command[None]):
+    chat_id: int
+    text: str
+
+
+@dataclass(frozen=True)
+class MessageSent(Event):
+    chat_id: int
+    text: str
+
+
+KEYS: KeyExtractors = {
+    SendMessage: lambda command: command.chat_id,
+    MessageSent: lambda event: event.chat_id,
+}
+
+
+class Chats:
+    def __init__(self) -> None:
+        self.messages: dict[int, list[str]] = {}
+        self.running: dict[int, int] = {}
+        self.max_running = 0
+
+    async def handle(self, chat_id: int, text: str) -> None:
+        self.running[chat_id] = self.running.get(chat_id, 0) + 1
+        assert self.running[chat_id] == 1
+        self.max_running = max(self.max_running, sum(self.running.values()))
+        await asyncio.sleep(0.01 if text.endswith("0") else 0)
+        self.messages.setdefault(chat_id, []).append(text)
+        self.running[chat_id] -= 1
+
+
+def build_mediator(partitioner: BasePartitioner, chats: Chats) -> MediatorImpl:
+    mediator = MediatorImpl(
+        CommandDispatcherImpl(partitioner=partitioner), event_observer=EventObserverImpl(partitioner=partitioner),
+    )
+
+    async def handle_send_message(command: SendMessage) -> None:
+        await chats.handle(command.chat_id, command.text)
+        # Publishing events with the same key from the handler doesn't deadlock
+        await mediator.publish(MessageSent(command.chat_id, command.text))
+
+    async def on_message_sent(event: MessageSent) -> None:
+        await chats.handle(event.chat_id + 100, event.text)
+
+    mediator.register_command_handler(SendMessage, handle_send_message)
+    mediator.register_event_handler(MessageSent, on_message_sent)
+    return mediator
+
+
+@pytest.fixture(params=["locks", "lanes"])
+async def partitioner(request: pytest.FixtureRequest) -> BasePartitioner:
+    if request.param == "locks":
+        yield KeyLockPartitioner(KEYS)
+    else:
+        partitioner = LanePartitioner(KEYS, lanes=8, idle_timeout=0.05)
+        yield partitioner
+        await partitioner.close()
+
+
+class TestPartitioners:
+    async def test_commands_order(self, partitioner: BasePartitioner) -> None:
+        chats = Chats()
+        mediator = build_mediator(partitioner, chats)
+
+        await asyncio.gather(*(
+            mediator.send(SendMessage(chat_id, str(number))) for number in range(10) for chat_id in range(4)
+        ))
+        expected = [str(number) for number in range(10)]
+        assert chats.messages == {chat_id: expected for chat_id in (*range(4), *range(100, 104))}
+        assert chats.max_running > 1
+
+    async def test_events_concurrency(self, partitioner: BasePartitioner) -> None:
+        chats = Chats()
+        observer = EventObserverImpl(partitioner=partitioner)
+
+        async def on_message_sent(event: MessageSent) -> None:
+            await chats.handle(event.chat_id, event.text)
+
+        mediator = MediatorImpl(event_observer=observer)
+        mediator.register_event_handler(MessageSent, on_message_sent)
+        await mediator.publish([MessageSent(chat_id, str(number)) for number in range(5) for chat_id in range(3)])
+
+        assert chats.messages == {chat_id: [str(number) for number in range(5)] for chat_id in range(3)}
+        assert chats.max_running == 3
+
+    async def test_idle_partitions_are_dropped(self) -> None:
+        locks = KeyLockPartitioner(KEYS)
+        task = asyncio.create_task(locks.run(1, lambda: asyncio.sleep(0.01)))
+        await asyncio.sleep(0)
+        assert locks.active_keys == 1
+        await task
+        assert locks.active_keys == 0
+
+        lanes = LanePartitioner(KEYS, idle_timeout=0.01)
+        await lanes.run(1, lambda: asyncio.sleep(0))
+        assert lanes.active_lanes == 1
+        await asyncio.sleep(0.05)
+        assert lanes.active_lanes == 0
+        assert await lanes.run(1, lambda: asyncio.sleep(0, "restarted")) == "restarted"
+        await lanes.close()
+
+    async def test_lane_errors_and_cancellation(self) -> None:
+        lanes = LanePartitioner(KEYS, lanes=1)
+
+        async def fail() -> None:
+            raise ValueError("Failed")
+
+        with pytest.raises(ValueError):
+            await lanes.run(1, fail)
+
+        slow = asyncio.create_task(lanes.run(1, lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        slow.cancel()
+        assert await asyncio.wait_for(lanes.run(2, lambda: asyncio.sleep(0, "next")), 1) == "next"
+        await lanes.close()
@@ -0,0 +1,105 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+from typing import Any, Callable
+
+import pytest
+
+from didiator import Query, QueryHandler
+from didiator.dispatchers.query import QueryDispatcherImpl
+from didiator.interface.exceptions import HandlerNotPicklable, RequestNotPicklable
+from tests.mocks.middlewares import DataAdderMiddlewareMock
+
+
+@dataclass(frozen=True)
+class GetWorkerPid(Query[int]):
+    pass
+
+
+@dataclass(frozen=True)
+class CountCalls(Query[tuple[int, int]]):
+    pass
+
+
+@dataclass(frozen=True)
+class ApplyFunc(Query[Any]):
+    func: Callable[..., Any]
+
+
+def handle_get_worker_pid(query: GetWorkerPid) -> int:
+    return os.getpid()
+
+
+class CountCallsHandler(QueryHandler[CountCalls, tuple[int, int]]):
+    def __init__(self) -> None:
+        self._calls = 0
+
+    async def __call__(self, query: CountCalls) -> tuple[int, int]:
+        self._calls += 1
+        return os.getpid(), self._calls
+
+
+class GetWorkerPidHandler(QueryHandler[GetWorkerPid, int]):
+    def __init__(self, prefix: str) -> None:
+        self._prefix = prefix
+
+    async def __call__(self, query: GetWorkerPid) -> int:
+        return os.getpid()
+
+
+def handle_apply_func(query: ApplyFunc) -> Any:
+    return query.func()
+
+
+@pytest.fixture()
+def process_pool() -> ProcessPoolExecutor:
+    with ProcessPoolExecutor(1) as pool:
+        yield pool
+
+
+class TestProcessHandlers:
+    async def test_func_handler_in_process(self, process_pool: ProcessPoolExecutor) -> None:
+        query_dispatcher = QueryDispatcherImpl(middlewares=(DataAdderMiddlewareMock(additional_data="value"),))
+        query_dispatcher.register_handler(GetWorkerPid, handle_get_worker_pid, executor=process_pool)
+
+        worker_pid = await query_dispatcher.query(GetWorkerPid(), di_state=object())
+        assert worker_pid != os.getpid()
+
+    async def test_class_handler_is_kept_warm(self, process_pool: ProcessPoolExecutor) -> None:
+        query_dispatcher = QueryDispatcherImpl(executors={CountCalls: process_pool})
+        query_dispatcher.register_handler(CountCalls, CountCallsHandler)
+
+        worker_pid, calls = await query_dispatcher.query(CountCalls())
+        assert worker_pid != os.getpid()
+        assert calls == 1
+        assert await query_dispatcher.query(CountCalls()) == (worker_pid, 2)
+
+    def test_class_handler_with_dependencies(self, process_pool: ProcessPoolExecutor) -> None:
+        query_dispatcher = QueryDispatcherImpl()
+        with pytest.raises(TypeError, match="prefix"):
+            query_dispatcher.register_handler(GetWorkerPid, GetWorkerPidHandler, executor=process_pool)
+
+    def test_unpicklable_request_type(self, process_pool: ProcessPoolExecutor) -> None:
+        @dataclass(frozen=True)
+        class LocalQuery(Query[int]):
+            pass
+
+        query_dispatcher = QueryDispatcherImpl()
+        with pytest.raises(RequestNotPicklable):
+            query_dispatcher.register_handler(LocalQuery, handle_get_worker_pid, executor=process_pool)
+
+    def test_unpicklable_handler(self, process_pool: ProcessPoolExecutor) -> None:
+        def handle_locally(query: GetWorkerPid) -> int:
+            return os.getpid()
+
+        query_dispatcher = QueryDispatcherImpl()
+        with pytest.raises(HandlerNotPicklable):
+            query_dispatcher.register_handler(GetWorkerPid, handle_locally, executor=process_pool)
+
+    async def test_unpicklable_request(self, process_pool: ProcessPoolExecutor) -> None:
+        query_dispatcher = QueryDispatcherImpl()
+        query_dispatcher.register_handler(ApplyFunc, handle_apply_func, executor=process_pool)
+
+        assert await query_dispatcher.query(ApplyFunc(os.getpid)) != os.getpid()
+        with pytest.raises(RequestNotPicklable):
+            await query_dispatcher.query(ApplyFunc(lambda: 1))
@@ -0,0 +1,143 @@
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass
+import os
+
+import pytest
+
+from didiator import Command, Event, Mediator, Query, StreamQuery
+from didiator.interface.exceptions import CommandHandlerNotFound, QueryHandlerNotFound, WorkerError
+from didiator.mediator import MediatorImpl
+from didiator.workers import ConsistentHashRouter, ProcessMediatorImpl, RoundRobinRouter, WorkerPool
+
+
+@dataclass(frozen=True)
+class GetWorkerPid(Query[int]):
+    user_id: int
+
+
+@dataclass(frozen=True)
+class DivideNumbers(Command[float]):
+    dividend: int
+    divisor: int
+
+
+@dataclass(frozen=True)
+class CountNumbers(StreamQuery[int]):
+    count: int
+    fail_at: int | None = None
+
+
+@dataclass(frozen=True)
+class NotRegisteredCommand(Command[None]):
+    pass
+
+
+@dataclass(frozen=True)
+class NotRegisteredStreamQuery(StreamQuery[int]):
+    pass
+
+
+@dataclass(frozen=True)
+class UserCreated(Event):
+    user_id: int
+
+
+async def handle_get_worker_pid(query: GetWorkerPid, additional_data: str = "") -> int:
+    assert additional_data == "value"
+    return os.getpid()
+
+
+async def handle_divide_numbers(command: DivideNumbers) -> float:
+    return command.dividend / command.divisor
+
+
+async def handle_count_numbers(query: CountNumbers, step: int = 1) -> AsyncIterator[int]:
+    for number in range(0, query.count * step, step):
+        if number == query.fail_at:
+            raise ValueError(number)
+        yield number
+
+
+async def on_user_created(event: UserCreated) -> None:
+    pass
+
+
+def build_mediator() -> Mediator:
+    mediator = MediatorImpl()
+    mediator.register_query_handler(GetWorkerPid, handle_get_worker_pid)
+    return mediator
+
+
+@pytest.fixture()
+async def pool() -> WorkerPool:
+    pool = WorkerPool(build_mediator, workers=2)
+    ProcessMediatorImpl(pool).register_command_handler(DivideNumbers, handle_divide_numbers)
+    ProcessMediatorImpl(pool).register_event_handler(UserCreated, on_user_created)
+    ProcessMediatorImpl(pool).register_stream_query_handler(CountNumbers, handle_count_numbers)
+    async with pool:
+        yield pool
+
+
+class TestProcessMediator:
+    async def test_round_robin_routing(self, pool: WorkerPool) -> None:
+        mediator = ProcessMediatorImpl(pool, RoundRobinRouter()).bind(additional_data="value")
+
+        worker_pids = {await mediator.query(GetWorkerPid(user_id)) for user_id in range(4)}
+        assert len(worker_pids) == 2
+        assert os.getpid() not in worker_pids
+
+    async def test_consistent_hash_routing(self, pool: WorkerPool) -> None:
+        router = ConsistentHashRouter({GetWorkerPid: lambda query: query.user_id})
+        mediator = ProcessMediatorImpl(pool, router, extra_data={"additional_data": "value"})
+
+        for user_id in range(10):
+            assert await mediator.query(GetWorkerPid(user_id)) == await mediator.query(GetWorkerPid(user_id))
+
+    async def test_results_and_exceptions(self, pool: WorkerPool) -> None:
+        mediator = ProcessMediatorImpl(pool)
+
+        assert await mediator.send(DivideNumbers(1, 2)) == 0.5
+        with pytest.raises(ZeroDivisionError):
+            await mediator.send(DivideNumbers(1, 0))
+        with pytest.raises(CommandHandlerNotFound) as err:
+            await mediator.send(NotRegisteredCommand())
+        assert err.value.request == NotRegisteredCommand()
+
+        await mediator.publish([UserCreated(1), UserCreated(2)])
+
+    async def test_streaming(self, pool: WorkerPool) -> None:
+        mediator = ProcessMediatorImpl(pool, stream_chunk_size=3).bind(step=2)
+
+        assert [number async for number in mediator.stream(CountNumbers(7))] == [0, 2, 4, 6, 8, 10, 12]
+        assert [number async for number in mediator.stream(CountNumbers(0))] == []
+
+        async with aclosing(mediator.stream(CountNumbers(1000))) as stream:
+            assert await anext(stream) == 0
+
+        with pytest.raises(ValueError):
+            [number async for number in mediator.stream(CountNumbers(10, fail_at=10))]
+        with pytest.raises(QueryHandlerNotFound):
+            [number async for number in mediator.stream(NotRegisteredStreamQuery())]
+
+    async def test_registration_after_start(self, pool: WorkerPool) -> None:
+        with pytest.raises(WorkerError):
+            ProcessMediatorImpl(pool).register_command_handler(DivideNumbers, handle_divide_numbers)
+
+
+class TestConsistentHashRouter:
+    def test_routing_is_stable(self) -> None:
+        router = ConsistentHashRouter({GetWorkerPid: lambda query: query.user_id})
+
+        routes = [router.route(GetWorkerPid(user_id), 4) for user_id in range(100)]
+        assert routes == [router.route(GetWorkerPid(user_id), 4) for user_id in range(100)]
+        assert set(routes) == {0, 1, 2, 3}
+
+    def test_adding_worker_moves_few_keys(self) -> None:
+        router = ConsistentHashRouter({GetWorkerPid: lambda query: query.user_id})
+
+        moved = sum(
+            router.route(GetWorkerPid(user_id), 4) != router.route(GetWorkerPid(user_id), 5)
+            for user_id in range(1000)
+        )
+        assert moved < 400
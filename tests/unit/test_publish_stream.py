@@ -0,0 +1,107 @@
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import pytest
+
+from didiator import Event
+from didiator.mediator import MediatorImpl
+from didiator.observers import StreamPublisher
+
+
+@dataclass(frozen=True)
+class ReadingTaken(Event):
+    sensor_id: int
+    value: int
+
+
+async def readings(count: int, sensors: int = 1, pulled: list[int] | None = None) -> AsyncIterator[ReadingTaken]:
+    for value in range(count):
+        if pulled is not None:
+            pulled.append(value)
+        yield ReadingTaken(value % sensors, value)
+
+
+class TestPublishStream:
+    async def test_events_are_published_in_order(self) -> None:
+        mediator = MediatorImpl()
+        received: list[tuple[int, str]] = []
+
+        async def handler(event: ReadingTaken, source: str) -> None:
+            received.append((event.value, source))
+
+        mediator.register_event_handler(ReadingTaken, handler)
+        metrics = await mediator.publish_stream(readings(100), source="import")
+        assert received == [(value, "import") for value in range(100)]
+        assert metrics.published == 100
+        assert metrics.failed == 0
+        assert metrics.buffered == 0
+        assert metrics.throughput > 0
+
+    async def test_read_ahead_is_bounded(self) -> None:
+        mediator = MediatorImpl()
+        pulled: list[int] = []
+        release = asyncio.Event()
+
+        async def handler(event: ReadingTaken, **kwargs: object) -> None:
+            await release.wait()
+
+        mediator.register_event_handler(ReadingTaken, handler)
+        publishing = asyncio.ensure_future(mediator.publish_stream(readings(1000, pulled=pulled), read_ahead=10))
+        await asyncio.sleep(0.01)
+        # One event is handled, ten are buffered and one waits for space in the buffer
+        assert len(pulled) == 12
+
+        release.set()
+        metrics = await publishing
+        assert metrics.published == 1000
+        assert metrics.max_lag > 0
+
+    async def test_events_with_same_key_keep_order(self) -> None:
+        mediator = MediatorImpl()
+        received: dict[int, list[int]] = {}
+        running = 0
+        max_running = 0
+
+        async def handler(event: ReadingTaken, **kwargs: object) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            received.setdefault(event.sensor_id, []).append(event.value)
+            running -= 1
+
+        mediator.register_event_handler(ReadingTaken, handler)
+        await mediator.publish_stream(readings(100, sensors=4), concurrency=4, key=lambda event: event.sensor_id)
+        assert max_running > 1
+        for sensor_id, values in received.items():
+            assert values == list(range(sensor_id, 100, 4))
+
+    async def test_errors(self) -> None:
+        mediator = MediatorImpl()
+
+        async def handler(event: ReadingTaken, **kwargs: object) -> None:
+            if event.value == 5:
+                raise ValueError("Invalid reading")
+
+        mediator.register_event_handler(ReadingTaken, handler)
+        with pytest.raises(ValueError):
+            await mediator.publish_stream(readings(10))
+
+        failed: list[ReadingTaken] = []
+        metrics = await mediator.publish_stream(readings(10), on_error=lambda event, err: failed.append(event))
+        assert failed == [ReadingTaken(0, 5)]
+        assert metrics.published == 9
+        assert metrics.failed == 1
+
+    async def test_live_metrics(self) -> None:
+        published: list[Event] = []
+
+        async def publish(event: Event) -> None:
+            published.append(event)
+
+        publisher = StreamPublisher(publish)
+        assert publisher.metrics.published == 0
+        await publisher.run(readings(5))
+        assert publisher.metrics.published == 5
+        assert len(published) == 5
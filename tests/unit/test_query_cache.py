@@ -0,0 +1,444 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import multiprocessing
+from pathlib import Path
+from typing import Any
+
+from di import bind_by_type, Container
+from di.dependent import Dependent
+from di.executors import AsyncExecutor
+import pytest
+
+from didiator import Command, Event, Query
+from didiator.cache import CachePolicy, MemoryQueryCache, QueryMemo, TagMetrics
+from didiator.cache import shared as shared_module
+from didiator.cache.shared import SharedMemoryCache
+from didiator.cache.tiered import TieredQueryCache
+from didiator.dispatchers.command import CommandDispatcherImpl
+from didiator.dispatchers.query import QueryDispatcherImpl
+from didiator.interface.cache import QueryCache
+from didiator.mediator import MediatorImpl
+from didiator.middlewares import Middleware
+from didiator.middlewares.cache import CacheInvalidationMiddleware, QueryCacheMiddleware, QueryMemoMiddleware
+from didiator.middlewares.di import DiMiddleware
+from didiator.observers.event import EventObserverImpl
+from didiator.utils.di_builder import DiBuilderImpl
+
+
+@dataclass(frozen=True)
+class GetUser(Query[str]):
+    user_id: int
+
+
+@dataclass(frozen=True)
+class RenameUser(Command[None]):
+    user_id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class UserRenamed(Event):
+    user_id: int
+
+
+class Users:
+    def __init__(self) -> None:
+        self.names = {1: "John", 2: "Jane"}
+        self.queries = 0
+        self.release: asyncio.Event | None = None
+
+    async def get_user(self, query: GetUser) -> str:
+        self.queries += 1
+        name = self.names[query.user_id]
+        if self.release is not None:
+            await self.release.wait()
+        return name
+
+    async def rename_user(self, command: RenameUser) -> None:
+        self.names[command.user_id] = command.name
+
+
+def build_mediator(cache: QueryCache, users: Users, ttl: float = 60) -> MediatorImpl:
+    invalidation = CacheInvalidationMiddleware(cache, {
+        RenameUser: lambda command: [f"user:{command.user_id}"],
+        UserRenamed: lambda event: [f"user:{event.user_id}"],
+    })
+    caching = QueryCacheMiddleware(cache, {GetUser: CachePolicy(ttl, lambda query: [f"user:{query.user_id}"])})
+    mediator = MediatorImpl(
+        CommandDispatcherImpl((invalidation,)), QueryDispatcherImpl((caching,)), EventObserverImpl((invalidation,)),
+    )
+    mediator.register_query_handler(GetUser, users.get_user)
+    mediator.register_command_handler(RenameUser, users.rename_user)
+    return mediator
+
+
+class TestQueryCache:
+    async def test_results_are_cached(self) -> None:
+        cache = MemoryQueryCache()
+        users = Users()
+        mediator = build_mediator(cache, users)
+
+        assert await mediator.query(GetUser(1)) == "John"
+        assert await mediator.query(GetUser(1)) == "John"
+        assert await mediator.query(GetUser(2)) == "Jane"
+        assert users.queries == 2
+        assert cache.metrics == {"user": TagMetrics(hits=1, misses=2, invalidations=0)}
+        assert cache.metrics["user"].hit_rate == 1 / 3
+
+    async def test_commands_invalidate_tags(self) -> None:
+        cache = MemoryQueryCache()
+        users = Users()
+        mediator = build_mediator(cache, users)
+
+        await mediator.query(GetUser(1))
+        await mediator.query(GetUser(2))
+        await mediator.send(RenameUser(1, "Bob"))
+        assert len(cache) == 1
+
+        assert await mediator.query(GetUser(1)) == "Bob"
+        assert await mediator.query(GetUser(2)) == "Jane"
+        assert users.queries == 3
+        assert cache.metrics["user"].invalidations == 1
+
+    async def test_events_invalidate_tags(self) -> None:
+        cache = MemoryQueryCache()
+        users = Users()
+        mediator = build_mediator(cache, users)
+        received: list[str] = []
+
+        async def on_user_renamed(event: UserRenamed) -> None:
+            received.append(await mediator.query(GetUser(event.user_id)))
+
+        mediator.register_event_handler(UserRenamed, on_user_renamed)
+        await mediator.query(GetUser(1))
+        users.names[1] = "Bob"
+
+        await mediator.publish(UserRenamed(1))
+        assert received == ["Bob"]
+
+    async def test_results_invalidated_while_computed_are_not_cached(self) -> None:
+        cache = MemoryQueryCache()
+        users = Users()
+        users.release = asyncio.Event()
+        mediator = build_mediator(cache, users)
+
+        query_task = asyncio.create_task(mediator.query(GetUser(1)))
+        await asyncio.sleep(0.01)
+        await mediator.send(RenameUser(1, "Bob"))
+        users.release.set()
+
+        assert await query_task == "John"
+        assert len(cache) == 0
+        assert await mediator.query(GetUser(1)) == "Bob"
+
+    async def test_entries_expire(self) -> None:
+        cache = MemoryQueryCache()
+        users = Users()
+        mediator = build_mediator(cache, users, ttl=0.01)
+
+        await mediator.query(GetUser(1))
+        await asyncio.sleep(0.02)
+        await mediator.query(GetUser(1))
+        assert users.queries == 2
+
+    async def test_size_is_bounded(self) -> None:
+        cache = MemoryQueryCache(max_entries=1)
+        cache.set("a", 1, ["tag:a"], 60)
+        cache.set("b", 2, ["tag:b"], 60)
+
+        assert len(cache) == 1
+        assert cache.get("a") is None
+        assert cache.invalidate(["tag:a"]) == 0
+        assert cache.invalidate(["tag:b"]) == 1
+
+    async def test_forgotten_invalidations_reject_old_results(self) -> None:
+        cache = MemoryQueryCache(max_invalidations=1)
+        version = cache.version()
+        cache.invalidate(["tag:a"])
+        cache.invalidate(["tag:b"])
+
+        assert not cache.set("a", 1, ["tag:a"], 60, version=version)
+        assert cache.set("a", 1, ["tag:a"], 60, version=cache.version())
+
+
+class Session:
+    def __init__(self) -> None:
+        self.closed = False
+
+
+class CountingMiddleware(Middleware):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, handler: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+        self.calls += 1
+        return await self._call(handler, request, *args, **kwargs)
+
+
+def build_refreshing_mediator(users: Users, policy: CachePolicy) -> tuple[MediatorImpl, CountingMiddleware]:
+    counting = CountingMiddleware()
+    caching = QueryCacheMiddleware(MemoryQueryCache(), {GetUser: policy})
+    mediator = MediatorImpl(query_dispatcher=QueryDispatcherImpl((caching, counting)))
+    mediator.register_query_handler(GetUser, users.get_user)
+    return mediator, counting
+
+
+class TestStaleWhileRevalidate:
+    async def test_stale_results_are_refreshed_in_background(self) -> None:
+        users = Users()
+        mediator, counting = build_refreshing_mediator(users, CachePolicy(0.01, stale_ttl=60))
+
+        await mediator.query(GetUser(1))
+        await asyncio.sleep(0.02)
+        users.names[1] = "Bob"
+        users.release = asyncio.Event()
+
+        assert await mediator.query(GetUser(1)) == "John"
+        assert await mediator.query(GetUser(1)) == "John"
+        await asyncio.sleep(0.01)
+        assert users.queries == 2
+
+        users.release.set()
+        await asyncio.sleep(0.01)
+        assert await mediator.query(GetUser(1)) == "Bob"
+        assert counting.calls == 2
+
+    async def test_hard_ttl_caps_staleness(self) -> None:
+        users = Users()
+        mediator, _ = build_refreshing_mediator(users, CachePolicy(0.01, stale_ttl=0.01))
+
+        await mediator.query(GetUser(1))
+        await asyncio.sleep(0.03)
+        users.names[1] = "Bob"
+        assert await mediator.query(GetUser(1)) == "Bob"
+
+    async def test_hot_results_are_refreshed_ahead(self) -> None:
+        users = Users()
+        mediator, _ = build_refreshing_mediator(users, CachePolicy(0.1, refresh_ahead=0.2))
+
+        await mediator.query(GetUser(1))
+        await mediator.query(GetUser(1))
+        assert users.queries == 1
+
+        await asyncio.sleep(0.03)
+        users.names[1] = "Bob"
+        assert await mediator.query(GetUser(1)) == "John"
+        await asyncio.sleep(0.01)
+        assert await mediator.query(GetUser(1)) == "Bob"
+        assert users.queries == 2
+
+    async def test_failed_refresh_keeps_stale_result(self) -> None:
+        users = Users()
+        mediator, _ = build_refreshing_mediator(users, CachePolicy(0.01, stale_ttl=60))
+
+        await mediator.query(GetUser(1))
+        await asyncio.sleep(0.02)
+        del users.names[1]
+
+        assert await mediator.query(GetUser(1)) == "John"
+        await asyncio.sleep(0.01)
+        assert await mediator.query(GetUser(1)) == "John"
+
+    async def test_refresh_has_own_di_scope(self) -> None:
+        users = Users()
+        sessions: list[Session] = []
+
+        async def open_session() -> AsyncGenerator[Session, None]:
+            session = Session()
+            sessions.append(session)
+            yield session
+            session.closed = True
+
+        async def get_user(query: GetUser, session: Session) -> str:
+            assert not session.closed
+            return await users.get_user(query)
+
+        di_container = Container()
+        di_container.bind(bind_by_type(Dependent(open_session, scope="request"), Session))
+        di_builder = DiBuilderImpl(di_container, AsyncExecutor(), ["request"])
+
+        @asynccontextmanager
+        async def refresh_scope() -> AsyncIterator[dict[str, Any]]:
+            async with di_container.enter_scope("request") as di_state:
+                yield {"di_state": di_state}
+
+        caching = QueryCacheMiddleware(
+            MemoryQueryCache(), {GetUser: CachePolicy(0.01, stale_ttl=60)}, refresh_scope=refresh_scope,
+        )
+        mediator = MediatorImpl(query_dispatcher=QueryDispatcherImpl((caching, DiMiddleware(di_builder))))
+        mediator.register_query_handler(GetUser, get_user)
+
+        async with di_container.enter_scope("request") as di_state:
+            await mediator.query(GetUser(1), di_state=di_state)
+        await asyncio.sleep(0.02)
+        users.names[1] = "Bob"
+        users.release = asyncio.Event()
+
+        async with di_container.enter_scope("request") as di_state:
+            assert await mediator.query(GetUser(1), di_state=di_state) == "John"
+        # The scope of the request is closed before the refresh is done
+        users.release.set()
+        await asyncio.sleep(0.01)
+
+        assert caching.refreshing == 0
+        assert len(sessions) == 2
+        assert all(session.closed for session in sessions)
+        async with di_container.enter_scope("request") as di_state:
+            assert await mediator.query(GetUser(1), di_state=di_state) == "Bob"
+
+
+def fill_shared_cache(path: Path) -> None:
+    shared = SharedMemoryCache(path, buckets=16)
+    shared.set(GetUser(1), "John", ["user:1"], 60)
+    shared.set(GetUser(2), "Jane", ["user:2"], 60)
+    shared.invalidate(["user:2"])
+    shared.close()
+
+
+class TestSharedMemoryCache:
+    def test_entries_are_shared_between_processes(self, tmp_path: Path) -> None:
+        shared = SharedMemoryCache(tmp_path / "cache", buckets=16)
+        shared.set(GetUser(2), "Jane", ["user:2"], 60)
+
+        process = multiprocessing.get_context("spawn").Process(target=fill_shared_cache, args=(tmp_path / "cache",))
+        process.start()
+        process.join()
+
+        entry = shared.get(GetUser(1))
+        assert entry is not None and entry.value == "John" and entry.tags == {"user:1"}
+        assert shared.get(GetUser(2)) is None
+        shared.close()
+
+    def test_local_entries_see_shared_invalidations(self, tmp_path: Path) -> None:
+        first = TieredQueryCache(MemoryQueryCache(), SharedMemoryCache(tmp_path / "cache", buckets=16))
+        second = TieredQueryCache(MemoryQueryCache(), SharedMemoryCache(tmp_path / "cache", buckets=16))
+
+        first.set(GetUser(1), "John", ["user:1"], 60)
+        entry = second.get(GetUser(1))
+        assert entry is not None and entry.value == "John"
+
+        first.invalidate(["user:1"])
+        assert second.get(GetUser(1)) is None
+        first.shared.close()
+        second.shared.close()
+
+    def test_results_invalidated_while_computed_are_not_stored(self, tmp_path: Path) -> None:
+        cache = TieredQueryCache(MemoryQueryCache(), SharedMemoryCache(tmp_path / "cache", buckets=16))
+        version = cache.version()
+        cache.invalidate(["user:1"])
+
+        assert not cache.set(GetUser(1), "John", ["user:1"], 60, version=version)
+        assert cache.set(GetUser(2), "Jane", ["user:2"], 60, version=version)
+        cache.shared.close()
+
+    def test_entries_are_dropped_after_reboot(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        shared = SharedMemoryCache(tmp_path / "cache", buckets=16)
+        shared.set(GetUser(1), "John", ["user:1"], 60)
+        shared.invalidate(["user:2"])
+        shared.close()
+        # Another boot id means the stored times belong to another monotonic clock
+        monkeypatch.setattr(shared_module, "_get_boot_id", lambda: b"\xff" * 16)
+
+        shared = SharedMemoryCache(tmp_path / "cache", buckets=16)
+        assert shared.get(GetUser(1)) is None
+        assert shared.version() == 0
+        shared.set(GetUser(1), "John", ["user:1"], 60)
+        shared.close()
+
+        shared = SharedMemoryCache(tmp_path / "cache", buckets=16)
+        assert shared.get(GetUser(1)) is not None
+        shared.close()
+
+    def test_clock_eviction(self, tmp_path: Path) -> None:
+        shared = SharedMemoryCache(tmp_path / "cache", buckets=1, ways=2)
+        shared.set("a", 1, [], 60)
+        shared.set("b", 2, [], 60)
+        assert shared.get("a") is not None
+
+        shared.set("c", 3, [], 60)
+        assert shared.get("a") is not None
+        assert shared.get("b") is None
+        assert shared.get("c") is not None
+        shared.close()
+
+    def test_large_values_are_not_stored(self, tmp_path: Path) -> None:
+        shared = SharedMemoryCache(tmp_path / "cache", buckets=16, slot_size=256)
+        assert not shared.set("a", "x" * shared.max_value_size, [], 60)
+        assert shared.get("a") is None
+        shared.close()
+
+    def test_layout_is_checked(self, tmp_path: Path) -> None:
+        SharedMemoryCache(tmp_path / "cache", buckets=16).close()
+        with pytest.raises(ValueError):
+            SharedMemoryCache(tmp_path / "cache", buckets=32)
+
+    async def test_query_middleware(self, tmp_path: Path) -> None:
+        users = Users()
+        cache = TieredQueryCache(MemoryQueryCache(), SharedMemoryCache(tmp_path / "cache", buckets=16))
+        mediator = build_mediator(cache, users)
+
+        await mediator.query(GetUser(1))
+        await mediator.send(RenameUser(1, "Bob"))
+        assert await mediator.query(GetUser(1)) == "Bob"
+        assert await mediator.query(GetUser(1)) == "Bob"
+        assert users.queries == 2
+        cache.shared.close()
+
+
+def build_memo_mediator(users: Users) -> MediatorImpl:
+    memoization = QueryMemoMiddleware()
+    mediator = MediatorImpl(
+        CommandDispatcherImpl((memoization,)), QueryDispatcherImpl((memoization,)),
+        EventObserverImpl((memoization,)),
+    )
+    mediator.register_query_handler(GetUser, users.get_user)
+    mediator.register_command_handler(RenameUser, users.rename_user)
+    return mediator
+
+
+class TestQueryMemo:
+    async def test_equal_queries_run_once_per_memo(self) -> None:
+        users = Users()
+        mediator = build_memo_mediator(users)
+        scoped_mediator = mediator.bind(query_memo=QueryMemo())
+
+        assert await scoped_mediator.query(GetUser(1)) == "John"
+        assert await scoped_mediator.query(GetUser(1)) == "John"
+        assert await scoped_mediator.query(GetUser(2)) == "Jane"
+        assert users.queries == 2
+
+        await mediator.bind(query_memo=QueryMemo()).query(GetUser(1))
+        await mediator.query(GetUser(1))
+        assert users.queries == 4
+
+    async def test_concurrent_equal_queries(self) -> None:
+        users = Users()
+        users.release = asyncio.Event()
+        scoped_mediator = build_memo_mediator(users).bind(query_memo=QueryMemo())
+
+        tasks = [asyncio.create_task(scoped_mediator.query(GetUser(1))) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        users.release.set()
+        assert await asyncio.gather(*tasks) == ["John"] * 3
+        assert users.queries == 1
+
+    async def test_commands_clear_memo(self) -> None:
+        users = Users()
+        memo = QueryMemo()
+        scoped_mediator = build_memo_mediator(users).bind(query_memo=memo)
+
+        await scoped_mediator.query(GetUser(1))
+        await scoped_mediator.send(RenameUser(1, "Bob"))
+        assert len(memo) == 0
+        assert await scoped_mediator.query(GetUser(1)) == "Bob"
+
+    async def test_failed_queries_are_not_memoized(self) -> None:
+        users = Users()
+        scoped_mediator = build_memo_mediator(users).bind(query_memo=QueryMemo())
+
+        with pytest.raises(KeyError):
+            await scoped_mediator.query(GetUser(3))
+        users.names[3] = "Jim"
+        assert await scoped_mediator.query(GetUser(3)) == "Jim"
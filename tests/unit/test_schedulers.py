@@ -0,0 +1,212 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from didiator import Command, Query
+from didiator.dispatchers.command import CommandDispatcherImpl
+from didiator.dispatchers.query import QueryDispatcherImpl
+from didiator.mediator import MediatorImpl
+from didiator.middlewares.scheduler import SchedulerMiddleware
+from didiator.schedulers import FairScheduler, LaneMetrics, PriorityScheduler, TenantMetrics
+
+
+@dataclass(frozen=True)
+class Backfill(Command[None]):
+    name: str
+
+
+@dataclass(frozen=True)
+class GetProfile(Query[str]):
+    name: str
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.release = asyncio.Event()
+
+    async def handle(self, name: str) -> str:
+        self.started.append(name)
+        await self.release.wait()
+        return name
+
+
+def build_mediator(scheduler: PriorityScheduler, recorder: Recorder) -> MediatorImpl:
+    middlewares = (SchedulerMiddleware(scheduler),)
+    mediator = MediatorImpl(CommandDispatcherImpl(middlewares), QueryDispatcherImpl(middlewares))
+
+    async def handle_backfill(command: Backfill) -> None:
+        await recorder.handle(command.name)
+
+    async def handle_get_profile(query: GetProfile) -> str:
+        return await recorder.handle(query.name)
+
+    mediator.register_command_handler(Backfill, handle_backfill)
+    mediator.register_query_handler(GetProfile, handle_get_profile)
+    return mediator
+
+
+async def wait_started(recorder: Recorder, count: int) -> None:
+    while len(recorder.started) < count:
+        await asyncio.sleep(0)
+
+
+class TestPriorityScheduler:
+    async def test_priorities(self) -> None:
+        recorder = Recorder()
+        scheduler = PriorityScheduler(1, priorities={GetProfile: 10}, aging_rate=0)
+        mediator = build_mediator(scheduler, recorder)
+
+        tasks = [asyncio.create_task(mediator.send(Backfill("first")))]
+        await wait_started(recorder, 1)
+        tasks += [
+            asyncio.create_task(mediator.send(Backfill("low"))),
+            asyncio.create_task(mediator.query(GetProfile("high"))),
+            asyncio.create_task(mediator.bind(priority=20).send(Backfill("bound"))),
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.metrics == {"default": LaneMetrics(concurrency=1, running=1, waiting=3)}
+
+        recorder.release.set()
+        await asyncio.gather(*tasks)
+        assert recorder.started == ["first", "bound", "high", "low"]
+        assert scheduler.metrics == {"default": LaneMetrics(concurrency=1, running=0, waiting=0)}
+
+    async def test_aging(self) -> None:
+        recorder = Recorder()
+        scheduler = PriorityScheduler(1, priorities={GetProfile: 1}, aging_rate=100)
+        mediator = build_mediator(scheduler, recorder)
+
+        tasks = [asyncio.create_task(mediator.send(Backfill("first")))]
+        await wait_started(recorder, 1)
+        tasks.append(asyncio.create_task(mediator.send(Backfill("old"))))
+        await asyncio.sleep(0.05)
+        tasks.append(asyncio.create_task(mediator.query(GetProfile("new"))))
+        await asyncio.sleep(0)
+
+        recorder.release.set()
+        await asyncio.gather(*tasks)
+        assert recorder.started == ["first", "old", "new"]
+
+    async def test_lane_budgets(self) -> None:
+        recorder = Recorder()
+        scheduler = PriorityScheduler({"default": 1, "batch": 2}, lanes={Backfill: "batch"})
+        mediator = build_mediator(scheduler, recorder)
+
+        tasks = [asyncio.create_task(mediator.send(Backfill(str(number)))) for number in range(5)]
+        tasks.append(asyncio.create_task(mediator.query(GetProfile("interactive"))))
+        await wait_started(recorder, 3)
+        assert sorted(recorder.started) == ["0", "1", "interactive"]
+        assert scheduler.metrics["batch"] == LaneMetrics(concurrency=2, running=2, waiting=3)
+
+        recorder.release.set()
+        await asyncio.gather(*tasks)
+
+        with pytest.raises(ValueError):
+            PriorityScheduler({"batch": 1}, lanes={Backfill: "batch"})
+
+    async def test_nested_requests_and_cancellation(self) -> None:
+        scheduler = PriorityScheduler(1)
+        middlewares = (SchedulerMiddleware(scheduler),)
+        mediator = MediatorImpl(CommandDispatcherImpl(middlewares), QueryDispatcherImpl(middlewares))
+        release = asyncio.Event()
+
+        async def handle_backfill(command: Backfill) -> None:
+            await release.wait()
+            # The nested query uses the slot of the command, its priority isn't passed to the handler
+            assert await mediator.query(GetProfile(command.name), priority=5) == command.name
+
+        async def handle_get_profile(query: GetProfile) -> str:
+            return query.name
+
+        mediator.register_command_handler(Backfill, handle_backfill)
+        mediator.register_query_handler(GetProfile, handle_get_profile)
+
+        running = asyncio.create_task(mediator.send(Backfill("running")))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(mediator.send(Backfill("cancelled")))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        release.set()
+        await running
+        assert await asyncio.wait_for(mediator.send(Backfill("next")), 1) is None
+        assert scheduler.metrics["default"].running == 0
+
+
+class TestFairScheduler:
+    async def test_weighted_fairness(self) -> None:
+        scheduler = FairScheduler(1, weights={"big": 2})
+        middlewares = (SchedulerMiddleware(scheduler),)
+        mediator = MediatorImpl(CommandDispatcherImpl(middlewares))
+        started: list[str] = []
+
+        async def handle_backfill(command: Backfill, tenant_id: str) -> None:
+            started.append(tenant_id)
+            await asyncio.sleep(0)
+
+        mediator.register_command_handler(Backfill, handle_backfill)
+        noisy, big, small = (mediator.bind(tenant_id=tenant_id) for tenant_id in ("noisy", "big", "small"))
+
+        tasks = [asyncio.create_task(noisy.send(Backfill(str(number)))) for number in range(20)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(big.send(Backfill(str(number)))) for number in range(4)]
+        tasks += [asyncio.create_task(small.send(Backfill(str(number)))) for number in range(2)]
+        await asyncio.gather(*tasks)
+
+        # Requests of quiet tenants don't wait for all requests of the noisy one
+        assert started[:10] == ["noisy", "noisy", "big", "big", "small", "noisy", "big", "big", "small", "noisy"]
+        # Delays are kept after tenants become idle
+        metrics = scheduler.metrics
+        assert metrics["small"].max_delay < metrics["noisy"].max_delay
+        assert metrics["noisy"].started == 20
+        assert metrics["noisy"].average_delay > 0
+
+    async def test_in_flight_caps(self) -> None:
+        scheduler = FairScheduler(4, max_in_flight={"noisy": 1})
+        recorder = Recorder()
+        middlewares = (SchedulerMiddleware(scheduler),)
+        mediator = MediatorImpl(CommandDispatcherImpl(middlewares))
+
+        async def handle_backfill(command: Backfill, tenant_id: str) -> None:
+            await recorder.handle(f"{tenant_id}_{command.name}")
+
+        mediator.register_command_handler(Backfill, handle_backfill)
+        tasks = [
+            asyncio.create_task(mediator.bind(tenant_id="noisy").send(Backfill(str(number)))) for number in range(3)
+        ]
+        tasks.append(asyncio.create_task(mediator.bind(tenant_id="quiet").send(Backfill("0"))))
+        await wait_started(recorder, 2)
+        await asyncio.sleep(0.01)
+
+        assert recorder.started == ["noisy_0", "quiet_0"]
+        assert scheduler.metrics["noisy"] == TenantMetrics(
+            in_flight=1, waiting=2, started=1, total_delay=0.0, max_delay=0.0,
+        )
+        recorder.release.set()
+        await asyncio.gather(*tasks)
+        assert scheduler.running == 0
+        # Idle tenants are dropped from scheduling, their metrics are kept
+        assert not scheduler._tenants
+        noisy = scheduler.metrics["noisy"]
+        assert (noisy.in_flight, noisy.waiting, noisy.started) == (0, 0, 3)
+
+    async def test_tracked_tenants_are_capped(self) -> None:
+        scheduler = FairScheduler(max_tracked_tenants=2)
+        mediator = MediatorImpl(CommandDispatcherImpl((SchedulerMiddleware(scheduler),)))
+
+        async def handle_backfill(command: Backfill, tenant_id: str) -> None:
+            pass
+
+        mediator.register_command_handler(Backfill, handle_backfill)
+        for tenant_id in ("a", "b", "a", "c"):
+            await mediator.bind(tenant_id=tenant_id).send(Backfill(tenant_id))
+
+        assert {key: metrics.started for key, metrics in scheduler.metrics.items()} == {"a": 2, "c": 1}
+
+    def test_weights_validation(self) -> None:
+        with pytest.raises(ValueError):
+            FairScheduler(default_weight=0)
+        with pytest.raises(ValueError):
+            FairScheduler(weights={"free": -1})
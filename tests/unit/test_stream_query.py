@@ -0,0 +1,137 @@
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass
+import logging
+
+from di import bind_by_type, Container
+from di.dependent import Dependent
+from di.executors import AsyncExecutor
+import pytest
+
+from didiator import QueryDispatcherImpl, StreamQuery, StreamQueryHandler
+from didiator.interface.exceptions import QueryHandlerNotFound
+from didiator.mediator import MediatorImpl
+from didiator.middlewares.di import DiMiddleware, DiScopes
+from didiator.middlewares.logging import LoggingMiddleware
+from didiator.utils.di_builder import DiBuilderImpl
+from tests.mocks.middlewares import DataAdderMiddlewareMock
+
+
+@dataclass(frozen=True)
+class ExportUsers(StreamQuery[int]):
+    count: int
+
+
+@dataclass(frozen=True)
+class NotRegisteredQuery(StreamQuery[int]):
+    pass
+
+
+class Session:
+    def __init__(self) -> None:
+        self.closed = False
+        self.read_rows = 0
+
+
+class ExportUsersHandler(StreamQueryHandler[ExportUsers, int]):
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    async def __call__(self, query: ExportUsers) -> AsyncIterator[int]:
+        for user_id in range(query.count):
+            assert not self._session.closed
+            self._session.read_rows += 1
+            yield user_id
+
+
+async def handle_export_users(query: ExportUsers, session: Session) -> AsyncIterator[int]:
+    for user_id in range(query.count):
+        assert not session.closed
+        session.read_rows += 1
+        yield user_id
+
+
+def build_di(sessions: list[Session]) -> tuple[Container, DiBuilderImpl]:
+    async def build_session() -> AsyncGenerator[Session, None]:
+        session = Session()
+        sessions.append(session)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+    di_container = Container()
+    di_container.bind(bind_by_type(Dependent(build_session, scope="request"), Session))
+    return di_container, DiBuilderImpl(di_container, AsyncExecutor(), ["app", "request"])
+
+
+class TestStreamQuery:
+    async def test_streaming(self) -> None:
+        session = Session()
+        query_dispatcher = QueryDispatcherImpl()
+        query_dispatcher.register_stream_handler(ExportUsers, ExportUsersHandler(session))
+
+        assert [user_id async for user_id in query_dispatcher.stream(ExportUsers(3))] == [0, 1, 2]
+
+    async def test_streaming_is_lazy(self) -> None:
+        session = Session()
+        mediator = MediatorImpl()
+        mediator.register_stream_query_handler(ExportUsers, ExportUsersHandler(session))
+
+        async with aclosing(mediator.stream(ExportUsers(1000))) as stream:
+            async for user_id in stream:
+                if user_id == 1:
+                    break
+
+        assert session.read_rows == 2
+
+    @pytest.mark.parametrize("handler", [ExportUsersHandler, handle_export_users])
+    async def test_di_scope_lifetime(self, handler: StreamQueryHandler[ExportUsers, int]) -> None:
+        sessions: list[Session] = []
+        di_container, di_builder = build_di(sessions)
+        query_dispatcher = QueryDispatcherImpl(middlewares=(
+            LoggingMiddleware(), DiMiddleware(di_builder, scopes=DiScopes(func_handler="request")),
+        ))
+        mediator = MediatorImpl(query_dispatcher=query_dispatcher)
+        mediator.register_stream_query_handler(ExportUsers, handler)
+
+        async with di_container.enter_scope("app") as di_state:
+            scoped_mediator = mediator.bind(di_state=di_state)
+
+            assert [user_id async for user_id in scoped_mediator.stream(ExportUsers(3))] == [0, 1, 2]
+            assert sessions[0].closed
+
+            async with aclosing(scoped_mediator.stream(ExportUsers(3))) as stream:
+                assert await anext(stream) == 0
+                assert not sessions[1].closed
+            assert sessions[1].closed
+            assert sessions[1].read_rows == 1
+
+    async def test_logging_middleware(self, caplog: pytest.LogCaptureFixture) -> None:
+        query_dispatcher = QueryDispatcherImpl(middlewares=(LoggingMiddleware(level=logging.INFO),))
+        query_dispatcher.register_stream_handler(ExportUsers, ExportUsersHandler(Session()))
+
+        with caplog.at_level(logging.INFO):
+            assert [user_id async for user_id in query_dispatcher.stream(ExportUsers(2))] == [0, 1]
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Stream ExportUsers query", "Query ExportUsers streamed. Items: 2",
+        ]
+
+    async def test_middleware_without_stream(self) -> None:
+        received: list[dict[str, int]] = []
+
+        async def handle(query: ExportUsers, **kwargs: int) -> AsyncIterator[int]:
+            received.append(kwargs)
+            for user_id in range(query.count):
+                yield user_id
+
+        query_dispatcher = QueryDispatcherImpl(middlewares=(DataAdderMiddlewareMock(extra=1),))
+        query_dispatcher.register_stream_handler(ExportUsers, handle)
+
+        assert [user_id async for user_id in query_dispatcher.stream(ExportUsers(2))] == [0, 1]
+        assert received == [{"extra": 1}]
+
+    def test_streaming_not_registered_query(self, query_dispatcher: QueryDispatcherImpl) -> None:
+        with pytest.raises(QueryHandlerNotFound):
+            query_dispatcher.stream(NotRegisteredQuery())
@@ -0,0 +1,150 @@
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from didiator import Command, Event
+from didiator.mediator import MediatorImpl
+from didiator.observers import EventStream, Sliding, Tumbling, WindowResult
+
+# Windows of the tests end in the future, so they are closed only by flush
+BASE = (time.time() // 1000 + 10) * 1000
+
+
+@dataclass(frozen=True)
+class PageViewed(Event):
+    page: str
+    at: float
+
+
+@dataclass(frozen=True)
+class PageViewsCounted(Event):
+    page: str
+    start: float
+    views: int
+
+
+@dataclass(frozen=True)
+class NotifyAdmin(Command[None]):
+    page: str
+
+
+def count(views: int, _: Any) -> int:
+    return views + 1
+
+
+class TestStreamWindows:
+    async def test_tumbling_window_counts_per_key(self) -> None:
+        mediator = MediatorImpl()
+        counted: list[PageViewsCounted] = []
+
+        async def on_counted(event: PageViewsCounted, **kwargs: Any) -> None:
+            counted.append(event)
+
+        processor = (
+            EventStream()
+            .filter(lambda event: not event.page.startswith("/admin"))
+            .key_by(lambda event: event.page)
+            .window(Tumbling(10), count, 0, timestamp=lambda event: event.at)
+            .emit(lambda result: [
+                PageViewsCounted(page, result.start, views) for page, views in result.values.items()
+            ], mediator)
+        )
+        mediator.subscribe(PageViewed, processor)
+        mediator.subscribe(PageViewsCounted, on_counted)
+
+        await mediator.publish([
+            PageViewed("/", BASE), PageViewed("/about", BASE + 3), PageViewed("/", BASE + 9),
+            PageViewed("/admin", BASE + 5), PageViewed("/", BASE + 12),
+        ])
+        assert processor.open_windows == 2
+        assert processor.entries == 3
+
+        await processor.flush()
+        assert counted == [
+            PageViewsCounted("/", BASE, 2), PageViewsCounted("/about", BASE, 1), PageViewsCounted("/", BASE + 10, 1),
+        ]
+        assert processor.open_windows == 0
+        assert processor.entries == 0
+
+    async def test_sliding_window(self) -> None:
+        mediator = MediatorImpl()
+        results: list[WindowResult[int]] = []
+        processor = (
+            EventStream()
+            .key_by(lambda event: event.page)
+            .window(Sliding(10, 5), count, 0, timestamp=lambda event: event.at)
+            .emit(results.append, mediator)
+        )
+        mediator.subscribe(PageViewed, processor)
+        await mediator.publish([PageViewed("/", BASE + 6), PageViewed("/about", BASE + 7), PageViewed("/", BASE + 11)])
+        await processor.flush()
+
+        assert [(result.start - BASE, result.end - BASE, dict(result.values)) for result in results] == [
+            (0, 10, {"/": 1, "/about": 1}),
+            (5, 15, {"/": 2, "/about": 1}),
+            (10, 20, {"/": 1}),
+        ]
+
+    async def test_fractional_slide(self) -> None:
+        mediator = MediatorImpl()
+        results: list[WindowResult[int]] = []
+        processor = EventStream().window(Sliding(0.3, 0.1), count, 0, timestamp=lambda event: event.at).emit(
+            results.append, mediator,
+        )
+        mediator.subscribe(PageViewed, processor)
+        # Starts of the window computed for these timestamps differ by a rounding error
+        await mediator.publish([PageViewed("/", 0.35), PageViewed("/", 0.25)])
+        await processor.flush()
+
+        assert [(round(result.start, 6), result.values[None]) for result in results] == [
+            (0.0, 1), (0.1, 2), (0.2, 2), (0.3, 1),
+        ]
+
+    async def test_state_is_capped(self) -> None:
+        mediator = MediatorImpl()
+        results: list[WindowResult[int]] = []
+        processor = (
+            EventStream()
+            .key_by(lambda event: event.page)
+            .window(Tumbling(10), count, 0, timestamp=lambda event: event.at, max_entries=2)
+            .emit(results.append, mediator)
+        )
+        mediator.subscribe(PageViewed, processor)
+        await mediator.publish([PageViewed(page, BASE) for page in ("/a", "/b", "/c", "/a")])
+        assert processor.dropped == 1
+        await processor.flush()
+        assert results[0].values == {"/a": 2, "/b": 1}
+
+        # Events of closed windows are late
+        await mediator.publish(PageViewed("/a", BASE + 1))
+        assert processor.late == 1
+
+    async def test_windows_are_closed_by_timers(self) -> None:
+        mediator = MediatorImpl()
+        results: list[WindowResult[int]] = []
+        processor = EventStream().window(Tumbling(0.02), count, 0).emit(results.append, mediator)
+        mediator.subscribe(PageViewed, processor)
+        await mediator.publish([PageViewed("/", 0), PageViewed("/", 0)])
+
+        await asyncio.sleep(0.05)
+        assert sum(result.values[None] for result in results) == 2
+        assert processor.open_windows == 0
+
+    async def test_commands_are_sent_without_window(self) -> None:
+        mediator = MediatorImpl()
+        notified: list[str] = []
+
+        async def notify_admin(command: NotifyAdmin, **kwargs: Any) -> None:
+            notified.append(command.page)
+
+        mediator.register_command_handler(NotifyAdmin, notify_admin)
+        processor = (
+            EventStream()
+            .map(lambda event: event.page)
+            .filter(lambda page: page.startswith("/admin"))
+            .emit(NotifyAdmin, mediator)
+        )
+        mediator.subscribe(PageViewed, processor)
+        await mediator.publish([PageViewed("/", BASE), PageViewed("/admin/users", BASE)])
+        assert notified == ["/admin/users"]
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+import gc
+import time
+
+import pytest
+
+from didiator import Event
+from didiator.interface.observers.event import Subscription
+from didiator.mediator import MediatorImpl
+from didiator.observers.event import EventObserverImpl
+from didiator.observers.fanout import SubscriberQueue
+
+
+@dataclass(frozen=True)
+class MessageSent(Event):
+    chat_id: int
+
+
+@dataclass(frozen=True)
+class PrivateMessageSent(MessageSent):
+    pass
+
+
+class Session:
+    def __init__(self, received: list[tuple[str, Event]], name: str) -> None:
+        self.received = received
+        self.name = name
+
+    async def on_message(self, event: MessageSent) -> None:
+        self.received.append((self.name, event))
+
+
+class TestSubscriptions:
+    async def test_unsubscribe(self) -> None:
+        received: list[tuple[str, Event]] = []
+        mediator = MediatorImpl()
+        first = mediator.subscribe(MessageSent, Session(received, "first").on_message)
+        with mediator.subscribe(MessageSent, Session(received, "second").on_message):
+            await mediator.publish(MessageSent(1))
+
+        assert first.active
+        assert first.unsubscribe()
+        assert not first.active
+        assert not first.unsubscribe()
+
+        await mediator.publish(MessageSent(2))
+        assert received == [("first", MessageSent(1)), ("second", MessageSent(1))]
+
+    async def test_listeners_keep_subscription_order(self) -> None:
+        received: list[tuple[str, Event]] = []
+        mediator = MediatorImpl()
+        mediator.subscribe(PrivateMessageSent, Session(received, "private").on_message)
+        mediator.subscribe(MessageSent, Session(received, "all").on_message)
+        mediator.subscribe(PrivateMessageSent, Session(received, "private2").on_message)
+
+        await mediator.publish([PrivateMessageSent(1), MessageSent(2)])
+        assert [name for name, _ in received] == ["private", "all", "private2", "all"]
+
+    async def test_unsubscribe_during_flush(self) -> None:
+        received: list[tuple[str, Event]] = []
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        subscriptions: list[Subscription] = []
+
+        async def on_message_once(event: MessageSent) -> None:
+            received.append(("once", event))
+            for subscription in subscriptions:
+                subscription.unsubscribe()
+
+        subscriptions.append(mediator.subscribe(MessageSent, on_message_once, queue=SubscriberQueue()))
+        subscriptions.append(mediator.subscribe(PrivateMessageSent, Session(received, "private").on_message))
+        mediator.subscribe(MessageSent, Session(received, "all").on_message, queue=SubscriberQueue())
+
+        await mediator.publish(MessageSent(1))
+        await event_observer.flush()
+        assert sorted(name for name, _ in received) == ["all", "once"]
+        assert all(not subscription.active for subscription in subscriptions)
+
+    async def test_weak_listeners_are_removed_with_their_owners(self) -> None:
+        received: list[tuple[str, Event]] = []
+        event_observer = EventObserverImpl()
+        mediator = MediatorImpl(event_observer=event_observer)
+        session = Session(received, "weak")
+        subscription = mediator.bind(user_id=1).subscribe(MessageSent, session.on_message, weak=True)
+
+        await mediator.publish(MessageSent(1))
+        del session
+        gc.collect()
+        await mediator.publish(MessageSent(2))
+
+        assert received == [("weak", MessageSent(1))]
+        assert not subscription.active
+        assert event_observer.listeners == ()
+
+    async def test_sync_handlers_can_not_be_weak(self) -> None:
+        def on_message(event: MessageSent) -> None:
+            pass
+
+        with pytest.raises(ValueError):
+            MediatorImpl().subscribe(MessageSent, on_message, weak=True)
+
+    async def test_many_short_lived_subscriptions(self) -> None:
+        received: list[tuple[str, Event]] = []
+        mediator = MediatorImpl()
+        mediator.subscribe(PrivateMessageSent, Session(received, "private").on_message)
+        subscriptions = [mediator.subscribe(MessageSent, Session(received, "all").on_message) for _ in range(100_000)]
+
+        started_at = time.perf_counter()
+        for subscription in subscriptions:
+            subscription.unsubscribe()
+        assert time.perf_counter() - started_at < 1
+
+        await mediator.publish(PrivateMessageSent(1))
+        assert received == [("private", PrivateMessageSent(1))]
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+import threading
+
+from di import bind_by_type, Container
+from di.dependent import Dependent
+from di.executors import AsyncExecutor
+
+from didiator import Command, CommandHandler, Event, EventObserverImpl, Query
+from didiator.dispatchers.command import CommandDispatcherImpl
+from didiator.dispatchers.query import QueryDispatcherImpl
+from didiator.executors import ThreadPool
+from didiator.mediator import MediatorImpl
+from didiator.middlewares.di import DiMiddleware, DiScopes
+from didiator.utils.di_builder import DiBuilderImpl
+from tests.mocks.middlewares import DataAdderMiddlewareMock
+
+
+@dataclass
+class GetThreadName(Query[str]):
+    pass
+
+
+@dataclass
+class CreateUser(Command[int]):
+    user_id: int
+
+
+@dataclass
+class UserCreated(Event):
+    user_id: int
+
+
+class UserRepo:
+    def __init__(self) -> None:
+        self.users: list[int] = []
+
+
+def handle_get_thread_name(query: GetThreadName) -> str:
+    return threading.current_thread().name
+
+
+class CreateUserHandler(CommandHandler[CreateUser, int]):
+    def __init__(self, repo: UserRepo) -> None:
+        self._repo = repo
+
+    def __call__(self, command: CreateUser) -> int:  # type: ignore[override]
+        assert threading.current_thread() is not threading.main_thread()
+        self._repo.users.append(command.user_id)
+        return command.user_id
+
+
+def handle_create_user_with_data(command: CreateUser, additional_data: str = "") -> str:
+    return additional_data
+
+
+class TestSyncHandlers:
+    async def test_sync_function_handler(self) -> None:
+        query_dispatcher = QueryDispatcherImpl()
+        query_dispatcher.register_handler(GetThreadName, handle_get_thread_name)
+
+        assert await query_dispatcher.query(GetThreadName()) != threading.main_thread().name
+
+    async def test_sync_handler_with_executor(self) -> None:
+        pool = ThreadPool(2, thread_name_prefix="sync-handlers")
+        query_dispatcher = QueryDispatcherImpl()
+        query_dispatcher.register_handler(GetThreadName, handle_get_thread_name, executor=pool)
+
+        assert (await query_dispatcher.query(GetThreadName())).startswith("sync-handlers")
+        assert pool.metrics.max_workers == 2
+        assert pool.metrics.workers == 1
+        assert pool.metrics.completed == 1
+        assert pool.metrics.queue_depth == 0
+        assert pool.metrics.running == 0
+        pool.shutdown()
+
+    async def test_sync_handler_with_request_type_executor(self) -> None:
+        pool = ThreadPool(1, thread_name_prefix="get-thread-name")
+        query_dispatcher = QueryDispatcherImpl(executors={GetThreadName: pool})
+        query_dispatcher.register_handler(GetThreadName, handle_get_thread_name)
+
+        assert (await query_dispatcher.query(GetThreadName())).startswith("get-thread-name")
+        pool.shutdown()
+
+    async def test_sync_handler_with_middlewares(self) -> None:
+        command_dispatcher = CommandDispatcherImpl(middlewares=(DataAdderMiddlewareMock(additional_data="value"),))
+        command_dispatcher.register_handler(CreateUser, handle_create_user_with_data)
+
+        assert await command_dispatcher.send(CreateUser(1)) == "value"
+
+    async def test_sync_class_handler_with_di(self) -> None:
+        di_container = Container()
+        di_container.bind(bind_by_type(Dependent(UserRepo, scope="request"), UserRepo))
+        di_builder = DiBuilderImpl(di_container, AsyncExecutor(), ["request"])
+        middlewares = (DiMiddleware(di_builder, scopes=DiScopes("request")),)
+
+        mediator = MediatorImpl(CommandDispatcherImpl(middlewares), event_observer=EventObserverImpl(middlewares))
+        mediator.register_command_handler(CreateUser, CreateUserHandler)
+
+        published: list[str] = []
+
+        def on_user_created(event: UserCreated, repo: UserRepo) -> None:
+            published.append(threading.current_thread().name)
+
+        mediator.register_event_handler(UserCreated, on_user_created)
+
+        async with di_container.enter_scope("request") as di_state:
+            scoped_mediator = mediator.bind(di_state=di_state)
+            assert await scoped_mediator.send(CreateUser(1)) == 1
+            await scoped_mediator.publish(UserCreated(1))
+
+        assert len(published) == 1
+        assert published[0] != threading.main_thread().name
@@ -0,0 +1,129 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+import random
+
+import pytest
+
+from didiator import Command
+from didiator.mediator import MediatorImpl
+from didiator.timers import CommandTimers, SqliteTimerStorage, TimingWheel
+from didiator.timers.wheel import WheelEntry
+
+
+@dataclass(frozen=True)
+class SendReminder(Command[None]):
+    user_id: int
+
+
+def build_mediator(received: list[tuple[int, str | None]]) -> MediatorImpl:
+    mediator = MediatorImpl()
+
+    async def send_reminder(command: SendReminder, channel: str | None = None) -> None:
+        received.append((command.user_id, channel))
+
+    mediator.register_command_handler(SendReminder, send_reminder)
+    return mediator
+
+
+@asynccontextmanager
+async def running(timers: CommandTimers) -> AsyncIterator[CommandTimers]:
+    task = asyncio.create_task(timers.run())
+    await asyncio.sleep(0)
+    try:
+        yield timers
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await timers.close()
+
+
+class TestTimingWheel:
+    def test_entries_expire_on_their_ticks(self) -> None:
+        rnd = random.Random(0)
+        wheel: TimingWheel[WheelEntry] = TimingWheel(slots=4, levels=3, start=1000)
+        entries = [WheelEntry(1000 + rnd.randint(-2, 500)) for _ in range(200)]
+        for entry in entries:
+            wheel.schedule(entry)
+        for entry in entries[::4]:
+            assert wheel.cancel(entry)
+        assert len(wheel) == 150
+
+        expired: dict[int, int] = {}
+        while (tick := wheel.next_tick()) is not None:
+            for entry in wheel.advance(tick):
+                expired[id(entry)] = tick
+
+        for index, entry in enumerate(entries):
+            if index % 4:
+                assert expired[id(entry)] == max(entry.deadline, 1001)
+            else:
+                assert id(entry) not in expired
+
+    def test_idle_ticks_are_skipped(self) -> None:
+        wheel: TimingWheel[WheelEntry] = TimingWheel()
+        assert wheel.advance(10 ** 12) == []
+        assert wheel.current == 10 ** 12
+
+
+class TestCommandTimers:
+    async def test_send_later(self) -> None:
+        received: list[tuple[int, str | None]] = []
+        async with running(CommandTimers(build_mediator(received), resolution=0.005)) as timers:
+            await timers.send_later(SendReminder(2), 0.03)
+            await timers.send_later(SendReminder(1), 0.01, channel="email")
+            await timers.send_at(SendReminder(3), datetime.now() + timedelta(seconds=0.02))
+            assert timers.pending == 3
+
+            await asyncio.sleep(0.06)
+            assert received == [(1, "email"), (3, None), (2, None)]
+            assert timers.pending == 0
+
+    async def test_cancel(self) -> None:
+        received: list[tuple[int, str | None]] = []
+        async with running(CommandTimers(build_mediator(received), resolution=0.005)) as timers:
+            timer = await timers.send_later(SendReminder(1), 0.01)
+            await timers.send_later(SendReminder(2), 0.01, timer_id="reminder-2")
+            assert await timers.cancel(timer)
+            assert await timers.cancel("reminder-2")
+            assert not await timers.cancel(timer)
+
+            await asyncio.sleep(0.03)
+            assert received == []
+
+    async def test_send_every(self) -> None:
+        received: list[tuple[int, str | None]] = []
+        async with running(CommandTimers(build_mediator(received), resolution=0.005)) as timers:
+            timer = await timers.send_every(SendReminder(1), 0.02)
+            await asyncio.sleep(0.07)
+            await timers.cancel(timer)
+            sent = len(received)
+            assert 2 <= sent <= 4
+
+            await asyncio.sleep(0.04)
+            assert len(received) == sent
+
+    async def test_timers_survive_restart(self, tmp_path: Path) -> None:
+        storage = SqliteTimerStorage(tmp_path / "timers.db")
+        timers = CommandTimers(build_mediator([]), storage=storage)
+        await timers.send_later(SendReminder(1), 0.01, channel="sms")
+        await timers.send_later(SendReminder(2), 3600, timer_id="reminder-2")
+        cancelled = await timers.send_later(SendReminder(3), 0.01)
+        await timers.cancel(cancelled)
+        await storage.close()
+
+        await asyncio.sleep(0.02)
+        received: list[tuple[int, str | None]] = []
+        storage = SqliteTimerStorage(tmp_path / "timers.db")
+        async with running(CommandTimers(build_mediator(received), storage=storage)) as timers:
+            await asyncio.sleep(0.03)
+            assert received == [(1, "sms")]
+            assert timers.pending == 1
+            assert timers.get("reminder-2") is not None
+
+        assert [timer.id for timer in await storage.load()] == ["reminder-2"]
+        await storage.close()
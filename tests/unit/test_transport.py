@@ -0,0 +1,186 @@
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from di import Container
+from di.executors import AsyncExecutor
+
+from didiator import Command, Event, Query
+from didiator.interface.exceptions import ConnectionLost, QueryHandlerNotFound, RemoteHandlerError, RequestTimeout
+from didiator.dispatchers.query import QueryDispatcherImpl
+from didiator.mediator import MediatorImpl
+from didiator.middlewares.di import DiMiddleware, DiScopes
+from didiator.utils.di_builder import DiBuilderImpl
+from didiator.transport import HandlerHost, SocketTransport, remote_handler
+from didiator.transport.connection import StreamConnection
+from didiator.utils.framing import write_frame
+from didiator.utils.serializer import PickleSerializer
+
+
+@dataclass(frozen=True)
+class GetUser(Query[str]):
+    user_id: int
+
+
+@dataclass(frozen=True)
+class Sleep(Query[float]):
+    seconds: float
+
+
+@dataclass(frozen=True)
+class UnknownQuery(Query[None]):
+    pass
+
+
+@dataclass(frozen=True)
+class FailBadly(Query[None]):
+    pass
+
+
+class UndecodableError(Exception):
+    # It's pickled with one argument, so it can't be unpickled
+    def __init__(self, code: int, reason: str) -> None:
+        super().__init__(f"{code}: {reason}")
+
+
+@dataclass(frozen=True)
+class DivideNumbers(Command[float]):
+    dividend: int
+    divisor: int
+
+
+@dataclass(frozen=True)
+class UserCreated(Event):
+    user_id: int
+
+
+async def handle_get_user(query: GetUser, tenant: str = "") -> str:
+    return f"{tenant}:user_{query.user_id}"
+
+
+async def handle_sleep(query: Sleep) -> float:
+    await asyncio.sleep(query.seconds)
+    return query.seconds
+
+
+async def handle_divide_numbers(command: DivideNumbers) -> float:
+    return command.dividend / command.divisor
+
+
+async def handle_fail_badly(query: FailBadly) -> None:
+    raise UndecodableError(1, "failed")
+
+
+@pytest.fixture()
+async def host() -> HandlerHost:
+    mediator = MediatorImpl()
+    mediator.register_query_handler(GetUser, handle_get_user)
+    mediator.register_query_handler(Sleep, handle_sleep)
+    mediator.register_command_handler(DivideNumbers, handle_divide_numbers)
+    mediator.register_query_handler(FailBadly, handle_fail_badly)
+    async with HandlerHost(mediator, serializer=PickleSerializer()) as host:
+        yield host
+
+
+@pytest.fixture()
+async def transport(host: HandlerHost) -> SocketTransport:
+    server = await host.serve_tcp("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with SocketTransport("127.0.0.1", port, max_connections=2, max_pipelined=16) as transport:
+        yield transport
+
+
+class TestSocketTransport:
+    async def test_remote_handlers(self, transport: SocketTransport) -> None:
+        mediator = MediatorImpl()
+        mediator.register_query_handler(GetUser, remote_handler(GetUser, transport, forward_kwargs=("tenant",)))
+        mediator.register_command_handler(DivideNumbers, remote_handler(DivideNumbers, transport))
+
+        assert await mediator.query(GetUser(1), tenant="acme", other="not sent") == "acme:user_1"
+        assert await mediator.send(DivideNumbers(10, 4)) == 2.5
+        with pytest.raises(ZeroDivisionError):
+            await mediator.send(DivideNumbers(1, 0))
+
+    async def test_remote_errors(self, transport: SocketTransport) -> None:
+        with pytest.raises(QueryHandlerNotFound):
+            await transport.request("query", UnknownQuery())
+
+    async def test_pipelining(self, transport: SocketTransport) -> None:
+        results = await asyncio.gather(*(transport.request("query", GetUser(user_id)) for user_id in range(200)))
+        assert results == [f":user_{user_id}" for user_id in range(200)]
+        assert transport.connections == 2
+
+        # Slow requests don't block the fast ones sent over the same connection
+        slow = asyncio.create_task(transport.request("query", Sleep(0.5)))
+        assert await asyncio.wait_for(transport.request("query", Sleep(0)), 0.4) == 0
+
+        assert await slow == 0.5
+
+    async def test_timeout(self, transport: SocketTransport) -> None:
+        with pytest.raises(RequestTimeout):
+            await transport.request("query", Sleep(1), timeout=0.05)
+        assert await transport.request("query", GetUser(1)) == ":user_1"
+
+    async def test_tcp_requires_serializer(self) -> None:
+        async with HandlerHost(MediatorImpl()) as host:
+            with pytest.raises(ValueError):
+                await host.serve_tcp()
+
+    async def test_unix_socket(self, host: HandlerHost, tmp_path: Path) -> None:
+        path = str(tmp_path / "host.sock")
+        await host.serve_unix(path)
+        async with SocketTransport(path=path) as transport:
+            assert await transport.request("send", DivideNumbers(1, 2)) == 0.5
+
+    async def test_undecodable_response(self, transport: SocketTransport) -> None:
+        with pytest.raises(RemoteHandlerError):
+            await transport.request("query", FailBadly())
+        assert await transport.request("query", GetUser(1)) == ":user_1"
+
+    async def test_undecodable_frame(self) -> None:
+        async def send_garbage(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.read(1)
+            write_frame(writer, b"\x00")
+            await writer.drain()
+
+        server = await asyncio.start_server(send_garbage, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            connection = StreamConnection(reader, writer, PickleSerializer())
+            with pytest.raises(ConnectionLost):
+                await asyncio.wait_for(connection.request("query", GetUser(1)), 1)
+            assert connection.closed
+            await connection.close()
+
+    async def test_connection_lost(self, host: HandlerHost, transport: SocketTransport) -> None:
+        slow = asyncio.create_task(transport.request("query", Sleep(1)))
+        await asyncio.sleep(0.05)
+        await host.close()
+        with pytest.raises(ConnectionLost):
+            await slow
+
+    async def test_remote_event_handlers(self, transport: SocketTransport, host: HandlerHost) -> None:
+        received: list[UserCreated] = []
+
+        async def on_user_created(event: UserCreated) -> None:
+            received.append(event)
+
+        host.mediator.register_event_handler(UserCreated, on_user_created)
+        mediator = MediatorImpl()
+        mediator.register_event_handler(UserCreated, remote_handler(UserCreated, transport))
+        await mediator.publish([UserCreated(1), UserCreated(2)])
+        assert received == [UserCreated(1), UserCreated(2)]
+
+    async def test_remote_handler_with_di(self, transport: SocketTransport) -> None:
+        di_container = Container()
+        di_builder = DiBuilderImpl(di_container, AsyncExecutor(), ["app", "request"])
+        query_dispatcher = QueryDispatcherImpl(middlewares=(
+            DiMiddleware(di_builder, scopes=DiScopes(func_handler="request")),
+        ))
+        mediator = MediatorImpl(query_dispatcher=query_dispatcher)
+        mediator.register_query_handler(GetUser, remote_handler(GetUser, transport))
+
+        async with di_container.enter_scope("app") as di_state:
+            assert await mediator.query(GetUser(1), di_state=di_state) == ":user_1"